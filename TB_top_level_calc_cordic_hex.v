@@ -0,0 +1,211 @@
+`timescale 1ns / 1ps
+
+// Variante do TB_top_level_calc_cordicV3.v que lê vetores pré-quantizados.
+// Em vez de ler cada tabela texto com $fscanf e converter com real_to_q16_16, carrega de uma vez
+// o arquivo gerado por cordic_test_cases/cordic_vector_format.py com $readmemh e aplica os vetores
+// em sequência, sem intervalo entre um resultado e a próxima operação.
+//
+// Cada linha do arquivo (164 bits):
+//   [163:160] operation  [159:128] x_in  [127:96] y_in  [95:64] z_in  [63:32] esperado  [31:0] tolerância
+// A comparação é feita em Q16.16: erro = |result - esperado| em LSBs, aceito se erro <= tolerância.
+//
+// Arquivo padrão: test_vectors.hex (pode ser trocado com +VETORES=<arquivo> na simulação).
+
+module tb_top_level_calc_cordic_hex;
+
+    parameter WIDTH = 32;
+    parameter ITERATIONS = 30;
+    parameter MAX_VETORES = 1 << 20;  // Capacidade da memória de vetores
+    parameter VECTOR_WIDTH = 4 + 5*WIDTH;
+
+    reg clk, rst, enable;
+    reg [3:0] operation;
+    reg signed [WIDTH-1:0] x_in, y_in, z_in;
+
+    wire signed [WIDTH-1:0] result;
+    wire done;
+
+    // OPERAÇÕES
+    localparam  SIN     = 4'b0000, //0 para Seno
+                COS     = 4'b0001, //1 para Cosseno
+                ATAN    = 4'b0010, //2 para Arc Tangente
+                MOD     = 4'b0011, //3 para Módulo/Magnitude
+                MULT    = 4'b0100, //4 para Multiplicação
+                DIV     = 4'b0101, //5 para Divisão
+                SINH    = 4'b0110, //6 para Seno Hiperbólico
+                COSH    = 4'b0111, //7 para Cosseno Hiperbólico
+                ATANH   = 4'b1000, //8 para Arc Tangente Hiperbólico
+                MODH    = 4'b1001, //9 para Módulo Hiperbólico
+                DEFAULT = 4'b1111; // Padrão/Sem uso
+
+    // Memória com os vetores pré-quantizados
+    reg [VECTOR_WIDTH-1:0] vetores [0:MAX_VETORES-1];
+    reg [VECTOR_WIDTH-1:0] vetor;
+    reg [8*256:1] arquivo_vetores;
+
+    // Campos do vetor atual
+    reg signed [WIDTH-1:0] esperado;
+    reg [WIDTH-1:0] tolerancia;
+
+    integer file_handle, i, num_vetores;
+
+    // String temporária para formatação
+    reg [8*40:1] nome_op_temp;
+
+    // Contador de erros
+    integer error_count = 0;
+
+    top_level_calc_cordic #(
+        .ITERATIONS(ITERATIONS)
+    ) top_level (
+        .clk(clk),
+        .rst(rst),
+        .enable(enable),
+        .operation(operation),
+        .x_in(x_in),
+        .y_in(y_in),
+        .z_in(z_in),
+        .result(result),
+        .done(done)
+    );
+
+    initial clk = 0;
+    always #5 clk = ~clk;
+
+    initial begin
+        file_handle = $fopen("log_erros_testes.txt", "w");
+        if (file_handle == 0) begin // Verifica se o arquivo foi aberto com sucesso
+            $display("ERRO: Não foi possível abrir o arquivo 'log_erros_testes.txt'");
+            $stop; // Para a simulação se não puder abrir o arquivo
+        end
+        $fdisplay(file_handle, "--- Log de Testes de Operações ---"); // Escreve um cabeçalho no arquivo
+    end
+
+    task testar_vetor;
+        input [VECTOR_WIDTH-1:0] v;
+
+        reg signed [WIDTH-1:0] error;
+        real r_result, r_esperado, r_x, r_y, r_z;
+
+        begin
+            operation  = v[5*WIDTH+3:5*WIDTH];
+            x_in       = v[5*WIDTH-1:4*WIDTH];
+            y_in       = v[4*WIDTH-1:3*WIDTH];
+            z_in       = v[3*WIDTH-1:2*WIDTH];
+            esperado   = v[2*WIDTH-1:WIDTH];
+            tolerancia = v[WIDTH-1:0];
+
+            @(negedge clk); enable = 1;
+            @(negedge clk); enable = 0;
+
+            wait(done == 1);
+
+            // Erro absoluto em LSBs Q16.16
+            error = (result > esperado) ? (result - esperado) : (esperado - result);
+
+            q16_16_to_real(result, r_result);
+            q16_16_to_real(esperado, r_esperado);
+            q16_16_to_real(x_in, r_x);
+            q16_16_to_real(y_in, r_y);
+            q16_16_to_real(z_in, r_z);
+            nome_operacao(operation, r_x, r_y, r_z, nome_op_temp);
+
+            if (error > $signed({1'b0, tolerancia})) begin
+                $fdisplay(file_handle, "ERRO em %s: Esperado=%f, Obtido=%f (Erro=%f)",
+                                    nome_op_temp, r_esperado, r_result, $itor(error) / (1 << 16));
+                $display("ERRO em %s: Esperado=%f, Obtido=%f (Erro=%f)",
+                                     nome_op_temp, r_esperado, r_result, $itor(error) / (1 << 16));
+                error_count = error_count + 1;
+            end else begin
+                $fdisplay(file_handle, "ACERTO em %s: Esperado=%f, Obtido=%f (Erro=%f)",
+                                    nome_op_temp, r_esperado, r_result, $itor(error) / (1 << 16));
+            end
+        end
+    endtask
+
+    initial begin
+        rst = 1; enable = 0;
+        x_in = 32'b0;
+        y_in = 32'b0;
+        z_in = 32'b0;
+        operation = DEFAULT;
+
+        // Posições não carregadas ficam com DEFAULT e marcam o fim dos vetores
+        for (i = 0; i < MAX_VETORES; i = i + 1)
+            vetores[i] = {4'b1111, {(VECTOR_WIDTH-4){1'b0}}};
+
+        if (!$value$plusargs("VETORES=%s", arquivo_vetores))
+            arquivo_vetores = "test_vectors.hex";
+        $readmemh(arquivo_vetores, vetores);
+
+        num_vetores = 0;
+        while (num_vetores < MAX_VETORES && vetores[num_vetores][VECTOR_WIDTH-1 -: 4] != DEFAULT)
+            num_vetores = num_vetores + 1;
+        if (num_vetores == 0) begin
+            $display("Erro ao abrir vetores '%0s'", arquivo_vetores);
+            $finish;
+        end
+
+        #20 rst = 0;
+
+        $display("=== Iniciando testes de %0d vetores (mostrando apenas erros acima da tolerância) ===", num_vetores);
+
+        // Aplica os vetores em sequência
+        for (i = 0; i < num_vetores; i = i + 1) begin
+            vetor = vetores[i];
+            testar_vetor(vetor);
+        end
+        #20;
+
+        // Mostra resultado final caso de sucesso
+        if (error_count == 0) begin
+            $display("\n====================================");
+            $display(" SUCESSO: Todos os valores passaram!");
+            $display("====================================\n");
+        end else begin
+            $display("\n====================================");
+            $display(" ATENCÃO: %0d erros encontrados", error_count);
+            $display("====================================\n");
+        end
+
+        // Fecha o arquivo quando a simulação termina
+        if (file_handle != 0) begin
+            $fclose(file_handle);
+            $display("=== Fim dos testes ===");
+            $display("Log de testes salvo em 'log_erros_testes.txt'");
+        end
+
+        $stop;
+    end
+
+    // Nome da operação com as entradas, no mesmo formato do log do TB_top_level_calc_cordicV3.v
+    task nome_operacao;
+        input [3:0] op;
+        input real x_val, y_val, z_val;
+        output [8*40:1] nome_op;
+        begin
+            case (op)
+                SIN:     $sformat(nome_op, "SENO(%f)", z_val * 180.0 / 3.14159265358979);
+                COS:     $sformat(nome_op, "COSSENO(%f)", z_val * 180.0 / 3.14159265358979);
+                ATAN:    $sformat(nome_op, "ATAN(%f / %f)", x_val, y_val);
+                MOD:     $sformat(nome_op, "MOD(%f / %f)", x_val, y_val);
+                MULT:    $sformat(nome_op, "MULT(%f x %f)", x_val, z_val);
+                DIV:     $sformat(nome_op, "DIV(%f / %f)", y_val, x_val);
+                SINH:    $sformat(nome_op, "SINH(%f)", z_val);
+                COSH:    $sformat(nome_op, "COSH(%f)", z_val);
+                ATANH:   $sformat(nome_op, "ATANH(%f - %f)", x_val, y_val);
+                MODH:    $sformat(nome_op, "MODH(%f - %f)", x_val, y_val);
+                default: $sformat(nome_op, "OP%0d", op);
+            endcase
+        end
+    endtask
+
+    task q16_16_to_real;
+        input signed [31:0] val_fixed;
+        output real val_real;
+        begin
+            val_real = $itor(val_fixed) / (1 << 16);
+        end
+    endtask
+
+endmodule
@@ -0,0 +1,256 @@
+import argparse
+import fnmatch
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import generate_cordic_test_cases as gerador
+from cordic_vector_format import arquivos_tabela, ler_tabela
+
+# Benchmarks das ferramentas Python de geração de casos de teste.
+#
+# Mede, por operação, a taxa de geração de casos, a taxa de cálculo da referência (laço com `math`
+# e versão vetorizada NumPy), a vazão de formatação e escrita das tabelas e a vazão de leitura das
+# tabelas texto. Todas as métricas são taxas (maior é melhor). Os resultados podem ser gravados em
+# JSON e comparados com uma execução de referência (--baseline): uma métrica que cair mais que o
+# limite configurado é marcada como regressão e o script termina com código 1.
+
+# Casos por operação nos benchmarks vetorizados e nas versões escalares (laços em Python)
+CASOS_BENCHMARK = 1 << 18
+CASOS_ESCALARES = 1 << 14
+
+# Cada medida é repetida e o menor tempo é usado
+REPETICOES = 3
+
+# Queda relativa máxima aceita em relação ao baseline (0.10 = 10% mais lento)
+LIMITE_REGRESSAO = 0.10
+
+# Semente fixa: todas as execuções medem as mesmas entradas
+SEMENTE_BENCHMARK = 0
+
+# Referência com a biblioteca `math`, caso a caso (como no gerador original)
+REFERENCIA_ESCALAR = {
+    "SIN": lambda x, y, z: math.sin(z),
+    "COS": lambda x, y, z: math.cos(z),
+    "ATAN": lambda x, y, z: math.atan2(y, x),
+    "MOD": lambda x, y, z: math.sqrt(x**2 + y**2),
+    "MULT": lambda x, y, z: x * z,
+    "DIV": lambda x, y, z: y / x,
+    "SINH": lambda x, y, z: math.sinh(z),
+    "COSH": lambda x, y, z: math.cosh(z),
+    "ATANH": lambda x, y, z: math.atanh(y / x),
+    "MODH": lambda x, y, z: math.sqrt(x**2 - y**2),
+}
+
+_MEGABYTE = 1e6
+
+
+def _cronometrar(funcao, repeticoes=REPETICOES):
+    """Executa funcao() 'repeticoes' vezes e retorna (menor tempo em segundos, último retorno)."""
+    melhor, retorno = math.inf, None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        retorno = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, retorno
+
+
+def _metrica(valor, unidade):
+    return {"valor": float(valor), "unidade": unidade}
+
+
+def _formatar_escalar(op_name, casos):
+    """Formata as colunas de uma operação com f-strings, linha a linha (caminho do gerador original)."""
+    colunas = [None if coluna == "0.0" else casos[coluna].tolist() for coluna in gerador.LAYOUT_COLUNAS[op_name]]
+    linhas = []
+    for i in range(len(casos["ref"])):
+        linhas.append(", ".join("0.0" if valores is None else f"{valores[i]:.10f}" for valores in colunas) + "\n")
+    return "".join(linhas).encode()
+
+
+def _gerar_escalar(quantidade):
+    """Roda o gerador original com 'quantidade' casos aleatórios por operação."""
+    originais = {op_name: getattr(gerador, f"NUM_RANDOM_TESTS_{op_name}") for op_name in gerador.OP_CODES}
+    try:
+        for op_name in gerador.OP_CODES:
+            setattr(gerador, f"NUM_RANDOM_TESTS_{op_name}", quantidade)
+        random.seed(SEMENTE_BENCHMARK)
+        return gerador.generate_cordic_test_cases_formatted_grouped_configurable()
+    finally:
+        for op_name, valor in originais.items():
+            setattr(gerador, f"NUM_RANDOM_TESTS_{op_name}", valor)
+
+
+def medir_operacao(op_name, pasta_temporaria, casos=CASOS_BENCHMARK, casos_escalares=CASOS_ESCALARES,
+                   repeticoes=REPETICOES):
+    """Métricas de geração, referência, formatação, escrita e leitura de uma operação."""
+    metricas = {}
+
+    def gerar():
+        return gerador.gerar_casos_vetorizados(op_name, None, casos, np.random.default_rng(SEMENTE_BENCHMARK))
+    tempo, tabela = _cronometrar(gerar, repeticoes)
+    num_casos = len(tabela["ref"])
+    metricas[f"geracao_vetorizada.{op_name}"] = _metrica(num_casos / tempo, "casos/s")
+
+    x_val, y_val, z_val = tabela["x"], tabela["y"], tabela["z"]
+    tempo, _ = _cronometrar(lambda: gerador.referencias_validas(op_name, x_val, y_val, z_val), repeticoes)
+    metricas[f"referencia_vetorizada.{op_name}"] = _metrica(num_casos / tempo, "casos/s")
+
+    amostra = {chave: valores[:casos_escalares] for chave, valores in tabela.items()}
+    funcao = REFERENCIA_ESCALAR[op_name]
+    x_lista, y_lista, z_lista = amostra["x"].tolist(), amostra["y"].tolist(), amostra["z"].tolist()
+    tempo, _ = _cronometrar(lambda: [funcao(x, y, z) for x, y, z in zip(x_lista, y_lista, z_lista)], repeticoes)
+    metricas[f"referencia_escalar.{op_name}"] = _metrica(len(x_lista) / tempo, "casos/s")
+
+    tempo, texto = _cronometrar(lambda: b"".join(gerador.blocos_formatados(op_name, tabela)), repeticoes)
+    metricas[f"formatacao_vetorizada.{op_name}"] = _metrica(len(texto) / tempo / _MEGABYTE, "MB/s")
+
+    tempo, texto_escalar = _cronometrar(lambda: _formatar_escalar(op_name, amostra), repeticoes)
+    metricas[f"formatacao_escalar.{op_name}"] = _metrica(len(texto_escalar) / tempo / _MEGABYTE, "MB/s")
+
+    # Formatação + escrita em disco, como na geração das tabelas
+    caminho = os.path.join(pasta_temporaria, f"test_cases_{op_name.lower()}.txt")
+
+    def escrever():
+        with open(caminho, "wb") as f:
+            gerador.escrever_casos_vetorizado(f, op_name, tabela)
+    tempo, _ = _cronometrar(escrever, repeticoes)
+    tamanho = os.path.getsize(caminho)
+    metricas[f"escrita.{op_name}"] = _metrica(tamanho / tempo / _MEGABYTE, "MB/s")
+
+    tempo, _ = _cronometrar(lambda: sum(len(bloco[0]) for bloco in ler_tabela(caminho, op_name)), repeticoes)
+    metricas[f"leitura.{op_name}"] = _metrica(tamanho / tempo / _MEGABYTE, "MB/s")
+    return metricas
+
+
+def medir_tabelas(pasta, operacoes, repeticoes=REPETICOES):
+    """Vazão de leitura das tabelas de teste existentes na pasta (test_cases_<op>.txt ou fragmentos)."""
+    caminhos = [(op_name, caminho) for op_name in operacoes for caminho in arquivos_tabela(pasta, op_name)]
+    if not caminhos:
+        return {}
+    tamanho = sum(os.path.getsize(caminho) for _, caminho in caminhos)
+
+    def ler():
+        return sum(len(bloco[0]) for op_name, caminho in caminhos for bloco in ler_tabela(caminho, op_name))
+    tempo, linhas = _cronometrar(ler, repeticoes)
+    return {
+        "leitura_tabelas": _metrica(tamanho / tempo / _MEGABYTE, "MB/s"),
+        "leitura_tabelas_linhas": _metrica(linhas / tempo, "linhas/s"),
+    }
+
+
+def medir_gerador_escalar(casos_escalares=CASOS_ESCALARES, repeticoes=REPETICOES):
+    """Taxa do gerador original (todas as operações, laço em Python com `math` e f-strings)."""
+    tempo, (_, contagem) = _cronometrar(lambda: _gerar_escalar(casos_escalares // len(gerador.OP_CODES)), repeticoes)
+    return {"geracao_escalar": _metrica(sum(contagem.values()) / tempo, "casos/s")}
+
+
+def executar_benchmarks(operacoes, pasta_tabelas=None, casos=CASOS_BENCHMARK, casos_escalares=CASOS_ESCALARES,
+                        repeticoes=REPETICOES):
+    """Executa todos os benchmarks e retorna o dicionário {metadados, metricas} gravado em JSON."""
+    metricas = {}
+    with tempfile.TemporaryDirectory() as pasta_temporaria:
+        for op_name in operacoes:
+            metricas.update(medir_operacao(op_name, pasta_temporaria, casos, casos_escalares, repeticoes))
+    metricas.update(medir_gerador_escalar(casos_escalares, repeticoes))
+    if pasta_tabelas:
+        metricas.update(medir_tabelas(pasta_tabelas, operacoes, repeticoes))
+    return {
+        "metadados": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "casos": casos,
+            "casos_escalares": casos_escalares,
+            "repeticoes": repeticoes,
+        },
+        "metricas": metricas,
+    }
+
+
+def limite_metrica(nome, limite, limites_por_metrica):
+    """Limite de regressão de uma métrica: o do último padrão (fnmatch) que casar com o nome, ou o geral."""
+    for padrao, valor in reversed(limites_por_metrica):
+        if fnmatch.fnmatchcase(nome, padrao):
+            return valor
+    return limite
+
+
+def comparar(atual, baseline, limite=LIMITE_REGRESSAO, limites_por_metrica=()):
+    """
+    Compara as métricas com as de um baseline. Retorna uma lista de
+    (nome, valor no baseline, valor atual, variação relativa, limite, regrediu) para as métricas presentes nos dois.
+    """
+    comparacao = []
+    for nome, metrica in atual["metricas"].items():
+        if nome not in baseline["metricas"]:
+            continue
+        valor_base = baseline["metricas"][nome]["valor"]
+        variacao = metrica["valor"] / valor_base - 1.0 if valor_base else 0.0
+        limite_nome = limite_metrica(nome, limite, limites_por_metrica)
+        comparacao.append((nome, valor_base, metrica["valor"], variacao, limite_nome, variacao < -limite_nome))
+    return comparacao
+
+
+def _limite_por_metrica(texto):
+    padrao, _, valor = texto.rpartition("=")
+    if not padrao:
+        raise argparse.ArgumentTypeError(f"esperado PADRAO=LIMITE, recebido '{texto}'")
+    return padrao, float(valor)
+
+
+# --- Benchmarks das ferramentas ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede a vazão das ferramentas Python de geração de casos de teste.")
+    parser.add_argument("operacoes", nargs="*", default=list(gerador.OP_CODES), help="operações (padrão: todas)")
+    parser.add_argument("--casos", type=int, default=CASOS_BENCHMARK, help="casos por operação nos benchmarks vetorizados")
+    parser.add_argument("--casos-escalares", type=int, default=CASOS_ESCALARES,
+                        help="casos por operação nos laços em Python")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES, help="repetições de cada medida (usa a menor)")
+    parser.add_argument("--pasta", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="pasta com as tabelas test_cases_<op>.txt usadas no benchmark de leitura")
+    parser.add_argument("--json", help="grava as métricas neste arquivo JSON")
+    parser.add_argument("--baseline", help="arquivo JSON de uma execução anterior para comparação")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                        help="queda relativa máxima aceita em relação ao baseline (0.10 = 10%%)")
+    parser.add_argument("--limite-metrica", type=_limite_por_metrica, action="append", default=[],
+                        metavar="PADRAO=LIMITE",
+                        help="limite próprio para as métricas que casam com PADRAO (ex.: 'escrita.*=0.25'); repetível")
+    args = parser.parse_args()
+
+    operacoes = [op.upper() for op in args.operacoes]
+    resultado = executar_benchmarks(operacoes, args.pasta, args.casos, args.casos_escalares, args.repeticoes)
+
+    print(f"{'métrica':<32}{'valor':>16}  unidade")
+    for nome, metrica in resultado["metricas"].items():
+        print(f"{nome:<32}{metrica['valor']:>16.1f}  {metrica['unidade']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultado, f, indent=2)
+            f.write("\n")
+        print(f"\nMétricas salvas em '{args.json}'")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        comparacao = comparar(resultado, baseline, args.limite, args.limite_metrica)
+        print(f"\nComparação com '{args.baseline}':")
+        print(f"{'métrica':<32}{'baseline':>14}{'atual':>14}{'variação':>10}{'limite':>8}")
+        for nome, valor_base, valor, variacao, limite_nome, regrediu in comparacao:
+            print(f"{nome:<32}{valor_base:>14.1f}{valor:>14.1f}{variacao:>+10.1%}{limite_nome:>8.0%}"
+                  f"{'  REGRESSÃO' if regrediu else ''}")
+        regressoes = [nome for nome, *_, regrediu in comparacao if regrediu]
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões): {', '.join(regressoes)}")
+            sys.exit(1)
+        print("\nNenhuma regressão acima do limite")
@@ -0,0 +1,220 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+import generate_cordic_test_cases as gerador
+from cordic_error_sweep import DOMINIOS_TABELAS
+from cordic_model import ITERACOES_PADRAO, NUCLEO_PADRAO, NUCLEOS, real_to_q16_16, top_level_calc_cordic
+from cordic_vector_format import TOLERANCIA_PADRAO
+
+# Geração adaptativa guiada pelo erro.
+#
+# O domínio de cada operação (o mesmo dos casos aleatórios do gerador) é dividido em células: um eixo
+# em operações de uma entrada, uma grade em operações de duas entradas. Uma amostra piloto densa de
+# cada célula é avaliada no modelo bit a bit do núcleo (cordic_model.py), e cada célula recebe uma
+# nota igual ao seu erro máximo mais o gradiente do erro em relação às vizinhas. O orçamento de vetores
+# é então distribuído entre as células proporcionalmente à nota (com uma fração uniforme para manter
+# a cobertura), e o pior caso piloto de cada célula sempre entra no conjunto final. O resultado é um
+# conjunto bem menor que o uniforme, concentrado perto da saturação da ATANH, do limite do MOD, das
+# fronteiras de quadrante etc., com o mesmo pior caso da amostra piloto.
+
+# Domínios amostrados: os das tabelas de teste ('1d': z; '2d': x por 'y', 'z' ou 'razao', com y = razao * x)
+DOMINIOS_ADAPTATIVOS = DOMINIOS_TABELAS
+
+# Células do domínio: quantidade no eixo das operações 1-D, células por eixo nas 2-D
+CELULAS_1D = 512
+CELULAS_2D = 32
+
+# Amostras piloto avaliadas por célula
+AMOSTRAS_PILOTO = 32
+
+# Vetores finais por operação (sem contar os casos fixos)
+VETORES_ADAPTATIVOS = 1024
+
+# Fração do orçamento distribuída uniformemente entre as células válidas, independente da nota
+FRACAO_UNIFORME = 0.1
+
+
+def _num_celulas(op_name):
+    return CELULAS_1D if DOMINIOS_ADAPTATIVOS[op_name]["tipo"] == "1d" else CELULAS_2D * CELULAS_2D
+
+
+def _eixos(op_name):
+    """Nome e faixa dos eixos amostrados de uma operação."""
+    dominio = DOMINIOS_ADAPTATIVOS[op_name]
+    return [(nome, faixa) for nome, faixa in dominio.items() if nome != "tipo"]
+
+
+def amostrar_celulas(op_name, celulas, rng):
+    """Uma entrada uniforme dentro de cada célula indicada. Retorna (x, y, z) em reais."""
+    eixos = _eixos(op_name)
+    celulas = np.asarray(celulas, dtype=np.int64)
+    if len(eixos) == 1:
+        indices = [celulas]
+        divisoes = CELULAS_1D
+    else:
+        indices = [celulas // CELULAS_2D, celulas % CELULAS_2D]
+        divisoes = CELULAS_2D
+    valores = {}
+    for (nome, (minimo, maximo)), indice in zip(eixos, indices):
+        largura = (maximo - minimo) / divisoes
+        valores[nome] = minimo + (indice + rng.random(len(celulas))) * largura
+    x_val = valores.get("x", np.zeros(len(celulas)))
+    y_val = valores["razao"] * x_val if "razao" in valores else valores.get("y", np.zeros(len(celulas)))
+    return x_val, y_val, valores.get("z", np.zeros(len(celulas)))
+
+
+def avaliar_entradas(op_name, x_val, y_val, z_val, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Erro do modelo bit a bit (|resultado - referência|, em reais, como no testbench) e máscara das
+    entradas válidas pelos filtros do gerador.
+    """
+    referencia, valido = gerador.referencias_validas(op_name, x_val, y_val, z_val)
+    resultado = top_level_calc_cordic(op_name, real_to_q16_16(x_val), real_to_q16_16(y_val), real_to_q16_16(z_val),
+                                      iteracoes, nucleo)
+    with np.errstate(invalid="ignore"):
+        erro = np.where(valido, np.abs(resultado / 65536.0 - referencia), 0.0)
+    return erro, valido
+
+
+def _gradiente(erro_celulas, op_name):
+    """Maior diferença de erro máximo entre cada célula e suas vizinhas."""
+    if DOMINIOS_ADAPTATIVOS[op_name]["tipo"] == "1d":
+        grade = erro_celulas[np.newaxis, :]
+    else:
+        grade = erro_celulas.reshape(CELULAS_2D, CELULAS_2D)
+    gradiente = np.zeros_like(grade)
+    for eixo in (0, 1):
+        if grade.shape[eixo] < 2:
+            continue
+        diferenca = np.abs(np.diff(grade, axis=eixo))
+        antes = [slice(None)] * 2
+        depois = [slice(None)] * 2
+        antes[eixo], depois[eixo] = slice(1, None), slice(None, -1)
+        gradiente[tuple(antes)] = np.maximum(gradiente[tuple(antes)], diferenca)
+        gradiente[tuple(depois)] = np.maximum(gradiente[tuple(depois)], diferenca)
+    return gradiente.ravel()
+
+
+def _distribuir(pesos, total):
+    """Distribui 'total' unidades proporcionalmente aos pesos (maiores restos)."""
+    if total <= 0 or pesos.sum() <= 0:
+        return np.zeros(len(pesos), dtype=np.int64)
+    cotas = pesos / pesos.sum() * total
+    quantidades = np.floor(cotas).astype(np.int64)
+    restantes = total - quantidades.sum()
+    quantidades[np.argsort(-(cotas - quantidades), kind="stable")[:restantes]] += 1
+    return quantidades
+
+
+def gerar_adaptativo(op_name, num_vetores=VETORES_ADAPTATIVOS, rng=None, iteracoes=ITERACOES_PADRAO,
+                     nucleo=NUCLEO_PADRAO, amostras_piloto=AMOSTRAS_PILOTO, fracao_uniforme=FRACAO_UNIFORME):
+    """
+    Gera o conjunto adaptativo de uma operação. Retorna (casos, resumo), com casos no formato de
+    colunas do gerador (fixos + vetores adaptativos) e o resumo da amostra piloto.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    num_celulas = _num_celulas(op_name)
+
+    # Amostra piloto: erro máximo, pior entrada e fração válida de cada célula
+    celulas_piloto = np.repeat(np.arange(num_celulas), amostras_piloto)
+    x_val, y_val, z_val = amostrar_celulas(op_name, celulas_piloto, rng)
+    erro, valido = avaliar_entradas(op_name, x_val, y_val, z_val, iteracoes, nucleo)
+    erro_por_celula = erro.reshape(num_celulas, amostras_piloto)
+    fracao_valida = valido.reshape(num_celulas, amostras_piloto).mean(axis=1)
+    pior_na_celula = np.argmax(np.where(valido, erro, -1.0).reshape(num_celulas, amostras_piloto), axis=1)
+    pior = np.arange(num_celulas) * amostras_piloto + pior_na_celula
+    erro_celulas = erro_por_celula.max(axis=1)
+    celulas_validas = fracao_valida > 0
+
+    nota = np.where(celulas_validas, erro_celulas + _gradiente(erro_celulas, op_name), 0.0)
+
+    # Pior caso piloto de cada célula válida (das de maior nota, se o orçamento for menor que as células)
+    ordem = np.argsort(-nota, kind="stable")
+    escolhidas = [celula for celula in ordem if celulas_validas[celula]][:num_vetores]
+    selecionados = pior[escolhidas]
+
+    # Restante do orçamento: parte uniforme entre as células válidas, parte proporcional à nota
+    restante = num_vetores - len(selecionados)
+    uniforme = int(round(restante * fracao_uniforme))
+    quantidades = (_distribuir(fracao_valida * celulas_validas, uniforme)
+                   + _distribuir(nota, restante - uniforme))
+    # Sorteia mais entradas nas células parcialmente válidas e mantém só as 'quantidade' primeiras válidas
+    partes = [(x_val[selecionados], y_val[selecionados], z_val[selecionados])]
+    for celula in np.flatnonzero(quantidades):
+        quantidade = quantidades[celula]
+        sorteios = int(math.ceil(quantidade / fracao_valida[celula])) + 1
+        x_novo, y_novo, z_novo = amostrar_celulas(op_name, np.full(sorteios, celula), rng)
+        validos = np.flatnonzero(gerador.referencias_validas(op_name, x_novo, y_novo, z_novo)[1])[:quantidade]
+        partes.append((x_novo[validos], y_novo[validos], z_novo[validos]))
+
+    casos = gerador.casos_com_fixos(op_name, *(np.concatenate(coluna) for coluna in zip(*partes)))
+    resumo = {
+        "celulas": num_celulas,
+        "celulas_validas": int(celulas_validas.sum()),
+        "amostras_piloto": int(valido.sum()),
+        "erro_max_piloto": float(erro.max()),
+        "pior_celula": int(np.argmax(erro_celulas)),
+    }
+    return casos, resumo
+
+
+def erro_casos(op_name, casos, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Erro do modelo bit a bit em cada caso de um conjunto (colunas do gerador)."""
+    erro, _ = avaliar_entradas(op_name, casos["x"], casos["y"], casos["z"], iteracoes, nucleo)
+    return erro
+
+
+# --- Geração adaptativa ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera conjuntos reduzidos de vetores concentrados onde o erro é maior.")
+    parser.add_argument("operacoes", nargs="*", default=list(DOMINIOS_ADAPTATIVOS), help="operações (padrão: todas)")
+    parser.add_argument("--vetores", type=int, default=VETORES_ADAPTATIVOS, help="vetores por operação, além dos fixos")
+    parser.add_argument("--piloto", type=int, default=AMOSTRAS_PILOTO, help="amostras piloto por célula")
+    parser.add_argument("--saida", default="cordic_test_cases_adaptativo", help="pasta das tabelas geradas")
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO)
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="erro acima do qual um vetor conta como falha no resumo")
+    parser.add_argument("--json", help="grava o resumo neste arquivo JSON")
+    args = parser.parse_args()
+
+    semente = np.random.SeedSequence().entropy if args.semente is None else args.semente
+    print(f"Semente: {semente}\n")
+    os.makedirs(args.saida, exist_ok=True)
+
+    print(f"{'operação':<10}{'vetores':>9}{'erro máx':>12}{'falhas':>8}{'uniforme':>12}{'falhas':>8}{'piloto':>12}{'amostras':>10}")
+    resumos = {}
+    for op_name in (op.upper() for op in args.operacoes):
+        rng = np.random.default_rng([semente, int(gerador.OP_CODES[op_name], 2)])
+        casos, resumo = gerar_adaptativo(op_name, args.vetores, rng, args.iteracoes, args.nucleo, args.piloto)
+        with open(os.path.join(args.saida, f"test_cases_{op_name.lower()}.txt"), "wb") as f:
+            gerador.escrever_casos_vetorizado(f, op_name, casos)
+
+        # Comparação com um conjunto uniforme do mesmo tamanho (mesmas distribuições do gerador)
+        uniforme = gerador.casos_aleatorios_vetorizados(op_name, len(casos["ref"]), rng)
+        erro = erro_casos(op_name, casos, args.iteracoes, args.nucleo)
+        erro_uniforme = erro_casos(op_name, uniforme, args.iteracoes, args.nucleo)
+        resumo.update({
+            "vetores": len(erro),
+            "erro_max": float(erro.max()),
+            "falhas": int((erro > args.tolerancia).sum()),
+            "vetores_uniforme": len(erro_uniforme),
+            "erro_max_uniforme": float(erro_uniforme.max()),
+            "falhas_uniforme": int((erro_uniforme > args.tolerancia).sum()),
+        })
+        resumos[op_name] = resumo
+        print(f"{op_name:<10}{resumo['vetores']:>9}{resumo['erro_max']:>12.6f}{resumo['falhas']:>8}"
+              f"{resumo['erro_max_uniforme']:>12.6f}{resumo['falhas_uniforme']:>8}"
+              f"{resumo['erro_max_piloto']:>12.6f}{resumo['amostras_piloto']:>10}")
+
+    print(f"\nTabelas salvas na pasta '{args.saida}'")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"semente": semente, "operacoes": resumos}, f, indent=2)
+            f.write("\n")
+        print(f"Resumo salvo em '{args.json}'")
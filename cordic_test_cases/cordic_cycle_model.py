@@ -0,0 +1,262 @@
+import argparse
+import os
+
+import numpy as np
+
+from cordic_model import (
+    CIRCULAR, CODIGOS_OPERACAO, FORMATOS, HYPERBOLIC, ITERACOES_PADRAO, LINEAR, NUCLEO_PADRAO, NUCLEOS, OPERACOES,
+    ROTATION, correcao_quadrante_pi_4, divisoes_corr_z, real_to_q16_16, sequencia_iteracoes
+)
+from cordic_vector_format import arquivos_tabela, carregar_vetores, ler_tabela
+
+# Modelo de ciclos dos núcleos CORDIC.
+#
+# Latência = quantidade de bordas de subida do clock depois da borda que amostra 'enable'
+# até a borda em que 'valid' sobe (inclusive). Com o protocolo do testbench (pulso de enable,
+# espera por done e novo pulso na descida seguinte), cada operação ocupa latência + 1 ciclos.
+#
+# Pré-processamento (só rotação circular e rotação linear), contado a partir da borda do enable:
+#   correcao_quadrante_pi_4: START -> VERIF -> CORQUAD termina em 2 bordas; cada volta de 2π
+#   passa por VERIF -> MAIOR/MENOR -> VERIF_2, e com v voltas o done sobe na borda 3v + 1.
+#   corr_z_multi: IDLE -> VERIF termina em 1 borda; cada divisão por 2 acrescenta
+#   NORMALIZE -> VERIF, e com d divisões o done sobe na borda 2d + 1.
+#
+# cordic / cordic_q16_32 (FSM IDLE -> INITIALIZE -> UPDATE -> FINALIZE):
+#   INITIALIZE dura 1 borda, ou espera o done do pré-processamento e dura (bordas do done) + 1;
+#   UPDATE dura uma borda por índice de sequencia_iteracoes (inclui as repetições hiperbólicas);
+#   FINALIZE dura 1 borda e sobe o valid.
+# cordic_parallel / cordic_parallel_q16_32:
+#   enable_start é registrado (a partir de enable ou do done do pré-processamento) e a cadeia
+#   done_iter dos ITERATIONS estágios é combinacional, então o valid sobe na borda seguinte.
+
+
+def bordas_corquad(z_in, formato="q16_16"):
+    """Borda (após o enable) em que o done de correcao_quadrante_pi_4 sobe, por caso."""
+    _, _, voltas = correcao_quadrante_pi_4(z_in, formato)
+    return np.where(voltas == 0, 2, 3 * voltas + 1)
+
+
+def bordas_corr_z(z_in, formato="q16_16"):
+    """Borda (após o enable) em que o done de corr_z_multi sobe, por caso."""
+    return 2 * divisoes_corr_z(z_in, formato) + 1
+
+
+def bordas_preprocessamento(op_name, z_in, formato="q16_16"):
+    """Borda do done do pré-processamento da operação (0 se a operação não tem pré-processamento)."""
+    _, mode_coord, mode_op, _ = OPERACOES[op_name]
+    z_in = np.asarray(z_in, dtype=np.int64)
+    if mode_op == ROTATION and mode_coord == CIRCULAR:
+        return bordas_corquad(z_in, formato)
+    if mode_op == ROTATION and mode_coord == LINEAR:
+        return bordas_corr_z(z_in, formato)
+    return np.zeros(z_in.shape, dtype=np.int64)
+
+
+def ciclos_update(op_name, iteracoes=ITERACOES_PADRAO):
+    """Bordas no estado UPDATE da FSM serial para a operação."""
+    return len(sequencia_iteracoes(OPERACOES[op_name][1], iteracoes, "serial"))
+
+
+def latencia(op_name, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Latência em ciclos de cada caso (vetor de palavras z_in Q16.16) de uma operação em um núcleo."""
+    arquitetura, formato = NUCLEOS[nucleo]
+    preprocessamento = bordas_preprocessamento(op_name, z_in, formato)
+    espera = np.where(preprocessamento > 0, preprocessamento + 1, 0)
+    if arquitetura == "paralelo":
+        return espera + 1
+    return np.maximum(espera, 1) + ciclos_update(op_name, iteracoes) + 1
+
+
+def ciclos_por_estado(op_name, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Decomposição da latência de cada caso pelos estados do núcleo. No serial: INITIALIZE (inclui a
+    espera pelo pré-processamento), UPDATE e FINALIZE. No paralelo: espera do pré-processamento,
+    registro de enable_start e registro das saídas (a cadeia done_iter não consome bordas).
+    """
+    arquitetura, formato = NUCLEOS[nucleo]
+    preprocessamento = bordas_preprocessamento(op_name, z_in, formato)
+    if arquitetura == "paralelo":
+        return {
+            "PRE_PROCESSAMENTO": preprocessamento,
+            "ENABLE_START": np.where(preprocessamento > 0, 1, 0),
+            "SAIDA": np.ones_like(preprocessamento),
+        }
+    return {
+        "INITIALIZE": np.where(preprocessamento > 0, preprocessamento + 1, 1),
+        "UPDATE": np.full_like(preprocessamento, ciclos_update(op_name, iteracoes)),
+        "FINALIZE": np.ones_like(preprocessamento),
+    }
+
+
+def simular_latencia(op_name, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO, limite=1 << 20):
+    """
+    Simulação borda a borda (um caso, Python puro) das FSMs de correcao_quadrante_pi_4, corr_z_multi
+    e do núcleo, com enable ativo só na borda 0. Retorna a borda em que valid sobe.
+    É lenta; serve para conferir as fórmulas fechadas de latencia().
+    """
+    arquitetura, formato = NUCLEOS[nucleo]
+    c = FORMATOS[formato]
+    _, mode_coord, mode_op, _ = OPERACOES[op_name]
+    usa_corquad = mode_op == ROTATION and mode_coord == CIRCULAR
+    usa_corz = mode_op == ROTATION and mode_coord == LINEAR
+    z_interno = int(z_in) << (c["fracionarios"] - 16)
+    dois_pi, pi_4, dois = c["_360_2PI"], c["_45_PI_4_POS"], c["TWO_POS"]
+    mascara = (1 << (iteracoes - 1).bit_length()) - 1
+
+    cq_estado, cq_tratado, cq_normalizado, cq_done = "START", 0, 0, False
+    cz_estado, cz_normalizado, cz_aux, cz_done = "IDLE", 0, 0, False
+    estado, contador, repetir_4, repetir_13 = "IDLE", 0, True, True
+    enable_start = False
+
+    for borda in range(limite):
+        enable = borda == 0
+        done_corquad, done_corz = cq_done, cz_done
+
+        # correcao_quadrante_pi_4
+        if cq_estado == "START":
+            cq_done = False
+            if enable and usa_corquad:
+                cq_tratado, cq_estado = z_interno, "VERIF"
+        elif cq_estado == "VERIF":
+            if cq_tratado > dois_pi:
+                cq_estado = "MAIOR"
+            elif cq_tratado < -pi_4:
+                cq_estado = "MENOR"
+            else:
+                cq_normalizado = cq_tratado - dois_pi if cq_tratado > c["_315_5_5"] else cq_tratado
+                cq_estado = "CORQUAD"
+        elif cq_estado in ("MAIOR", "MENOR"):
+            cq_normalizado = cq_tratado - dois_pi if cq_estado == "MAIOR" else cq_tratado + dois_pi
+            cq_estado = "VERIF_2"
+        elif cq_estado == "VERIF_2":
+            if cq_normalizado > dois_pi or cq_normalizado < -pi_4:
+                cq_tratado, cq_estado = cq_normalizado, "VERIF"
+            else:
+                cq_estado = "CORQUAD"
+        else:  # CORQUAD
+            cq_done, cq_estado = True, "START"
+
+        # corr_z_multi
+        if cz_estado == "IDLE":
+            cz_done = False
+            if enable and usa_corz:
+                cz_normalizado, cz_estado = z_interno, "VERIF"
+        elif cz_estado == "VERIF":
+            if -dois < cz_normalizado < dois:
+                cz_done, cz_estado = True, "IDLE"
+            else:
+                cz_aux, cz_estado = cz_normalizado, "NORMALIZE"
+        else:  # NORMALIZE
+            cz_normalizado, cz_estado = cz_aux >> 1, "VERIF"
+
+        if arquitetura == "paralelo":
+            # valid <= done_iter[N-1] = enable_start (cadeia combinacional)
+            if enable_start:
+                return borda
+            enable_start = done_corquad if usa_corquad else done_corz if usa_corz else enable
+            continue
+
+        # FSM do cordic serial
+        if estado == "IDLE":
+            estado = "INITIALIZE" if enable else "IDLE"
+        elif estado == "INITIALIZE":
+            contador = 1 if mode_coord == HYPERBOLIC else 0
+            pronto = done_corquad if usa_corquad else done_corz if usa_corz else True
+            estado = "UPDATE" if pronto else "INITIALIZE"
+        elif estado == "UPDATE":
+            estado = "FINALIZE" if contador == iteracoes - 1 else "UPDATE"
+            if mode_coord == HYPERBOLIC and contador == 4 and repetir_4:
+                repetir_4 = False
+            elif mode_coord == HYPERBOLIC and contador == 13 and repetir_13:
+                repetir_13 = False
+            else:
+                contador = (contador + 1) & mascara
+        else:  # FINALIZE: completed <= 1
+            return borda
+    raise RuntimeError("valid não subiu dentro do limite de bordas")
+
+
+def resumo_ciclos(ciclos):
+    """Estatísticas de um vetor de latências: média, quantis de cauda e máximo."""
+    if len(ciclos) == 0:
+        return {"casos": 0}
+    p50, p99, p999 = np.percentile(ciclos, [50, 99, 99.9], method="higher")
+    # Protocolo do testbench: uma operação por vez, latência + 1 ciclos por operação
+    ciclos_totais = int(ciclos.sum()) + len(ciclos)
+    return {
+        "casos": len(ciclos),
+        "latencia_media": float(ciclos.mean()),
+        "latencia_p50": int(p50),
+        "latencia_p99": int(p99),
+        "latencia_p999": int(p999),
+        "latencia_max": int(ciclos.max()),
+        "ciclos_totais": ciclos_totais,
+        "ops_por_ciclo": len(ciclos) / ciclos_totais,
+    }
+
+
+def z_vetores_arquivo(caminho):
+    """
+    Palavras z_in por operação de um arquivo de vetores: tabela texto test_cases_<op>[_NNNN].txt
+    ou arquivo hex pré-quantizado (cordic_vector_format.py), que pode misturar operações.
+    """
+    if caminho.endswith(".hex"):
+        vetores = carregar_vetores(caminho)
+        return {CODIGOS_OPERACAO[int(codigo)]: vetores["z"][vetores["operacao"] == codigo]
+                for codigo in np.unique(vetores["operacao"])}
+    nome = os.path.basename(caminho)[len("test_cases_"):-len(".txt")].split("_")[0].upper()
+    blocos = [real_to_q16_16(z_val) for _, _, z_val, _ in ler_tabela(caminho, nome)]
+    return {nome: np.concatenate(blocos) if blocos else np.empty(0, dtype=np.int64)}
+
+
+def prever_arquivos(caminhos, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Latências previstas por operação para os vetores de uma lista de arquivos."""
+    z_por_operacao = {}
+    for caminho in caminhos:
+        for op_name, z_in in z_vetores_arquivo(caminho).items():
+            z_por_operacao.setdefault(op_name, []).append(z_in)
+    relatorios = {}
+    for op_name in OPERACOES:
+        if op_name not in z_por_operacao:
+            continue
+        z_in = np.concatenate(z_por_operacao[op_name])
+        relatorio = resumo_ciclos(latencia(op_name, z_in, iteracoes, nucleo))
+        relatorio["ciclos_por_estado"] = {estado: float(valores.mean()) for estado, valores
+                                          in ciclos_por_estado(op_name, z_in, iteracoes, nucleo).items()}
+        relatorios[op_name] = relatorio
+    return relatorios
+
+
+# --- Previsão de ciclos a partir das tabelas de teste ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prevê latência e vazão dos núcleos CORDIC para arquivos de vetores.")
+    parser.add_argument("arquivos", nargs="*",
+                        help="test_cases_<op>.txt, fragmentos ou .hex (padrão: tabelas da pasta do script)")
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO)
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--frequencia", type=float, default=None, help="clock em MHz, para converter em operações/s")
+    args = parser.parse_args()
+
+    arquivos = args.arquivos
+    if not arquivos:
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        arquivos = [caminho for op_name in OPERACOES for caminho in arquivos_tabela(pasta, op_name)]
+
+    relatorios = prever_arquivos(arquivos, args.iteracoes, args.nucleo)
+    print(f"Modelo de ciclos: núcleo '{args.nucleo}', ITERATIONS = {args.iteracoes}\n")
+    print(f"{'operação':<10}{'casos':>10}{'lat. média':>12}{'p50':>7}{'p99':>7}{'p99.9':>8}{'máx':>8}{'ops/ciclo':>11}")
+    for op_name, relatorio in relatorios.items():
+        if not relatorio["casos"]:
+            continue
+        print(f"{op_name:<10}{relatorio['casos']:>10}{relatorio['latencia_media']:>12.2f}{relatorio['latencia_p50']:>7}"
+              f"{relatorio['latencia_p99']:>7}{relatorio['latencia_p999']:>8}{relatorio['latencia_max']:>8}"
+              f"{relatorio['ops_por_ciclo']:>11.4f}")
+        print(" " * 10 + "  ciclos médios por estado: " +
+              ", ".join(f"{estado} {media:.2f}" for estado, media in relatorio["ciclos_por_estado"].items()))
+
+    casos = sum(relatorio["casos"] for relatorio in relatorios.values())
+    ciclos_totais = sum(relatorio.get("ciclos_totais", 0) for relatorio in relatorios.values())
+    if casos:
+        print(f"\nTotal: {casos} operações em {ciclos_totais} ciclos ({casos / ciclos_totais:.4f} ops/ciclo)")
+        if args.frequencia:
+            print(f"A {args.frequencia:g} MHz: {casos / ciclos_totais * args.frequencia * 1e6:.0f} operações/s")
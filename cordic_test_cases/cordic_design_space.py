@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cordic_cycle_model import latencia
+from cordic_error_sweep import DOMINIOS, DOMINIOS_TABELAS, avaliar_bloco, entradas_varredura, relatorio, tamanho_dominio
+from cordic_model import NUCLEOS, estagios_combinacionais
+
+# Exploração do espaço de projeto: ITERATIONS x formato interno (Q16.16 / Q16.32) x arquitetura
+# (serial / paralela), para cada operação.
+#
+# Cada ponto (operação, núcleo, ITERATIONS) é avaliado com o modelo bit a bit sobre um conjunto
+# fixo de entradas (amostra do domínio da varredura de erro) e com o modelo de ciclos, e o
+# resultado é guardado em cache no disco, em um arquivo por ponto com o nome igual ao hash da
+# configuração. Ao mudar um parâmetro, só os pontos afetados são recalculados; mudar os modelos
+# (cordic_model.py / cordic_cycle_model.py) invalida o cache.
+
+# Valores de ITERATIONS avaliados por padrão
+ITERACOES_EXPLORADAS = list(range(8, 33, 2))
+
+# Domínios avaliados: os das tabelas de teste, com SIN e COS de -360° a 360° (ângulos muito grandes
+# fazem o laço da correção de quadrante dominar a latência).
+DOMINIOS_EXPLORACAO = DOMINIOS_TABELAS
+
+# Amostragem do domínio de cada operação: palavras nas operações 1-D, pontos por eixo nas 2-D
+AMOSTRAS_1D = 1 << 16
+PONTOS_GRADE_EXPLORACAO = 256
+
+PASTA_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_design_space")
+
+_ARQUIVOS_MODELO = ("cordic_model.py", "cordic_cycle_model.py", "cordic_error_sweep.py", "cordic_design_space.py")
+
+
+def versao_modelos():
+    """Hash do código dos modelos, para invalidar o cache quando eles mudam."""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    hash_modelos = hashlib.sha256()
+    for nome in _ARQUIVOS_MODELO:
+        with open(os.path.join(pasta, nome), "rb") as f:
+            hash_modelos.update(f.read())
+    return hash_modelos.hexdigest()[:16]
+
+
+def chave_configuracao(configuracao):
+    """Hash estável de um ponto de configuração (dicionário serializável em JSON)."""
+    return hashlib.sha256(json.dumps(configuracao, sort_keys=True).encode()).hexdigest()
+
+
+def _passo_1d(op_name):
+    return max(1, tamanho_dominio(op_name, dominio=DOMINIOS_EXPLORACAO[op_name]) // AMOSTRAS_1D)
+
+
+def avaliar_ponto(configuracao):
+    """Precisão e latência de um ponto (operação, núcleo, ITERATIONS)."""
+    op_name, nucleo, iteracoes = configuracao["operacao"], configuracao["nucleo"], configuracao["iteracoes"]
+    pontos, passo = configuracao["pontos_grade"], configuracao["passo_1d"]
+    dominio = DOMINIOS_EXPLORACAO[op_name]
+    total = tamanho_dominio(op_name, pontos, pontos, passo, dominio)
+    x_in, y_in, z_in = entradas_varredura(op_name, 0, total, pontos, pontos, passo, dominio)
+    erro = relatorio(op_name, avaliar_bloco(op_name, x_in, y_in, z_in, iteracoes, nucleo))
+    ciclos = latencia(op_name, z_in, iteracoes, nucleo)
+    arquitetura, formato = NUCLEOS[nucleo]
+    return dict(configuracao, **{
+        "arquitetura": arquitetura,
+        "formato": formato,
+        "casos": erro["casos"],
+        "erro_max": erro["erro_max"],
+        "erro_medio": erro["erro_medio"],
+        "erro_rms": erro["erro_rms"],
+        "erro_max_ulp": erro["erro_max_ulp"],
+        "latencia_media": float(ciclos.mean()),
+        "latencia_max": int(ciclos.max()),
+        # estágios em cascata combinacional (cadeia done_iter) no paralelo; 1 no serial
+        "estagios_combinacionais": estagios_combinacionais(op_name, iteracoes) if arquitetura == "paralelo" else 1,
+    })
+
+
+def _avaliar_e_salvar(argumentos):
+    """Tarefa de um processo do pool: avalia um ponto e grava no cache."""
+    configuracao, caminho = argumentos
+    resultado = avaliar_ponto(configuracao)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w") as f:
+        json.dump(resultado, f)
+    os.replace(temporario, caminho)
+    return resultado
+
+
+def explorar(operacoes, nucleos, iteracoes, pasta_cache=PASTA_CACHE, jobs=1, pontos_grade=PONTOS_GRADE_EXPLORACAO):
+    """
+    Avalia todos os pontos operação x núcleo x ITERATIONS, reaproveitando o cache.
+    Retorna (lista de resultados, quantidade de pontos recalculados).
+    """
+    os.makedirs(pasta_cache, exist_ok=True)
+    versao = versao_modelos()
+    configuracoes = [{"operacao": op_name, "nucleo": nucleo, "iteracoes": n, "pontos_grade": pontos_grade,
+                      "passo_1d": _passo_1d(op_name), "dominio": DOMINIOS_EXPLORACAO[op_name],
+                      "versao_modelos": versao}
+                     for op_name in operacoes for nucleo in nucleos for n in iteracoes]
+    resultados = {}
+    pendentes = []
+    for indice, configuracao in enumerate(configuracoes):
+        caminho = os.path.join(pasta_cache, chave_configuracao(configuracao) + ".json")
+        if os.path.exists(caminho):
+            with open(caminho) as f:
+                resultados[indice] = json.load(f)
+        else:
+            pendentes.append((indice, (configuracao, caminho)))
+
+    tarefas = [argumentos for _, argumentos in pendentes]
+    if jobs > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            calculados = list(executor.map(_avaliar_e_salvar, tarefas))
+    else:
+        calculados = [_avaliar_e_salvar(argumentos) for argumentos in tarefas]
+    for (indice, _), resultado in zip(pendentes, calculados):
+        resultados[indice] = resultado
+    return [resultados[indice] for indice in range(len(configuracoes))], len(pendentes)
+
+
+def menor_iteracoes(resultados, alvo):
+    """Para cada (operação, núcleo), o menor ITERATIONS com erro máximo <= alvo (ou None)."""
+    escolhas = {}
+    for resultado in sorted(resultados, key=lambda r: r["iteracoes"]):
+        chave = (resultado["operacao"], resultado["nucleo"])
+        escolhas.setdefault(chave, None)
+        if escolhas[chave] is None and resultado["erro_max"] is not None and resultado["erro_max"] <= alvo:
+            escolhas[chave] = resultado
+    return escolhas
+
+
+# --- Exploração do espaço de projeto ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explora ITERATIONS x formato x arquitetura dos núcleos CORDIC.")
+    parser.add_argument("operacoes", nargs="*", default=list(DOMINIOS), help="operações (padrão: todas)")
+    parser.add_argument("--nucleos", nargs="+", choices=sorted(NUCLEOS), default=list(NUCLEOS))
+    parser.add_argument("--iteracoes", nargs="+", type=int, default=ITERACOES_EXPLORADAS)
+    parser.add_argument("--pontos", type=int, default=PONTOS_GRADE_EXPLORACAO, help="pontos por eixo nas grades 2-D")
+    parser.add_argument("--alvo", type=float, default=None,
+                        help="erro máximo desejado: indica o menor ITERATIONS que o atinge em cada núcleo")
+    parser.add_argument("--cache", default=PASTA_CACHE, help="pasta do cache de resultados")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="processos usados nos pontos novos")
+    parser.add_argument("--json", help="grava todos os pontos neste arquivo JSON")
+    args = parser.parse_args()
+
+    operacoes = [op.upper() for op in args.operacoes]
+    resultados, recalculados = explorar(operacoes, args.nucleos, args.iteracoes, args.cache, args.jobs, args.pontos)
+    print(f"{len(resultados)} pontos ({recalculados} recalculados, {len(resultados) - recalculados} do cache)\n")
+
+    for op_name in operacoes:
+        print(f"=== {op_name} ===")
+        print(f"{'núcleo':<24}{'ITER':>5}{'erro máx':>12}{'erro RMS':>12}{'ULP máx':>10}{'lat. média':>12}{'lat. máx':>10}")
+        for resultado in resultados:
+            if resultado["operacao"] != op_name:
+                continue
+            erro_max = resultado["erro_max"] if resultado["erro_max"] is not None else np.nan
+            erro_rms = resultado["erro_rms"] if resultado["erro_rms"] is not None else np.nan
+            erro_ulp = resultado["erro_max_ulp"] if resultado["erro_max_ulp"] is not None else np.nan
+            print(f"{resultado['nucleo']:<24}{resultado['iteracoes']:>5}{erro_max:>12.6f}{erro_rms:>12.6f}"
+                  f"{erro_ulp:>10.0f}{resultado['latencia_media']:>12.2f}{resultado['latencia_max']:>10}")
+        print()
+
+    if args.alvo is not None:
+        print(f"Menor ITERATIONS com erro máximo <= {args.alvo}:")
+        for (op_name, nucleo), escolha in menor_iteracoes(resultados, args.alvo).items():
+            if escolha is None:
+                print(f"- {op_name} / {nucleo}: não atingido")
+            else:
+                print(f"- {op_name} / {nucleo}: ITERATIONS = {escolha['iteracoes']} "
+                      f"(erro máx {escolha['erro_max']:.6f}, latência máx {escolha['latencia_max']} ciclos)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+            f.write("\n")
+        print(f"\nPontos salvos em '{args.json}'")
@@ -0,0 +1,268 @@
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cordic_error_sweep import DOMINIOS, DOMINIOS_TABELAS, entradas_indices, resultado_exato, tamanho_dominio
+from cordic_model import ITERACOES_PADRAO, OPERACOES, q16_16_to_real, real_to_q16_16, top_level_calc_cordic
+from cordic_vector_format import carregar_vetores, ler_tabela
+
+# Comparação diferencial dos quatro núcleos sobre o mesmo lote de entradas.
+#
+# Cada bloco de entradas passa pelo modelo bit a bit de todos os núcleos e pela referência exata
+# (float64, cordic_error_sweep.resultado_exato). Os sorteios usam os domínios das tabelas de teste
+# (DOMINIOS_TABELAS), com SIN e COS de -360° a 360°. Para cada par de núcleos são contados os casos em que as
+# palavras de saída diferem, a maior divergência (em ULPs Q16.16) e as menores entradas que reproduzem a
+# divergência (menor |x| + |y| + |z| em palavras, as mais fáceis de depurar em simulação); para cada núcleo,
+# o erro máximo e RMS em relação à referência. Os blocos são independentes, avaliados em paralelo, e só
+# estatísticas de tamanho fixo voltam de cada um.
+#
+# Com um alvo de erro, indica por operação o núcleo mais barato que o atende, na ordem de NUCLEOS_COMPARADOS.
+
+# Núcleos em ordem crescente de custo estimado: os ITERATIONS estágios desenrolados do paralelo pesam mais
+# que a largura de 48 bits do Q16.32
+NUCLEOS_COMPARADOS = ("cordic", "cordic_q16_32", "cordic_parallel", "cordic_parallel_q16_32")
+
+# Casos sorteados por operação
+CASOS_DIFERENCIAL = 1 << 20
+
+# Pontos por eixo da grade de onde os casos das operações 2-D são sorteados
+PONTOS_DIFERENCIAL = 1 << 16
+
+# Casos avaliados por tarefa
+TAMANHO_BLOCO_DIFERENCIAL = 1 << 17
+
+# Menores entradas guardadas por par de núcleos
+EXEMPLOS_DIVERGENCIA = 3
+
+
+def nome_par(nucleo_a, nucleo_b):
+    return f"{nucleo_a} x {nucleo_b}"
+
+
+def entradas_aleatorias(op_name, casos, rng, pontos=PONTOS_DIFERENCIAL, dominio=None):
+    """
+    Palavras Q16.16 (x_in, y_in, z_in) sorteadas uniformemente em 'dominio' (padrão: o das tabelas de teste,
+    com SIN e COS de -360° a 360° em vez das 2^32 palavras da varredura).
+    """
+    dominio = DOMINIOS_TABELAS[op_name] if dominio is None else dominio
+    indices = rng.integers(0, tamanho_dominio(op_name, pontos, pontos, dominio=dominio), casos)
+    return entradas_indices(op_name, indices, pontos, pontos, dominio=dominio)
+
+
+def entradas_arquivos(caminhos):
+    """Palavras Q16.16 (x_in, y_in, z_in) por operação de tabelas test_cases_<op>[_NNNN].txt e arquivos .hex."""
+    blocos = {}
+    for caminho in caminhos:
+        if caminho.endswith(".hex"):
+            vetores = carregar_vetores(caminho)
+            for op_name, (codigo, _, _, _) in OPERACOES.items():
+                selecao = vetores["operacao"] == codigo
+                if selecao.any():
+                    blocos.setdefault(op_name, []).append(tuple(vetores[campo][selecao] for campo in ("x", "y", "z")))
+            continue
+        op_name = os.path.basename(caminho)[len("test_cases_"):-len(".txt")].split("_")[0].upper()
+        for x_val, y_val, z_val, _ in ler_tabela(caminho, op_name):
+            blocos.setdefault(op_name, []).append(tuple(real_to_q16_16(valor) for valor in (x_val, y_val, z_val)))
+    return {op_name: tuple(np.concatenate(campo).astype(np.int64) for campo in zip(*partes))
+            for op_name, partes in blocos.items()}
+
+
+def _estatisticas_vazias(nucleos):
+    return {
+        "casos": 0,
+        "todos_iguais": 0,
+        "nucleos": {nucleo: {"casos": 0, "soma": 0.0, "soma_quadrados": 0.0, "max": -1.0} for nucleo in nucleos},
+        "pares": {nome_par(a, b): {"divergentes": 0, "max_ulp": 0, "argmax": None, "menores": []}
+                  for a, b in itertools.combinations(nucleos, 2)},
+    }
+
+
+def comparar_bloco(op_name, x_in, y_in, z_in, nucleos=NUCLEOS_COMPARADOS, iteracoes=ITERACOES_PADRAO,
+                   exemplos=EXEMPLOS_DIVERGENCIA):
+    """Estatísticas diferenciais de um bloco de entradas (palavras Q16.16) nos núcleos dados."""
+    resultados = {nucleo: top_level_calc_cordic(op_name, x_in, y_in, z_in, iteracoes, nucleo) for nucleo in nucleos}
+    estatisticas = _estatisticas_vazias(nucleos)
+    estatisticas["casos"] = len(x_in)
+    if not len(x_in):
+        return estatisticas
+
+    referencia = resultado_exato(op_name, q16_16_to_real(x_in), q16_16_to_real(y_in), q16_16_to_real(z_in))
+    valido = np.isfinite(referencia)
+    for nucleo, resultado in resultados.items():
+        erro = np.abs(resultado[valido] - referencia[valido] * 65536.0) / 65536.0
+        if len(erro):
+            estatisticas["nucleos"][nucleo].update({"casos": len(erro), "soma": float(erro.sum()),
+                                                    "soma_quadrados": float(np.dot(erro, erro)),
+                                                    "max": float(erro.max())})
+
+    iguais = np.ones(len(x_in), dtype=bool)
+    magnitude = np.abs(x_in) + np.abs(y_in) + np.abs(z_in)
+    for a, b in itertools.combinations(nucleos, 2):
+        diferenca = np.abs(resultados[a] - resultados[b])
+        divergentes = np.flatnonzero(diferenca)
+        iguais[divergentes] = False
+        if not len(divergentes):
+            continue
+        par = estatisticas["pares"][nome_par(a, b)]
+        pior = int(divergentes[np.argmax(diferenca[divergentes])])
+        menores = divergentes[np.argsort(magnitude[divergentes], kind="stable")[:exemplos]]
+        par.update({
+            "divergentes": len(divergentes),
+            "max_ulp": int(diferenca[pior]),
+            "argmax": [int(x_in[pior]), int(y_in[pior]), int(z_in[pior]),
+                       int(resultados[a][pior]), int(resultados[b][pior])],
+            "menores": [[int(magnitude[k]), int(x_in[k]), int(y_in[k]), int(z_in[k]),
+                         int(resultados[a][k]), int(resultados[b][k])] for k in menores],
+        })
+    estatisticas["todos_iguais"] = int(np.count_nonzero(iguais))
+    return estatisticas
+
+
+def combinar_estatisticas(a, b, exemplos=EXEMPLOS_DIVERGENCIA):
+    """Junta as estatísticas diferenciais de dois blocos da mesma operação."""
+    combinadas = {"casos": a["casos"] + b["casos"], "todos_iguais": a["todos_iguais"] + b["todos_iguais"],
+                  "nucleos": {}, "pares": {}}
+    for nucleo, est_a in a["nucleos"].items():
+        est_b = b["nucleos"][nucleo]
+        combinadas["nucleos"][nucleo] = {"casos": est_a["casos"] + est_b["casos"],
+                                         "soma": est_a["soma"] + est_b["soma"],
+                                         "soma_quadrados": est_a["soma_quadrados"] + est_b["soma_quadrados"],
+                                         "max": max(est_a["max"], est_b["max"])}
+    for par, est_a in a["pares"].items():
+        est_b = b["pares"][par]
+        pior = est_a if est_a["max_ulp"] >= est_b["max_ulp"] else est_b
+        combinadas["pares"][par] = {"divergentes": est_a["divergentes"] + est_b["divergentes"],
+                                    "max_ulp": pior["max_ulp"], "argmax": pior["argmax"],
+                                    "menores": heapq.nsmallest(exemplos, est_a["menores"] + est_b["menores"])}
+    return combinadas
+
+
+def _tarefa_bloco(tarefa):
+    """Tarefa de um processo do pool: sorteia (ou recebe) um bloco de entradas e compara os núcleos."""
+    op_name, entradas, semente, casos, nucleos, iteracoes, exemplos = tarefa
+    if entradas is None:
+        entradas = entradas_aleatorias(op_name, casos, np.random.default_rng(semente))
+    return op_name, comparar_bloco(op_name, *entradas, nucleos, iteracoes, exemplos)
+
+
+def comparar_nucleos(operacoes, casos=CASOS_DIFERENCIAL, semente=None, entradas=None, nucleos=NUCLEOS_COMPARADOS,
+                     iteracoes=ITERACOES_PADRAO, jobs=1, exemplos=EXEMPLOS_DIVERGENCIA,
+                     tamanho_bloco=TAMANHO_BLOCO_DIFERENCIAL):
+    """
+    Compara os núcleos em cada operação, sobre 'casos' entradas sorteadas (blocos com sementes derivadas de
+    'semente') ou sobre as entradas dadas em 'entradas' ({op: (x_in, y_in, z_in)}). Retorna {op: relatório}.
+    """
+    sementes = np.random.SeedSequence(semente)
+    tarefas = []
+    for op_name in operacoes:
+        if entradas is not None:
+            x_in, y_in, z_in = entradas[op_name]
+            tarefas += [(op_name, (x_in[inicio:inicio + tamanho_bloco], y_in[inicio:inicio + tamanho_bloco],
+                                   z_in[inicio:inicio + tamanho_bloco]), None, None, nucleos, iteracoes, exemplos)
+                        for inicio in range(0, len(x_in), tamanho_bloco)]
+            continue
+        for inicio in range(0, casos, tamanho_bloco):
+            tarefas.append((op_name, None, sementes.spawn(1)[0], min(tamanho_bloco, casos - inicio), nucleos,
+                            iteracoes, exemplos))
+
+    estatisticas = {op_name: _estatisticas_vazias(nucleos) for op_name in operacoes}
+    if jobs > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            parciais = list(executor.map(_tarefa_bloco, tarefas))
+    else:
+        parciais = map(_tarefa_bloco, tarefas)
+    for op_name, parcial in parciais:
+        estatisticas[op_name] = combinar_estatisticas(estatisticas[op_name], parcial, exemplos)
+    return {op_name: relatorio(est) for op_name, est in estatisticas.items()}
+
+
+def _caso(valores):
+    x_in, y_in, z_in, resultado_a, resultado_b = valores
+    return {"x": x_in / 65536.0, "y": y_in / 65536.0, "z": z_in / 65536.0,
+            "x_in": x_in, "y_in": y_in, "z_in": z_in, "resultados": [resultado_a / 65536.0, resultado_b / 65536.0]}
+
+
+def relatorio(estatisticas):
+    """Taxas de divergência, divergência máxima, menores entradas e erro de cada núcleo."""
+    casos = estatisticas["casos"]
+    return {
+        "casos": casos,
+        "todos_iguais": estatisticas["todos_iguais"],
+        "nucleos": {nucleo: {"erro_max": est["max"] if est["casos"] else None,
+                             "erro_rms": math.sqrt(est["soma_quadrados"] / est["casos"]) if est["casos"] else None}
+                    for nucleo, est in estatisticas["nucleos"].items()},
+        "pares": {par: {"divergentes": est["divergentes"],
+                        "taxa": est["divergentes"] / casos if casos else 0.0,
+                        "divergencia_max_ulp": est["max_ulp"],
+                        "divergencia_max": est["max_ulp"] / 65536.0,
+                        "argmax": _caso(est["argmax"]) if est["argmax"] else None,
+                        "menores": [_caso(exemplo[1:]) for exemplo in est["menores"]]}
+                  for par, est in estatisticas["pares"].items()},
+    }
+
+
+def nucleo_mais_barato(relatorio_op, alvo, nucleos=NUCLEOS_COMPARADOS):
+    """Primeiro núcleo (na ordem de custo) com erro máximo <= alvo, ou None."""
+    for nucleo in nucleos:
+        erro_max = relatorio_op["nucleos"][nucleo]["erro_max"]
+        if erro_max is not None and erro_max <= alvo:
+            return nucleo
+    return None
+
+
+# --- Comparação diferencial dos núcleos ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara os quatro núcleos CORDIC bit a bit sobre as mesmas entradas.")
+    parser.add_argument("operacoes", nargs="*", default=list(DOMINIOS), help="operações (padrão: todas)")
+    parser.add_argument("--arquivos", nargs="+", help="usa as entradas de tabelas test_cases_<op>.txt ou .hex")
+    parser.add_argument("--casos", type=int, default=CASOS_DIFERENCIAL, help="casos sorteados por operação")
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--nucleos", nargs="+", choices=NUCLEOS_COMPARADOS, default=list(NUCLEOS_COMPARADOS),
+                        help="núcleos comparados, do mais barato ao mais caro")
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--exemplos", type=int, default=EXEMPLOS_DIVERGENCIA, help="menores entradas por par")
+    parser.add_argument("--alvo", type=float, default=None,
+                        help="erro máximo desejado: indica o núcleo mais barato que o atinge em cada operação")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="blocos avaliados ao mesmo tempo")
+    parser.add_argument("--json", help="grava o relatório neste arquivo JSON")
+    args = parser.parse_args()
+
+    operacoes = [op.upper() for op in args.operacoes]
+    entradas = None
+    if args.arquivos:
+        entradas = entradas_arquivos(args.arquivos)
+        operacoes = [op_name for op_name in operacoes if op_name in entradas]
+    nucleos = [nucleo for nucleo in NUCLEOS_COMPARADOS if nucleo in args.nucleos]
+    relatorios = comparar_nucleos(operacoes, args.casos, args.semente, entradas, nucleos, args.iteracoes,
+                                  args.jobs, args.exemplos)
+
+    print(f"Comparação diferencial: ITERATIONS = {args.iteracoes}\n")
+    for op_name, rel in relatorios.items():
+        print(f"=== {op_name}: {rel['casos']} casos, {rel['todos_iguais']} com todos os núcleos iguais ===")
+        print(f"{'núcleo':<26}{'erro máx':>12}{'erro RMS':>12}")
+        for nucleo, erro in rel["nucleos"].items():
+            erro_max = erro["erro_max"] if erro["erro_max"] is not None else math.nan
+            erro_rms = erro["erro_rms"] if erro["erro_rms"] is not None else math.nan
+            print(f"{nucleo:<26}{erro_max:>12.6f}{erro_rms:>12.6f}")
+        print(f"\n{'par':<50}{'divergentes':>12}{'taxa':>10}{'máx (ULP)':>12}")
+        for par, est in rel["pares"].items():
+            print(f"{par:<50}{est['divergentes']:>12}{est['taxa']:>10.4%}{est['divergencia_max_ulp']:>12}")
+            for exemplo in est["menores"]:
+                print(f"    x={exemplo['x']:.6f} y={exemplo['y']:.6f} z={exemplo['z']:.6f} -> "
+                      f"{exemplo['resultados'][0]:.6f} / {exemplo['resultados'][1]:.6f}")
+        if args.alvo is not None:
+            escolhido = nucleo_mais_barato(rel, args.alvo, nucleos)
+            print(f"\nNúcleo mais barato com erro máximo <= {args.alvo}: {escolhido or 'nenhum'}")
+        print()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(relatorios, f, indent=2)
+            f.write("\n")
+        print(f"Relatório salvo em '{args.json}'")
@@ -0,0 +1,234 @@
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import generate_cordic_test_cases as gerador
+from cordic_model import ITERACOES_PADRAO, NUCLEO_PADRAO, NUCLEOS, q16_16_to_real, real_to_q16_16, top_level_calc_cordic
+
+# Varredura exaustiva / em grade densa do erro de cada operação sobre o modelo bit a bit.
+#
+# Operações de uma entrada (SIN, COS, SINH, COSH) percorrem todas as palavras Q16.16 de z dentro do
+# domínio (para SIN e COS, as 2^32 palavras). Operações de duas entradas percorrem uma grade densa
+# de pontos_x * pontos_y entradas. O domínio é dividido em blocos independentes, processados em
+# paralelo, e cada bloco devolve só estatísticas parciais (memória constante).
+#
+# O erro de cada caso é |resultado - referência|, com a referência calculada em float64 sobre as
+# entradas já quantizadas; em ULPs, 1 ULP = 1 LSB da saída Q16.16 (2^-16).
+
+# Domínios varridos por operação.
+# '1d': z percorre as palavras Q16.16 de 'z' = (mínimo, máximo) em reais.
+# '2d': grade de x por 'y' (caixa) ou por 'razao' (y = razao * x), com x e y já quantizados.
+DOMINIOS = {
+    "SIN": {"tipo": "1d", "z": (-32768.0, 32767.9999847412109375)},
+    "COS": {"tipo": "1d", "z": (-32768.0, 32767.9999847412109375)},
+    "SINH": {"tipo": "1d", "z": (-1.13, 1.13)},
+    "COSH": {"tipo": "1d", "z": (-1.13, 1.13)},
+    "ATAN": {"tipo": "2d", "x": (0.1, 100.0), "razao": (-1.0, 1.0)},
+    "MOD": {"tipo": "2d", "x": (-gerador.MAX_EXPECTED_MOD_RESULT / math.sqrt(2), gerador.MAX_EXPECTED_MOD_RESULT / math.sqrt(2)),
+            "y": (-gerador.MAX_EXPECTED_MOD_RESULT / math.sqrt(2), gerador.MAX_EXPECTED_MOD_RESULT / math.sqrt(2))},
+    "MULT": {"tipo": "2d", "x": (-gerador.Q16_16_MAX_VAL / 10.0, gerador.Q16_16_MAX_VAL / 10.0), "z": (-5.0, 5.0)},
+    "DIV": {"tipo": "2d", "x": (gerador.MIN_DIV_DIVISOR, gerador.MAX_DIV_DIVISOR),
+            "razao": (-gerador.MAX_DIV_QUOTIENT, gerador.MAX_DIV_QUOTIENT)},
+    "ATANH": {"tipo": "2d", "x": (0.1, 10.0),
+              "razao": (-math.tanh(gerador.MAX_EXPECTED_ATANH_RESULT), math.tanh(gerador.MAX_EXPECTED_ATANH_RESULT))},
+    "MODH": {"tipo": "2d", "x": (0.1, 10.0),
+             "razao": (-gerador.MAX_MODH_INPUT_RATIO, gerador.MAX_MODH_INPUT_RATIO)},
+}
+
+# Os mesmos domínios restritos às faixas das tabelas de teste: SIN e COS de -360° a 360°.
+DOMINIOS_TABELAS = dict(DOMINIOS,
+                        SIN={"tipo": "1d", "z": (-2 * math.pi, 2 * math.pi)},
+                        COS={"tipo": "1d", "z": (-2 * math.pi, 2 * math.pi)})
+
+# Pontos por eixo nas grades 2-D
+PONTOS_GRADE = 4096
+
+# Casos avaliados por tarefa
+TAMANHO_BLOCO_VARREDURA = 1 << 22
+
+# Limites das faixas do histograma de ULPs: [0, 1), [1, 2), [2, 4), ..., [2^30, inf)
+LIMITES_HISTOGRAMA_ULP = np.array([0.0] + [float(1 << k) for k in range(31)] + [np.inf])
+
+
+def resultado_exato(op_name, x, y, z):
+    """Resultado matemático exato (float64) para entradas reais já quantizadas."""
+    with np.errstate(all="ignore"):
+        if op_name == "SIN": return np.sin(z)
+        if op_name == "COS": return np.cos(z)
+        if op_name == "ATAN": return np.arctan2(y, x)
+        if op_name == "MOD": return np.hypot(x, y)
+        if op_name == "MULT": return x * z
+        if op_name == "DIV": return y / x
+        if op_name == "SINH": return np.sinh(z)
+        if op_name == "COSH": return np.cosh(z)
+        if op_name == "ATANH": return np.arctanh(y / x)
+        if op_name == "MODH": return np.sqrt(x * x - y * y)
+    raise ValueError(f"Operação desconhecida: {op_name}")
+
+
+def tamanho_dominio(op_name, pontos_x=PONTOS_GRADE, pontos_y=PONTOS_GRADE, passo=1, dominio=None):
+    """Quantidade de casos da varredura de uma operação (no domínio padrão de DOMINIOS ou em 'dominio')."""
+    dominio = DOMINIOS[op_name] if dominio is None else dominio
+    if dominio["tipo"] == "1d":
+        minimo, maximo = (int(v) for v in real_to_q16_16(dominio["z"]))
+        return (maximo - minimo) // passo + 1
+    return pontos_x * pontos_y
+
+
+def entradas_varredura(op_name, inicio, fim, pontos_x=PONTOS_GRADE, pontos_y=PONTOS_GRADE, passo=1, dominio=None):
+    """Palavras Q16.16 (x_in, y_in, z_in) dos casos [inicio, fim) da varredura de uma operação."""
+    return entradas_indices(op_name, np.arange(inicio, fim, dtype=np.int64), pontos_x, pontos_y, passo, dominio)
+
+
+def entradas_indices(op_name, indices, pontos_x=PONTOS_GRADE, pontos_y=PONTOS_GRADE, passo=1, dominio=None):
+    """Palavras Q16.16 (x_in, y_in, z_in) dos casos de índices quaisquer (em [0, tamanho_dominio)) da varredura."""
+    dominio = DOMINIOS[op_name] if dominio is None else dominio
+    indices = np.asarray(indices, dtype=np.int64)
+    zeros = np.zeros_like(indices)
+    if dominio["tipo"] == "1d":
+        minimo = int(real_to_q16_16(dominio["z"][0]))
+        return zeros, zeros, minimo + indices * passo
+
+    def eixo(faixa, pontos, posicao):
+        return faixa[0] + posicao * ((faixa[1] - faixa[0]) / max(pontos - 1, 1))
+
+    x_val = eixo(dominio["x"], pontos_x, indices // pontos_y)
+    if "razao" in dominio:
+        y_val = eixo(dominio["razao"], pontos_y, indices % pontos_y) * x_val
+    else:
+        y_val = eixo(dominio.get("y", dominio.get("z")), pontos_y, indices % pontos_y)
+    if "z" in dominio:
+        return real_to_q16_16(x_val), zeros, real_to_q16_16(y_val)
+    return real_to_q16_16(x_val), real_to_q16_16(y_val), zeros
+
+
+def _estatisticas_vazias():
+    return {"casos": 0, "soma": 0.0, "soma_quadrados": 0.0, "max": -1.0, "argmax": None,
+            "histograma_ulp": [0] * (len(LIMITES_HISTOGRAMA_ULP) - 1)}
+
+
+def avaliar_bloco(op_name, x_in, y_in, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Estatísticas de erro de um bloco de entradas (palavras Q16.16)."""
+    resultado = top_level_calc_cordic(op_name, x_in, y_in, z_in, iteracoes, nucleo)
+    referencia = resultado_exato(op_name, q16_16_to_real(x_in), q16_16_to_real(y_in), q16_16_to_real(z_in))
+    valido = np.isfinite(referencia)
+    if not valido.all():
+        x_in, y_in, z_in, resultado, referencia = (v[valido] for v in (x_in, y_in, z_in, resultado, referencia))
+    estatisticas = _estatisticas_vazias()
+    if len(referencia) == 0:
+        return estatisticas
+    erro_ulp = np.abs(resultado - referencia * 65536.0)
+    erro = erro_ulp / 65536.0
+    pior = int(np.argmax(erro_ulp))
+    estatisticas.update({
+        "casos": len(erro),
+        "soma": float(erro.sum()),
+        "soma_quadrados": float(np.dot(erro, erro)),
+        "max": float(erro[pior]),
+        "argmax": {"x_in": int(x_in[pior]), "y_in": int(y_in[pior]), "z_in": int(z_in[pior]),
+                   "resultado": int(resultado[pior]), "referencia": float(referencia[pior])},
+        "histograma_ulp": np.histogram(erro_ulp, bins=LIMITES_HISTOGRAMA_ULP)[0].tolist(),
+    })
+    return estatisticas
+
+
+def combinar_estatisticas(a, b):
+    """Junta as estatísticas de dois blocos."""
+    pior = a if a["max"] >= b["max"] else b
+    return {
+        "casos": a["casos"] + b["casos"],
+        "soma": a["soma"] + b["soma"],
+        "soma_quadrados": a["soma_quadrados"] + b["soma_quadrados"],
+        "max": pior["max"],
+        "argmax": pior["argmax"],
+        "histograma_ulp": [p + q for p, q in zip(a["histograma_ulp"], b["histograma_ulp"])],
+    }
+
+
+def _tarefa_bloco(tarefa):
+    """Tarefa de um processo do pool: gera e avalia os casos [inicio, fim) de uma operação."""
+    op_name, inicio, fim, pontos_x, pontos_y, passo, iteracoes, nucleo = tarefa
+    x_in, y_in, z_in = entradas_varredura(op_name, inicio, fim, pontos_x, pontos_y, passo)
+    return avaliar_bloco(op_name, x_in, y_in, z_in, iteracoes, nucleo)
+
+
+def varrer_operacao(op_name, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO, pontos_x=PONTOS_GRADE,
+                    pontos_y=PONTOS_GRADE, passo=1, jobs=1, tamanho_bloco=TAMANHO_BLOCO_VARREDURA):
+    """Varre todo o domínio de uma operação e retorna o relatório de erro."""
+    total = tamanho_dominio(op_name, pontos_x, pontos_y, passo)
+    tarefas = [(op_name, inicio, min(inicio + tamanho_bloco, total), pontos_x, pontos_y, passo, iteracoes, nucleo)
+               for inicio in range(0, total, tamanho_bloco)]
+    estatisticas = _estatisticas_vazias()
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for parcial in executor.map(_tarefa_bloco, tarefas):
+                estatisticas = combinar_estatisticas(estatisticas, parcial)
+    else:
+        for tarefa in tarefas:
+            estatisticas = combinar_estatisticas(estatisticas, _tarefa_bloco(tarefa))
+    return relatorio(op_name, estatisticas)
+
+
+def relatorio(op_name, estatisticas):
+    """Converte as estatísticas acumuladas em erro máximo, médio, RMS, histograma e pior caso."""
+    casos = estatisticas["casos"]
+    argmax = estatisticas["argmax"]
+    if argmax is not None:
+        argmax = dict(argmax, **{chave.replace("_in", ""): argmax[chave] / 65536.0
+                                 for chave in ("x_in", "y_in", "z_in")})
+    return {
+        "operacao": op_name,
+        "casos": casos,
+        "erro_max": estatisticas["max"] if casos else None,
+        "erro_medio": estatisticas["soma"] / casos if casos else None,
+        "erro_rms": math.sqrt(estatisticas["soma_quadrados"] / casos) if casos else None,
+        "erro_max_ulp": estatisticas["max"] * 65536.0 if casos else None,
+        "argmax": argmax,
+        "histograma_ulp": {_nome_faixa(k): quantidade for k, quantidade in enumerate(estatisticas["histograma_ulp"])
+                           if quantidade},
+    }
+
+
+def _nome_faixa(k):
+    inferior, superior = LIMITES_HISTOGRAMA_ULP[k], LIMITES_HISTOGRAMA_ULP[k + 1]
+    return f"[{inferior:g}, {superior:g})"
+
+
+# --- Varredura de erro ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Varredura exaustiva do erro das operações do CORDIC.")
+    parser.add_argument("operacoes", nargs="*", default=list(DOMINIOS), help="operações (padrão: todas)")
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO)
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--pontos", type=int, default=PONTOS_GRADE, help="pontos por eixo nas grades 2-D")
+    parser.add_argument("--passo", type=int, default=1,
+                        help="passo entre palavras nas varreduras 1-D (1 = exaustiva)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="processos usados na varredura")
+    parser.add_argument("--json", help="grava os relatórios neste arquivo JSON")
+    args = parser.parse_args()
+
+    print(f"Varredura de erro: núcleo '{args.nucleo}', ITERATIONS = {args.iteracoes}, {args.jobs} processo(s)\n")
+    relatorios = {}
+    for op_name in (op.upper() for op in args.operacoes):
+        inicio = time.perf_counter()
+        resultado = varrer_operacao(op_name, args.iteracoes, args.nucleo, args.pontos, args.pontos, args.passo, args.jobs)
+        resultado["segundos"] = time.perf_counter() - inicio
+        relatorios[op_name] = resultado
+        argmax = resultado["argmax"] or {}
+        print(f"- {op_name}: {resultado['casos']} casos em {resultado['segundos']:.1f} s")
+        if resultado["casos"]:
+            print(f"    erro máximo = {resultado['erro_max']:.6f} ({resultado['erro_max_ulp']:.0f} ULP) em "
+                  f"x={argmax['x']:.6f}, y={argmax['y']:.6f}, z={argmax['z']:.6f}")
+            print(f"    erro médio = {resultado['erro_medio']:.6f}, RMS = {resultado['erro_rms']:.6f}")
+            print("    histograma ULP: " + ", ".join(f"{faixa}: {n}" for faixa, n in resultado["histograma_ulp"].items()))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"nucleo": args.nucleo, "iteracoes": args.iteracoes, "relatorios": relatorios}, f, indent=2)
+            f.write("\n")
+        print(f"\nRelatórios salvos em '{args.json}'")
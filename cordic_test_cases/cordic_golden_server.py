@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import generate_cordic_test_cases as gerador
+from cordic_error_sweep import resultado_exato
+from cordic_model import (
+    CODIGOS_OPERACAO, ITERACOES_PADRAO, NUCLEO_PADRAO, NUCLEOS, calcular_operacoes, q16_16_to_real
+)
+from cordic_vector_format import BYTES_VETOR, CAMPOS, TOLERANCIA_PADRAO, decodificar_vetores
+
+# Serviço local de resultados de referência para co-simulação do top_level_calc_cordic.
+#
+# Atende vários simuladores ao mesmo tempo em um socket Unix (ou um só pela entrada / saída padrão),
+# com um protocolo de linhas de texto nos campos do formato hex de cordic_vector_format.py:
+#
+#   pedido:   <id> <caso> [<caso> ...]      caso = operação (1 dígito, código de OP_CODES) + x_in + y_in + z_in
+#                                           (8 dígitos cada, Q16.16 em complemento de 2) = 25 dígitos hex
+#   resposta: <id> <resultado> [...]        resultado = esperado + tolerância (8 dígitos cada), na ordem dos casos
+#             <id> ERRO <mensagem>          pedido mal formado
+#   ESTATISTICAS                            responde uma linha JSON com os contadores do serviço
+#
+# Os casos de todos os pedidos pendentes, de todas as conexões, são juntados em lotes (até LOTE_MAXIMO casos
+# ou JANELA_COALESCENCIA segundos depois do primeiro) e calculados de forma vetorizada, fora do laço de
+# eventos. Resultados recentes ficam em um cache LRU limitado, consultado antes de enfileirar os casos.
+# Linhas de pedido maiores que LIMITE_LINHA recebem "? ERRO ..." e a conexão é encerrada.
+#
+# O esperado é a referência exata arredondada para Q16.16 (tolerância padrão TOLERANCIA_PADRAO) ou, com
+# referência "modelo", a palavra exata do modelo bit a bit (tolerância 0). Casos sem referência finita
+# (ex.: divisão por zero) respondem esperado 0 com tolerância FFFFFFFF (qualquer resultado é aceito).
+
+ARQUIVO_SOCKET = "/tmp/cordic_golden.sock"
+
+# Casos guardados no cache LRU
+TAMANHO_CACHE = 1 << 20
+
+# Espera máxima (s) para juntar pedidos em um lote, e tamanho máximo do lote
+JANELA_COALESCENCIA = 0.0005
+LOTE_MAXIMO = 1 << 16
+
+# Tamanho máximo (bytes) de uma linha de pedido no socket: cerca de 2,5 milhões de casos
+LIMITE_LINHA = 1 << 26
+
+DIGITOS_PEDIDO = sum(digitos for _, digitos in CAMPOS[:4])
+TOLERANCIA_QUALQUER = 0xFFFFFFFF
+
+CODIGOS_VALIDOS = {int(codigo, 2) for codigo in gerador.OP_CODES.values()}
+
+
+def novo_servico(referencia="matematica", tolerancia=None, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO,
+                 tamanho_cache=TAMANHO_CACHE, janela=JANELA_COALESCENCIA, lote_maximo=LOTE_MAXIMO):
+    """Estado do serviço: configuração, cache LRU, fila de coalescência e contadores."""
+    if tolerancia is None:
+        tolerancia = 0.0 if referencia == "modelo" else TOLERANCIA_PADRAO
+    return {
+        "referencia": referencia, "tolerancia": int(round(tolerancia * 65536.0)), "iteracoes": iteracoes,
+        "nucleo": nucleo, "tamanho_cache": tamanho_cache, "janela": janela, "lote_maximo": lote_maximo,
+        "cache": OrderedDict(), "fila": None,
+        "estatisticas": {"conexoes": 0, "pedidos": 0, "casos": 0, "acertos_cache": 0, "lotes": 0,
+                         "casos_calculados": 0, "maior_lote": 0, "erros": 0, "inicio": time.time()},
+    }
+
+
+def calcular_lote(servico, operacoes, x_in, y_in, z_in):
+    """(esperado, tolerância) de um lote de casos com operações misturadas, como palavras de 32 bits."""
+    if servico["referencia"] == "modelo":
+        esperado = calcular_operacoes(operacoes, x_in, y_in, z_in, servico["iteracoes"], servico["nucleo"])
+        return esperado & 0xFFFFFFFF, np.full(len(esperado), servico["tolerancia"], dtype=np.int64)
+    esperado = np.zeros(len(operacoes), dtype=np.int64)
+    tolerancia = np.full(len(operacoes), servico["tolerancia"], dtype=np.int64)
+    for codigo in np.unique(operacoes):
+        selecao = operacoes == codigo
+        exato = resultado_exato(CODIGOS_OPERACAO[int(codigo)], q16_16_to_real(x_in[selecao]),
+                                q16_16_to_real(y_in[selecao]), q16_16_to_real(z_in[selecao]))
+        finito = np.isfinite(exato)
+        palavras = np.zeros(len(exato), dtype=np.int64)
+        palavras[finito] = np.clip(np.rint(exato[finito] * 65536.0), -(1 << 31), (1 << 31) - 1).astype(np.int64)
+        esperado[selecao] = palavras
+        tolerancia[np.flatnonzero(selecao)[~finito]] = TOLERANCIA_QUALQUER
+    return esperado & 0xFFFFFFFF, tolerancia
+
+
+def decodificar_pedido(casos):
+    """Lista de casos hex (bytes de 25 dígitos) -> lista de chaves (operação, x_in, y_in, z_in)."""
+    if any(len(caso) != DIGITOS_PEDIDO for caso in casos):
+        raise ValueError(f"cada caso deve ter {DIGITOS_PEDIDO} dígitos hexadecimais")
+    # Completa cada caso com esperado / tolerância zerados para usar o decodificador do formato hex
+    complemento = b"0" * (BYTES_VETOR - 1 - DIGITOS_PEDIDO) + b"\n"
+    registros = np.frombuffer(b"".join(caso + complemento for caso in casos), dtype=np.uint8)
+    campos = decodificar_vetores(registros.reshape(-1, BYTES_VETOR))
+    if not np.isin(campos["operacao"], list(CODIGOS_VALIDOS)).all():
+        raise ValueError("código de operação inválido")
+    return list(zip(*(campos[nome].tolist() for nome in ("operacao", "x", "y", "z"))))
+
+
+async def coalescer(servico):
+    """Tarefa que junta os casos pendentes em lotes, calcula cada lote e preenche o cache."""
+    fila = servico["fila"]
+    laco = asyncio.get_running_loop()
+    estatisticas = servico["estatisticas"]
+    while True:
+        pendentes = [await fila.get()]
+        casos = len(pendentes[0][0])
+        prazo = laco.time() + servico["janela"]
+        while casos < servico["lote_maximo"]:
+            restante = prazo - laco.time()
+            if restante <= 0 and fila.empty():
+                break
+            try:
+                pendentes.append(fila.get_nowait() if restante <= 0 else await asyncio.wait_for(fila.get(), restante))
+            except asyncio.TimeoutError:
+                break
+            casos += len(pendentes[-1][0])
+
+        chaves = list(dict.fromkeys(chave for lote, _ in pendentes for chave in lote))
+        try:
+            colunas = np.array(chaves, dtype=np.int64).reshape(-1, 4).T
+            esperado, tolerancia = await laco.run_in_executor(None, calcular_lote, servico, *colunas)
+        except Exception as erro:
+            for _, futuro in pendentes:
+                if not futuro.done():
+                    futuro.set_exception(erro)
+            continue
+        resultados = dict(zip(chaves, zip(esperado.tolist(), tolerancia.tolist())))
+        estatisticas["lotes"] += 1
+        estatisticas["casos_calculados"] += len(chaves)
+        estatisticas["maior_lote"] = max(estatisticas["maior_lote"], len(chaves))
+        cache = servico["cache"]
+        for chave, resultado in resultados.items():
+            cache[chave] = resultado
+        while len(cache) > servico["tamanho_cache"]:
+            cache.popitem(last=False)
+        for lote, futuro in pendentes:
+            if not futuro.done():
+                futuro.set_result([resultados[chave] for chave in lote])
+
+
+async def resolver(servico, chaves):
+    """Resultados (esperado, tolerância) das chaves, do cache ou do próximo lote."""
+    cache = servico["cache"]
+    resultados = [None] * len(chaves)
+    faltantes = []
+    for k, chave in enumerate(chaves):
+        resultado = cache.get(chave)
+        if resultado is None:
+            faltantes.append(k)
+        else:
+            cache.move_to_end(chave)
+            resultados[k] = resultado
+    servico["estatisticas"]["acertos_cache"] += len(chaves) - len(faltantes)
+    if faltantes:
+        futuro = asyncio.get_running_loop().create_future()
+        await servico["fila"].put(([chaves[k] for k in faltantes], futuro))
+        for k, resultado in zip(faltantes, await futuro):
+            resultados[k] = resultado
+    return resultados
+
+
+async def responder(servico, linha):
+    """Resposta (sem '\\n') de uma linha de pedido."""
+    partes = linha.split()
+    if partes == [b"ESTATISTICAS"]:
+        estatisticas = dict(servico["estatisticas"], cache=len(servico["cache"]))
+        estatisticas["tempo"] = time.time() - estatisticas.pop("inicio")
+        return json.dumps(estatisticas).encode()
+    identificador, casos = partes[0], partes[1:]
+    try:
+        chaves = decodificar_pedido(casos)
+    except ValueError as erro:
+        servico["estatisticas"]["erros"] += 1
+        return identificador + b" ERRO " + str(erro).encode()
+    servico["estatisticas"]["pedidos"] += 1
+    servico["estatisticas"]["casos"] += len(chaves)
+    try:
+        resultados = await resolver(servico, chaves)
+    except Exception as erro:
+        servico["estatisticas"]["erros"] += 1
+        return identificador + b" ERRO " + str(erro).encode()
+    return b" ".join([identificador] + [b"%08X%08X" % resultado for resultado in resultados])
+
+
+async def atender(servico, ler_linha, escrever):
+    """
+    Atende uma conexão (ler_linha / escrever são corrotinas de leitura e escrita de bytes): os pedidos são
+    resolvidos em paralelo e respondidos na ordem de chegada.
+    """
+    servico["estatisticas"]["conexoes"] += 1
+    respostas = asyncio.Queue()
+
+    async def enviar_respostas():
+        while (tarefa := await respostas.get()) is not None:
+            await escrever(await tarefa + b"\n")
+
+    envio = asyncio.create_task(enviar_respostas())
+    try:
+        while True:
+            try:
+                linha = await ler_linha()
+            except ValueError as erro:
+                # Linha maior que o limite do leitor: o resto dela não pode ser separado do próximo pedido
+                servico["estatisticas"]["erros"] += 1
+                resposta = asyncio.get_running_loop().create_future()
+                resposta.set_result(b"? ERRO linha de pedido maior que o limite do servidor: " + str(erro).encode())
+                await respostas.put(resposta)
+                break
+            if not linha:
+                break
+            if linha.strip():
+                await respostas.put(asyncio.create_task(responder(servico, linha)))
+    finally:
+        await respostas.put(None)
+        await envio
+
+
+async def _atender_socket(servico, leitor, escritor):
+    async def escrever(dados):
+        escritor.write(dados)
+        await escritor.drain()
+
+    try:
+        await atender(servico, leitor.readline, escrever)
+    finally:
+        escritor.close()
+
+
+async def _atender_stdio(servico):
+    # Leitura e escrita bloqueantes em uma thread: funcionam com pipes, terminais e arquivos comuns
+    laco = asyncio.get_running_loop()
+    saida = sys.stdout.buffer
+
+    def escrever_saida(dados):
+        saida.write(dados)
+        saida.flush()
+
+    async def escrever(dados):
+        await laco.run_in_executor(None, escrever_saida, dados)
+
+    await atender(servico, lambda: laco.run_in_executor(None, sys.stdin.buffer.readline), escrever)
+
+
+async def servir(servico, caminho_socket=None):
+    """Roda o serviço no socket Unix 'caminho_socket', ou na entrada / saída padrão se for None."""
+    servico["fila"] = asyncio.Queue()
+    tarefa_coalescer = asyncio.create_task(coalescer(servico))
+    try:
+        if caminho_socket is None:
+            await _atender_stdio(servico)
+            return
+        if os.path.exists(caminho_socket):
+            os.remove(caminho_socket)
+        servidor = await asyncio.start_unix_server(lambda leitor, escritor: _atender_socket(servico, leitor, escritor),
+                                                   path=caminho_socket, limit=LIMITE_LINHA)
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        tarefa_coalescer.cancel()
+
+
+def consultar(casos, caminho_socket=ARQUIVO_SOCKET, identificador="0"):
+    """
+    Cliente síncrono: envia os casos (operação, x_in, y_in, z_in) em um pedido e retorna a lista de
+    (esperado, tolerância) como palavras de 32 bits sem sinal.
+    """
+    casos = list(casos)
+    pedido = " ".join([identificador] + [f"{op:01X}{x_in & 0xFFFFFFFF:08X}{y_in & 0xFFFFFFFF:08X}"
+                                         f"{z_in & 0xFFFFFFFF:08X}" for op, x_in, y_in, z_in in casos])
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+        conexao.connect(caminho_socket)
+        conexao.sendall(pedido.encode() + b"\n")
+        with conexao.makefile("rb") as arquivo:
+            resposta = arquivo.readline().split()
+    if not resposta:
+        raise ConnectionError(f"'{caminho_socket}' encerrou a conexão sem responder")
+    if len(resposta) > 1 and resposta[1] == b"ERRO":
+        raise ValueError(b" ".join(resposta[2:]).decode())
+    if len(resposta) - 1 != len(casos):
+        raise ValueError(f"{len(resposta) - 1} resultados para {len(casos)} casos")
+    return [(int(resultado[:8], 16), int(resultado[8:], 16)) for resultado in resposta[1:]]
+
+
+# --- Serviço de referência ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço local de resultados de referência CORDIC para co-simulação.")
+    parser.add_argument("--socket", default=ARQUIVO_SOCKET, help=f"socket Unix (padrão: {ARQUIVO_SOCKET})")
+    parser.add_argument("--stdio", action="store_true", help="atende pela entrada / saída padrão em vez do socket")
+    parser.add_argument("--referencia", choices=("matematica", "modelo"), default="matematica",
+                        help="esperado: referência exata arredondada ou palavra exata do modelo bit a bit")
+    parser.add_argument("--tolerancia", type=float, default=None,
+                        help=f"erro máximo aceito (padrão: {TOLERANCIA_PADRAO} com a referência matemática, 0 com o modelo)")
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO)
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--cache", type=int, default=TAMANHO_CACHE, help="casos guardados no cache LRU")
+    parser.add_argument("--janela", type=float, default=JANELA_COALESCENCIA * 1e3,
+                        help="espera máxima (ms) para juntar pedidos em um lote")
+    parser.add_argument("--lote", type=int, default=LOTE_MAXIMO, help="casos máximos por lote")
+    args = parser.parse_args()
+
+    servico = novo_servico(args.referencia, args.tolerancia, args.iteracoes, args.nucleo, args.cache,
+                           args.janela / 1e3, args.lote)
+    if not args.stdio:
+        print(f"Servindo referências ({args.referencia}) em '{args.socket}'", file=sys.stderr)
+    try:
+        asyncio.run(servir(servico, None if args.stdio else args.socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,443 @@
+import argparse
+import csv
+import glob
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cordic_model import OPERACOES
+from cordic_regression import ARQUIVO_LOG, LINHA_LOG, NOMES_LOG
+
+# Análise em streaming dos resultados dos testbenches, com memória limitada.
+#
+# Lê os logs log_erros_testes.txt (linhas "ACERTO em ... / ERRO em ...") e os CSVs CURVAS / PRECISAO
+# (ou NIVEIS) gravados pelos testbenches de TestBenches/ em blocos de linhas, sem carregar os arquivos
+# inteiros. Cada arquivo produz um resumo parcial de tamanho limitado, e os resumos de vários
+# arquivos (ex.: os logs dos fragmentos da regressão) são combinados; os arquivos são lidos em paralelo.
+#
+# Por operação, o resumo guarda contagens, erro máximo / médio / RMS, um esboço de quantis com erro
+# relativo limitado (baldes logarítmicos, combináveis), os N piores casos e curvas reduzidas para
+# gráficos: cada curva é uma grade de faixas de x com largura potência de 2, dobrada sempre que o
+# número de faixas passa do limite, com a quantidade, o x médio e o mínimo, máximo e média de y de
+# cada faixa.
+
+# Linhas lidas por vez
+LINHAS_POR_BLOCO = 1 << 16
+
+# Erro relativo dos quantis do esboço
+ALFA_ESBOCO = 0.01
+
+# Casos guardados com o maior erro, por operação
+PIORES_CASOS = 10
+
+# Máximo de faixas de cada curva reduzida
+PONTOS_CURVA = 512
+
+QUANTIS = (0.5, 0.9, 0.99, 0.999)
+
+# Operação de cada CSV dos testbenches, pelo nome do arquivo (nomes compostos antes dos simples)
+NOMES_CSV = (("ARCOTANGENTE HIPERBOLICO", "ATANH"), ("ARCOTANGENTE", "ATAN"), ("COSSENO HIPERBOLICO", "COSH"),
+             ("COSSENO", "COS"), ("SENO HIPERBOLICO", "SINH"), ("SENO", "SIN"), ("DIVISAO", "DIV"),
+             ("MAGNITUDE HIPERBOLICA", "MODH"), ("MAGNITUDE", "MOD"), ("MULTIPLICACAO", "MULT"))
+
+# Testbenches que gravam o CSV de precisão como (nível, entrada) em vez de (entrada, nível)
+PRECISAO_NIVEL_PRIMEIRO = ("COS", "DIV", "MULT")
+
+_NUMERO = re.compile(r"-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?")
+
+
+# --- Esboço de quantis ---
+def esboco_vazio(alfa=ALFA_ESBOCO):
+    """Esboço de quantis de valores >= 0: baldes logarítmicos de razão (1 + alfa) / (1 - alfa)."""
+    return {"alfa": alfa, "zeros": 0, "baldes": {}}
+
+
+def adicionar_esboco(esboco, valores):
+    gama = (1 + esboco["alfa"]) / (1 - esboco["alfa"])
+    valores = np.asarray(valores, dtype=np.float64)
+    positivos = valores[valores > 0]
+    esboco["zeros"] += len(valores) - len(positivos)
+    if len(positivos):
+        indices, contagens = np.unique(np.ceil(np.log(positivos) / math.log(gama)).astype(np.int64),
+                                       return_counts=True)
+        baldes = esboco["baldes"]
+        for indice, contagem in zip(indices.tolist(), contagens.tolist()):
+            baldes[indice] = baldes.get(indice, 0) + contagem
+
+
+def combinar_esbocos(a, b):
+    baldes = dict(a["baldes"])
+    for indice, contagem in b["baldes"].items():
+        baldes[indice] = baldes.get(indice, 0) + contagem
+    return {"alfa": a["alfa"], "zeros": a["zeros"] + b["zeros"], "baldes": baldes}
+
+
+def quantil(esboco, q):
+    """Valor aproximado do quantil q (erro relativo <= alfa); None se o esboço estiver vazio."""
+    total = esboco["zeros"] + sum(esboco["baldes"].values())
+    if total == 0:
+        return None
+    posicao = q * (total - 1)
+    acumulado = esboco["zeros"]
+    if posicao < acumulado:
+        return 0.0
+    gama = (1 + esboco["alfa"]) / (1 - esboco["alfa"])
+    for indice in sorted(esboco["baldes"]):
+        acumulado += esboco["baldes"][indice]
+        if posicao < acumulado:
+            break
+    return 2 * gama**indice / (gama + 1)
+
+
+# --- Curvas reduzidas ---
+def curva_vazia(pontos=PONTOS_CURVA):
+    """Curva reduzida: faixa k cobre [k * 2^expoente, (k + 1) * 2^expoente) -> [n, soma x, mín y, máx y, soma y]."""
+    return {"pontos": pontos, "expoente": None, "faixas": {}}
+
+
+def _juntar_faixa(faixas, indice, valores):
+    atual = faixas.get(indice)
+    if atual is None:
+        faixas[indice] = list(valores)
+    else:
+        atual[0] += valores[0]
+        atual[1] += valores[1]
+        atual[2] = min(atual[2], valores[2])
+        atual[3] = max(atual[3], valores[3])
+        atual[4] += valores[4]
+
+
+def _reduzir_faixas(faixas, vezes):
+    """Junta as faixas em grupos de 2^vezes (largura multiplicada por 2^vezes)."""
+    reduzidas = {}
+    for indice, valores in faixas.items():
+        _juntar_faixa(reduzidas, indice >> vezes, valores)
+    return reduzidas
+
+
+def _limitar_curva(curva):
+    while len(curva["faixas"]) > curva["pontos"]:
+        curva["faixas"] = _reduzir_faixas(curva["faixas"], 1)
+        curva["expoente"] += 1
+
+
+def combinar_curvas(a, b):
+    if b["expoente"] is None:
+        return {"pontos": a["pontos"], "expoente": a["expoente"], "faixas": dict(a["faixas"])}
+    if a["expoente"] is None:
+        return {"pontos": a["pontos"], "expoente": b["expoente"], "faixas": dict(b["faixas"])}
+    expoente = max(a["expoente"], b["expoente"])
+    faixas = _reduzir_faixas(a["faixas"], expoente - a["expoente"])
+    for indice, valores in _reduzir_faixas(b["faixas"], expoente - b["expoente"]).items():
+        _juntar_faixa(faixas, indice, valores)
+    curva = {"pontos": a["pontos"], "expoente": expoente, "faixas": faixas}
+    _limitar_curva(curva)
+    return curva
+
+
+def adicionar_curva(curva, x_val, y_val):
+    """Acrescenta os pontos (x, y) de um bloco à curva."""
+    x_val = np.asarray(x_val, dtype=np.float64)
+    y_val = np.asarray(y_val, dtype=np.float64)
+    finitos = np.isfinite(x_val) & np.isfinite(y_val)
+    x_val, y_val = x_val[finitos], y_val[finitos]
+    if not len(x_val):
+        return curva
+    expoente = curva["expoente"]
+    if expoente is None:
+        # Largura inicial: a menor potência de 2 que cobre o primeiro bloco com 'pontos' faixas
+        amplitude = float(x_val.max() - x_val.min()) or 1.0
+        expoente = math.ceil(math.log2(amplitude / curva["pontos"]))
+    while True:
+        unicos, inverso = np.unique(np.floor(np.ldexp(x_val, -expoente)).astype(np.int64), return_inverse=True)
+        if len(unicos) <= curva["pontos"]:
+            break
+        expoente += 1
+    n = np.bincount(inverso)
+    soma_x = np.bincount(inverso, weights=x_val)
+    soma_y = np.bincount(inverso, weights=y_val)
+    minimo = np.full(len(unicos), np.inf)
+    maximo = np.full(len(unicos), -np.inf)
+    np.minimum.at(minimo, inverso, y_val)
+    np.maximum.at(maximo, inverso, y_val)
+    bloco = {"pontos": curva["pontos"], "expoente": expoente,
+             "faixas": {indice: [int(n[k]), float(soma_x[k]), float(minimo[k]), float(maximo[k]), float(soma_y[k])]
+                        for k, indice in enumerate(unicos.tolist())}}
+    return combinar_curvas(curva, bloco)
+
+
+def pontos_curva(curva):
+    """Pontos da curva em ordem de x: (x médio, y mínimo, y máximo, y médio, quantidade)."""
+    return [(soma_x / n, minimo, maximo, soma_y / n, n)
+            for _, (n, soma_x, minimo, maximo, soma_y) in sorted(curva["faixas"].items())]
+
+
+# --- Leitura dos arquivos ---
+def _estatisticas_vazias(alfa=ALFA_ESBOCO, pontos=PONTOS_CURVA):
+    return {"casos": 0, "acertos": 0, "erros": 0, "soma": 0.0, "soma_quadrados": 0.0, "max": -1.0,
+            "esboco": esboco_vazio(alfa), "piores": [], "curva": curva_vazia(pontos)}
+
+
+def _blocos_linhas(caminho, linhas_por_bloco=LINHAS_POR_BLOCO):
+    with open(caminho, encoding="utf-8", errors="replace") as f:
+        while True:
+            linhas = list(itertools.islice(f, linhas_por_bloco))
+            if not linhas:
+                return
+            yield linhas
+
+
+def _guardar_piores(piores, candidatos, quantidade):
+    """Mantém em 'piores' (heap mínimo) os 'quantidade' casos (erro, linha) de maior erro."""
+    for candidato in candidatos:
+        if len(piores) < quantidade:
+            heapq.heappush(piores, candidato)
+        elif candidato > piores[0]:
+            heapq.heapreplace(piores, candidato)
+
+
+def analisar_log(caminho, piores=PIORES_CASOS, alfa=ALFA_ESBOCO, pontos=PONTOS_CURVA):
+    """
+    Lê um log_erros_testes.txt em blocos e retorna {op: estatísticas}. A curva de cada operação é o
+    erro em função da primeira entrada do nome do caso (o ângulo em graus no SIN / COS).
+    """
+    estatisticas = {}
+    for linhas in _blocos_linhas(caminho):
+        por_operacao = {}
+        for linha in linhas:
+            encontrado = LINHA_LOG.match(linha.strip())
+            if encontrado:
+                situacao, nome, entradas, _, _, erro = encontrado.groups()
+                primeira = _NUMERO.search(entradas)
+                por_operacao.setdefault(NOMES_LOG.get(nome, nome), []).append(
+                    (situacao == "ERRO", float(erro), float(primeira.group()) if primeira else math.nan,
+                     linha.strip()))
+        for op_name, casos in por_operacao.items():
+            est = estatisticas.setdefault(op_name, _estatisticas_vazias(alfa, pontos))
+            falhou = np.fromiter((caso[0] for caso in casos), dtype=bool, count=len(casos))
+            erro = np.fromiter((caso[1] for caso in casos), dtype=np.float64, count=len(casos))
+            entrada = np.fromiter((caso[2] for caso in casos), dtype=np.float64, count=len(casos))
+            num_erros = int(np.count_nonzero(falhou))
+            est["casos"] += len(erro)
+            est["erros"] += num_erros
+            est["acertos"] += len(erro) - num_erros
+            est["soma"] += float(erro.sum())
+            est["soma_quadrados"] += float(np.dot(erro, erro))
+            est["max"] = max(est["max"], float(erro.max()))
+            adicionar_esboco(est["esboco"], erro)
+            est["curva"] = adicionar_curva(est["curva"], entrada, erro)
+            _guardar_piores(est["piores"], ((float(erro[k]), casos[k][3])
+                                            for k in np.argsort(-erro, kind="stable")[:piores]), piores)
+    return estatisticas
+
+
+def tipo_csv(caminho):
+    """(operação, "curva" ou "precisao") de um CSV dos testbenches, pelo nome do arquivo; None se desconhecido."""
+    nome = os.path.basename(caminho).upper()
+    for trecho, op_name in NOMES_CSV:
+        if trecho in nome:
+            if nome.startswith("CURVAS"):
+                return op_name, "curva"
+            if nome.startswith(("PRECISAO", "NIVEIS")):
+                return op_name, "precisao"
+    return None
+
+
+def analisar_csv(caminho, pontos=PONTOS_CURVA):
+    """
+    Lê um CSV CURVAS (entrada, resultado) ou PRECISAO / NIVEIS (entrada e nível de precisão) em blocos.
+    Retorna {op: {"curva": ...}} ou {op: {"niveis": {nível: quantidade}, "curva": ...}}.
+    """
+    op_name, tipo = tipo_csv(caminho)
+    resultado = {"curva": curva_vazia(pontos)}
+    if tipo == "precisao":
+        resultado["niveis"] = {}
+    for linhas in _blocos_linhas(caminho):
+        valores = np.array([[float(campo) for campo in linha] for linha in csv.reader(linhas) if len(linha) >= 2],
+                           dtype=np.float64).reshape(-1, 2)
+        x_val, y_val = valores[:, 0], valores[:, 1]
+        if tipo == "precisao":
+            if op_name in PRECISAO_NIVEL_PRIMEIRO:
+                x_val, y_val = y_val, x_val
+            niveis, contagens = np.unique(y_val.astype(np.int64), return_counts=True)
+            for nivel, contagem in zip(niveis.tolist(), contagens.tolist()):
+                resultado["niveis"][nivel] = resultado["niveis"].get(nivel, 0) + contagem
+        resultado["curva"] = adicionar_curva(resultado["curva"], x_val, y_val)
+    return {op_name: resultado}
+
+
+def _vazio():
+    return {"logs": {}, "curvas": {}, "precisao": {}, "arquivos": 0}
+
+
+def analisar_arquivo(tarefa):
+    """Tarefa de um processo do pool: resumo parcial de um arquivo (log ou CSV)."""
+    caminho, piores, alfa, pontos = tarefa
+    resumo = _vazio()
+    resumo["arquivos"] = 1
+    tipo = tipo_csv(caminho)
+    if tipo is None:
+        resumo["logs"] = analisar_log(caminho, piores, alfa, pontos)
+    else:
+        resumo["curvas" if tipo[1] == "curva" else "precisao"] = analisar_csv(caminho, pontos)
+    return resumo
+
+
+def _combinar_estatisticas(a, b, piores):
+    combinadas = {
+        "casos": a["casos"] + b["casos"],
+        "acertos": a["acertos"] + b["acertos"],
+        "erros": a["erros"] + b["erros"],
+        "soma": a["soma"] + b["soma"],
+        "soma_quadrados": a["soma_quadrados"] + b["soma_quadrados"],
+        "max": max(a["max"], b["max"]),
+        "esboco": combinar_esbocos(a["esboco"], b["esboco"]),
+        "piores": list(a["piores"]),
+        "curva": combinar_curvas(a["curva"], b["curva"]),
+    }
+    _guardar_piores(combinadas["piores"], b["piores"], piores)
+    return combinadas
+
+
+def combinar_resumos(a, b, piores=PIORES_CASOS):
+    """Junta os resumos parciais de dois conjuntos de arquivos."""
+    combinado = {"logs": dict(a["logs"]), "curvas": dict(a["curvas"]), "precisao": dict(a["precisao"]),
+                 "arquivos": a["arquivos"] + b["arquivos"]}
+    for op_name, est in b["logs"].items():
+        atual = combinado["logs"].get(op_name)
+        combinado["logs"][op_name] = est if atual is None else _combinar_estatisticas(atual, est, piores)
+    for chave in ("curvas", "precisao"):
+        for op_name, resultado in b[chave].items():
+            atual = combinado[chave].get(op_name)
+            if atual is None:
+                combinado[chave][op_name] = resultado
+                continue
+            juntos = {"curva": combinar_curvas(atual["curva"], resultado["curva"])}
+            if "niveis" in atual:
+                juntos["niveis"] = dict(atual["niveis"])
+                for nivel, contagem in resultado["niveis"].items():
+                    juntos["niveis"][nivel] = juntos["niveis"].get(nivel, 0) + contagem
+            combinado[chave][op_name] = juntos
+    return combinado
+
+
+def arquivos_entrada(caminhos):
+    """Expande as pastas em logs (log_erros_testes*.txt) e CSVs dos testbenches, recursivamente."""
+    arquivos = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            encontrados = glob.glob(os.path.join(caminho, "**", "log_erros_testes*.txt"), recursive=True)
+            encontrados += [csv_ for csv_ in glob.glob(os.path.join(caminho, "**", "*.csv"), recursive=True)
+                            if tipo_csv(csv_) is not None]
+            arquivos.extend(sorted(encontrados))
+        else:
+            arquivos.append(caminho)
+    return arquivos
+
+
+def analisar(caminhos, jobs=1, piores=PIORES_CASOS, alfa=ALFA_ESBOCO, pontos=PONTOS_CURVA):
+    """Analisa os arquivos (em paralelo com 'jobs' processos) e retorna o resumo combinado."""
+    tarefas = [(caminho, piores, alfa, pontos) for caminho in arquivos_entrada(caminhos)]
+    if jobs > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            parciais = list(executor.map(analisar_arquivo, tarefas))
+    else:
+        parciais = map(analisar_arquivo, tarefas)
+    resumo = _vazio()
+    for parcial in parciais:
+        resumo = combinar_resumos(resumo, parcial, piores)
+    return resumo
+
+
+def _ordem_operacoes(nomes):
+    return sorted(nomes, key=lambda nome: list(OPERACOES).index(nome) if nome in OPERACOES else len(OPERACOES))
+
+
+def relatorio(resumo):
+    """Resumo compacto (serializável em JSON): estatísticas, quantis e piores casos por operação."""
+    saida = {"arquivos": resumo["arquivos"], "logs": {}, "precisao": {}}
+    for op_name in _ordem_operacoes(resumo["logs"]):
+        est = resumo["logs"][op_name]
+        casos = est["casos"]
+        saida["logs"][op_name] = {
+            "casos": casos,
+            "acertos": est["acertos"],
+            "erros": est["erros"],
+            "erro_max": est["max"] if casos else None,
+            "erro_medio": est["soma"] / casos if casos else None,
+            "erro_rms": math.sqrt(est["soma_quadrados"] / casos) if casos else None,
+            "quantis": {f"p{100 * q:g}": quantil(est["esboco"], q) for q in QUANTIS},
+            "piores": [{"erro": erro, "linha": linha} for erro, linha in sorted(est["piores"], reverse=True)],
+        }
+    for op_name in _ordem_operacoes(resumo["precisao"]):
+        saida["precisao"][op_name] = {str(nivel): quantidade
+                                      for nivel, quantidade in sorted(resumo["precisao"][op_name]["niveis"].items())}
+    return saida
+
+
+def gravar_curvas(resumo, pasta):
+    """Grava as curvas reduzidas em CSV (x, y_min, y_max, y_medio, n) e retorna os arquivos gravados."""
+    os.makedirs(pasta, exist_ok=True)
+    gravados = []
+    fontes = (("logs", "erro"), ("curvas", "curva"), ("precisao", "precisao"))
+    for chave, prefixo in fontes:
+        for op_name, dados in resumo[chave].items():
+            caminho = os.path.join(pasta, f"{prefixo}_{op_name.lower()}.csv")
+            with open(caminho, "w") as f:
+                f.write("x,y_min,y_max,y_medio,n\n")
+                for x_val, minimo, maximo, media, n in pontos_curva(dados["curva"]):
+                    f.write(f"{x_val:.6f},{minimo:.6f},{maximo:.6f},{media:.6f},{n}\n")
+            gravados.append(caminho)
+    return gravados
+
+
+# --- Análise dos logs ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume logs e CSVs dos testbenches CORDIC em streaming.")
+    parser.add_argument("caminhos", nargs="*", default=[ARQUIVO_LOG],
+                        help=f"arquivos ou pastas (padrão: {ARQUIVO_LOG}); pastas são varridas recursivamente")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="arquivos analisados ao mesmo tempo")
+    parser.add_argument("--piores", type=int, default=PIORES_CASOS, help="piores casos guardados por operação")
+    parser.add_argument("--alfa", type=float, default=ALFA_ESBOCO, help="erro relativo dos quantis")
+    parser.add_argument("--pontos", type=int, default=PONTOS_CURVA, help="pontos máximos de cada curva reduzida")
+    parser.add_argument("--curvas", help="pasta onde gravar as curvas reduzidas em CSV")
+    parser.add_argument("--json", help="grava o resumo neste arquivo JSON")
+    args = parser.parse_args()
+
+    resumo = analisar(args.caminhos, args.jobs, args.piores, args.alfa, args.pontos)
+    saida = relatorio(resumo)
+    print(f"{saida['arquivos']} arquivo(s) analisado(s)\n")
+
+    if saida["logs"]:
+        print(f"{'operação':<10}{'casos':>10}{'erros':>8}{'erro máx':>12}{'médio':>12}{'RMS':>12}"
+              f"{'p50':>12}{'p99':>12}{'p99.9':>12}")
+        for op_name, linha in saida["logs"].items():
+            quantis = {nome: valor if valor is not None else math.nan for nome, valor in linha["quantis"].items()}
+            print(f"{op_name:<10}{linha['casos']:>10}{linha['erros']:>8}{linha['erro_max']:>12.6f}"
+                  f"{linha['erro_medio']:>12.6f}{linha['erro_rms']:>12.6f}{quantis['p50']:>12.6f}"
+                  f"{quantis['p99']:>12.6f}{quantis['p99.9']:>12.6f}")
+        for op_name, linha in saida["logs"].items():
+            if linha["piores"]:
+                print(f"\nPiores casos de {op_name}:")
+                for pior in linha["piores"]:
+                    print(f"  {pior['linha']}")
+
+    if saida["precisao"]:
+        print("\nNíveis de precisão (casas decimais corretas; -1 = erro >= 1):")
+        for op_name, niveis in saida["precisao"].items():
+            print(f"- {op_name}: " + ", ".join(f"{nivel}: {quantidade}" for nivel, quantidade in niveis.items()))
+
+    if args.curvas:
+        gravados = gravar_curvas(resumo, args.curvas)
+        print(f"\n{len(gravados)} curva(s) reduzida(s) salvas em '{args.curvas}'")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(saida, f, indent=2)
+            f.write("\n")
+        print(f"Resumo salvo em '{args.json}'")
@@ -0,0 +1,421 @@
+import functools
+import os
+
+import numpy as np
+
+# Modelo de referência bit a bit (golden model) dos núcleos CORDIC.
+#
+# Reproduz, sobre vetores NumPy inteiros, exatamente as mesmas operações de deslocamento
+# e soma feitas em cordic.v / cordic_q16_32.v / cordic_parallel.v / cordic_parallel_q16_32.v,
+# incluindo as LUTs, a repetição das iterações 4 e 13 no modo hiperbólico, a correção de
+# quadrante (correcao_quadrante_pi_4), a redução de z da multiplicação (corr_z_multi),
+# a multiplicação pelo ganho K_INV no FINALIZE e os truncamentos do operador >>>.
+# Todas as entradas e saídas externas são palavras Q16.16 (inteiros de 32 bits com sinal).
+
+# --- Constantes do Hardware ---
+# MODO COORDENADA
+CIRCULAR = 0b01    # 1 para Circular
+LINEAR = 0b00      # 0 para Linear
+HYPERBOLIC = 0b11  # -1 para Hiperbólico
+
+# MODO OPERAÇÃO
+ROTATION = 0   # 0 para Rotação
+VECTORING = 1  # 1 para Vetorização
+
+# Operações do top_level_calc_cordic: (código, mode_coord, mode_op, saída usada como resultado)
+OPERACOES = {
+    "SIN": (0b0000, CIRCULAR, ROTATION, "y"),
+    "COS": (0b0001, CIRCULAR, ROTATION, "x"),
+    "ATAN": (0b0010, CIRCULAR, VECTORING, "z"),
+    "MOD": (0b0011, CIRCULAR, VECTORING, "x"),
+    "MULT": (0b0100, LINEAR, ROTATION, "y"),
+    "DIV": (0b0101, LINEAR, VECTORING, "z"),
+    "SINH": (0b0110, HYPERBOLIC, ROTATION, "y"),
+    "COSH": (0b0111, HYPERBOLIC, ROTATION, "x"),
+    "ATANH": (0b1000, HYPERBOLIC, VECTORING, "z"),
+    "MODH": (0b1001, HYPERBOLIC, VECTORING, "x"),
+}
+CODIGOS_OPERACAO = {codigo: nome for nome, (codigo, _, _, _) in OPERACOES.items()}
+
+# Formatos internos: constantes copiadas dos localparams e LUTs dos arquivos Verilog.
+FORMATOS = {
+    # cordic.v / cordic_parallel.v / correcao_quadrante_PI_4.v / corr_z_multi.v
+    "q16_16": {
+        "largura": 32,
+        "fracionarios": 16,
+        "k_inv_circular": 39797,
+        "k_inv_hyperbolic": 79134,
+        "circular_lut": (
+            51472, 30386, 16053, 8140, 4090, 2047, 1023, 511,
+            255, 127, 63, 31, 15, 7, 3, 1,
+        ),
+        "linear_lut": (
+            65536, 32768, 16384, 8192, 4096, 2048, 1024, 512,
+            256, 128, 64, 32, 16, 8, 4, 2,
+        ),
+        "hyperbolic_lut": (
+            0, 35999, 16743, 8234, 4104, 2050, 1024, 512,
+            256, 128, 64, 32, 16, 8, 4, 2,
+        ),
+        "_360_2PI": 411775,
+        "_225_POS": 257359,
+        "_45_PI_4_POS": 51472,
+        "_135_3PI_4": 154416,
+        "_90_PI_2": 102944,
+        "_180_PI": 205887,
+        "_315_5_5": 360303,
+        "TWO_POS": 131072,
+    },
+    # cordic_q16_32.v / cordic_parallel_q16_32.v / *_q16_32.v auxiliares
+    "q16_32": {
+        "largura": 48,
+        "fracionarios": 32,
+        "k_inv_circular": 2608131496,
+        "k_inv_hyperbolic": 5186160416,
+        "circular_lut": (
+            3373259426, 1991351318, 1052175346, 534100635, 268086748, 134174063,
+            67103403, 33553749, 16777131, 8388597, 4194303, 2097152, 1048576,
+            524288, 262144, 131072, 65536, 32768, 16384, 8192, 4096, 2048, 1024,
+            512, 256, 128, 64, 32, 16, 8, 4, 2, 1,
+        ),
+        "linear_lut": tuple(1 << (32 - i) for i in range(33)),
+        "hyperbolic_lut": (
+            0, 2360218706, 1097207604, 539459048, 269726207, 134863077, 67431445,
+            33715690, 16857827, 8428905, 4214449, 2107223, 1053611, 526805, 263402,
+            131701, 65850, 32925, 16462, 8231, 4096, 2048, 1023, 511, 255, 127,
+            63, 31, 15, 7, 4, 2, 1,
+        ),
+        "_360_2PI": 26986075409,
+        "_225_POS": 16866297130,
+        "_45_PI_4_POS": 3373259426,
+        "_135_3PI_4": 10119778278,
+        "_90_PI_2": 6746518852,
+        "_180_PI": 13493037704,
+        "_315_5_5": 23623350920,
+        "TWO_POS": 8589934592,
+    },
+}
+
+# Núcleos disponíveis: (arquitetura, formato interno)
+NUCLEOS = {
+    "cordic": ("serial", "q16_16"),
+    "cordic_q16_32": ("serial", "q16_32"),
+    "cordic_parallel": ("paralelo", "q16_16"),
+    "cordic_parallel_q16_32": ("paralelo", "q16_32"),
+}
+
+# Padrões do top_level_calc_cordic.v (núcleo instanciado e parâmetro ITERATIONS)
+NUCLEO_PADRAO = "cordic_parallel_q16_32"
+ITERACOES_PADRAO = 16
+
+# Quantidade de amostras processadas por vez, para manter o uso de memória constante
+TAMANHO_BLOCO = 1 << 18
+
+
+def _ajustar_largura(valores, largura):
+    """Trunca (em complemento de 2) um vetor int64 para 'largura' bits com sinal."""
+    deslocamento = 64 - largura
+    return (valores << deslocamento) >> deslocamento
+
+
+def real_to_q16_16(valores):
+    """Converte reais para palavras Q16.16 como a task real_to_q16_16 do testbench ($rtoi trunca)."""
+    valores = np.asarray(valores, dtype=np.float64)
+    return _ajustar_largura(np.trunc(valores * 65536.0).astype(np.int64), 32)
+
+
+def q16_16_to_real(palavras):
+    """Converte palavras Q16.16 em reais (task q16_16_to_real do testbench)."""
+    return np.asarray(palavras, dtype=np.int64) / 65536.0
+
+
+@functools.lru_cache(maxsize=None)
+def sequencia_iteracoes(mode_coord, iteracoes=ITERACOES_PADRAO, arquitetura="serial"):
+    """
+    Retorna a sequência de índices i (deslocamento 2^-i e entrada da LUT) aplicada pelo núcleo.
+    No serial, o contador começa em 1 no modo hiperbólico e repete os índices 4 e 13 até
+    atingir ITERATIONS-1. No paralelo, cada estágio usa iter_index_hyperbolic(I), truncado
+    para $clog2(ITERATIONS) bits como o fio 'iteration'.
+    """
+    if iteracoes < 2:
+        raise ValueError("ITERATIONS deve ser no mínimo 2")
+    mascara = (1 << (iteracoes - 1).bit_length()) - 1
+    if arquitetura == "paralelo":
+        indices = []
+        for i in range(iteracoes):
+            if mode_coord == HYPERBOLIC:
+                if i <= 3:
+                    i = i + 1
+                elif i >= 14:
+                    i = i - 1
+            indices.append(i & mascara)
+        return tuple(indices)
+    if arquitetura != "serial":
+        raise ValueError(f"Arquitetura desconhecida: {arquitetura}")
+
+    if mode_coord != HYPERBOLIC:
+        return tuple(range(iteracoes))
+    indices = []
+    contador, repetir_4, repetir_13 = 1, True, True
+    while True:
+        indices.append(contador)
+        if contador == iteracoes - 1:
+            return tuple(indices)
+        if contador == 4 and repetir_4:
+            repetir_4 = False
+        elif contador == 13 and repetir_13:
+            repetir_13 = False
+        else:
+            contador = (contador + 1) & mascara
+
+
+def estagios_combinacionais(op_name, iteracoes=ITERACOES_PADRAO):
+    """Profundidade do caminho combinacional do núcleo paralelo: estágios + multiplicação de ganho."""
+    _, mode_coord, mode_op, _ = OPERACOES[op_name]
+    ganho = mode_op == VECTORING and mode_coord in (CIRCULAR, HYPERBOLIC)
+    return len(sequencia_iteracoes(mode_coord, iteracoes, "paralelo")) + int(ganho)
+
+
+def _lut(formato, mode_coord, indice):
+    """Valor de alpha para o índice (0 fora da tabela, como o 'default' das funções LUT)."""
+    nome = {CIRCULAR: "circular_lut", LINEAR: "linear_lut", HYPERBOLIC: "hyperbolic_lut"}[mode_coord]
+    tabela = FORMATOS[formato][nome]
+    return tabela[indice] if indice < len(tabela) else 0
+
+
+def _para_interno(palavras, formato):
+    """Converte Q16.16 para o formato interno ({x_in, 16'b0} nas versões Q16.32)."""
+    palavras = _ajustar_largura(np.asarray(palavras, dtype=np.int64), 32)
+    return palavras << (FORMATOS[formato]["fracionarios"] - 16)
+
+
+def _para_saida(valores, formato):
+    """Pega os 32 bits mais significativos do formato interno (saída Q16.16)."""
+    return valores >> (FORMATOS[formato]["fracionarios"] - 16)
+
+
+def _mult_ganho(valores, k, fracionarios):
+    """
+    Calcula (valores * k) >>> fracionarios para valores >= 0 sem estourar int64.
+    Em Q16.32 o produto chega a ~81 bits, então é separado em duas metades de 24 bits.
+    """
+    alto = valores >> 24
+    baixo = valores & 0xFFFFFF
+    p = alto * k
+    q = baixo * k
+    if fracionarios <= 24:
+        return (p << (24 - fracionarios)) + (q >> fracionarios)
+    d = fracionarios - 24
+    return (p >> d) + ((((p & ((1 << d) - 1)) << 24) + q) >> fracionarios)
+
+
+def correcao_quadrante_pi_4(z_in, formato="q16_16"):
+    """
+    Modelo de correcao_quadrante_pi_4 / correcao_quadrante_pi_4_q16_32.
+    Retorna (z_out no formato interno, quadrante, voltas), onde 'voltas' é a quantidade
+    de passagens pelos estados MAIOR/MENOR (somas/subtrações de 2π) feitas pela FSM.
+    """
+    c = FORMATOS[formato]
+    dois_pi = c["_360_2PI"]
+    z = _para_interno(z_in, formato)
+
+    # Laço VERIF -> MAIOR/MENOR -> VERIF_2 em forma fechada
+    maior = z > dois_pi
+    menor = z < -c["_45_PI_4_POS"]
+    voltas = np.where(maior, z - 1, np.where(menor, dois_pi - 1 - c["_45_PI_4_POS"] - z, 0)) // dois_pi
+    z_normalizado = z - np.where(menor, -dois_pi, dois_pi) * voltas
+
+    # Caso tratado direto no VERIF (entre 315° e 360°), sem passar pelo laço
+    z_normalizado = np.where((voltas == 0) & (z > c["_315_5_5"]), z - dois_pi, z_normalizado)
+
+    # Estado CORQUAD: faixas (45°, 135°], (135°, 180°], (180°, 225°], (225°, 315°];
+    # o resto (inclusive acima de 315° vindo do laço) fica no quadrante 0 sem alteração.
+    limites = np.array([c["_45_PI_4_POS"], c["_135_3PI_4"], c["_180_PI"], c["_225_POS"], c["_315_5_5"]])
+    faixa = np.searchsorted(limites, z_normalizado, side="left")
+    quadrante = np.array([0, 1, 2, 3, 4, 0])[faixa]
+    ajuste = np.array([0, -c["_90_PI_2"], -c["_180_PI"], c["_180_PI"] - dois_pi, c["_90_PI_2"] - dois_pi, 0])
+    z_out = z_normalizado + ajuste[faixa]
+    return _ajustar_largura(z_out, c["largura"]), quadrante, voltas
+
+
+def _bits_significativos(valores):
+    """Quantidade de bits significativos de inteiros não negativos (< 2^53)."""
+    return np.frexp(valores.astype(np.float64))[1].astype(np.int64)
+
+
+def divisoes_corr_z(z_in, formato="q16_16"):
+    """
+    Quantidade de divisões por 2 (passagens pelo estado NORMALIZE) feitas por corr_z_multi,
+    sem o truncamento para os 4 bits de cont_div.
+    """
+    dois = FORMATOS[formato]["TWO_POS"]
+    bits_dois = dois.bit_length() - 1
+    z = _para_interno(z_in, formato)
+    # Quantidade de divisões em forma fechada: z >= 0 precisa de z >>> k < 2, e z < 0 de
+    # ~(z >>> k) = ~z >>> k < 2 - 1 (o valor -2 ainda precisa de mais uma divisão).
+    magnitude = np.where(z < 0, ~z, z)
+    divisoes = np.maximum(_bits_significativos(magnitude) - bits_dois, 0)
+    divisoes += (z < 0) & ((magnitude >> divisoes) == dois - 1)
+    return divisoes
+
+
+def corr_z_multi(z_in, formato="q16_16"):
+    """
+    Modelo de corr_z_multi / corr_z_multi_q16_32: divide z por 2 (>>> 1) até |z| < 2.
+    Retorna (z_out no formato interno, cont_div).
+    """
+    cont_div = divisoes_corr_z(z_in, formato)
+    return _para_interno(z_in, formato) >> cont_div, cont_div & 0xF
+
+
+def cordic(x_in, y_in, z_in, mode_op, mode_coord, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Modelo bit a bit de um núcleo CORDIC (cordic, cordic_q16_32, cordic_parallel,
+    cordic_parallel_q16_32) para um par (mode_op, mode_coord) fixo.
+    Recebe vetores de palavras Q16.16 e retorna (x_out, y_out, z_out) em Q16.16.
+    """
+    arquitetura, formato = NUCLEOS[nucleo]
+    c = FORMATOS[formato]
+    largura, fracionarios = c["largura"], c["fracionarios"]
+
+    # Em Q16.16 os registradores cabem em int32 e o estouro do NumPy já é o do hardware;
+    # em Q16.32 (48 bits) o valor fica em int64 e é truncado a cada iteração.
+    tipo = np.int32 if largura == 32 else np.int64
+    bits = np.iinfo(tipo).bits
+    x, y, z = np.broadcast_arrays(_para_interno(x_in, formato), _para_interno(y_in, formato),
+                                  _para_interno(z_in, formato))
+    x, y, z = x.astype(tipo), y.astype(tipo), z.astype(tipo)
+
+    # INITIALIZE
+    quadrante = cont_div = None
+    if mode_op == ROTATION:
+        if mode_coord == CIRCULAR:
+            x[...] = c["k_inv_circular"]
+            z_tratado, quadrante, _ = correcao_quadrante_pi_4(z_in, formato)
+            z[...] = z_tratado
+        elif mode_coord == HYPERBOLIC:
+            x[...] = c["k_inv_hyperbolic"]
+        elif mode_coord == LINEAR:
+            z_reduzido, cont_div = corr_z_multi(z_in, formato)
+            z[...] = z_reduzido
+
+    # UPDATE: xi+1 = xi − μ σi yi 2^−i ; yi+1 = yi + σi xi 2^−i ; zi+1 = zi − σi αi
+    s = np.empty_like(x)
+    termo_x = np.empty_like(x)
+    termo_y = np.empty_like(x)
+    for indice in sequencia_iteracoes(mode_coord, iteracoes, arquitetura):
+        deslocamento = min(indice, bits - 1)
+        alpha = tipo(_lut(formato, mode_coord, indice))
+        # s = -1 onde sigma = 0 e 0 onde sigma = 1, para fazer sigma ? v : -v como (v ^ s) - s
+        if mode_op == ROTATION:
+            np.right_shift(z, bits - 1, out=s)
+        else:
+            np.bitwise_xor(x, y, out=s)
+            np.right_shift(s, bits - 1, out=s)
+            np.invert(s, out=s)
+        np.right_shift(x, deslocamento, out=termo_x)
+        np.bitwise_xor(termo_x, s, out=termo_x)
+        np.subtract(termo_x, s, out=termo_x)
+        if mode_coord != LINEAR:
+            np.right_shift(y, deslocamento, out=termo_y)
+            np.bitwise_xor(termo_y, s, out=termo_y)
+            np.subtract(termo_y, s, out=termo_y)
+            if mode_coord == CIRCULAR:
+                np.subtract(x, termo_y, out=x)
+            else:
+                np.add(x, termo_y, out=x)
+        np.add(y, termo_x, out=y)
+        np.bitwise_xor(s, alpha, out=termo_x)
+        np.subtract(termo_x, s, out=termo_x)
+        np.subtract(z, termo_x, out=z)
+        if tipo is np.int64 and largura < 64:
+            for registrador in (x, y, z):
+                np.left_shift(registrador, 64 - largura, out=registrador)
+                np.right_shift(registrador, 64 - largura, out=registrador)
+    x, y, z = x.astype(np.int64), y.astype(np.int64), z.astype(np.int64)
+
+    # FINALIZE
+    if mode_op == VECTORING and mode_coord in (CIRCULAR, HYPERBOLIC):
+        k = c["k_inv_circular"] if mode_coord == CIRCULAR else c["k_inv_hyperbolic"]
+        x = _ajustar_largura(_mult_ganho(np.abs(x), k, fracionarios), largura)
+    elif mode_op == ROTATION and mode_coord == CIRCULAR:
+        x_aux, y_aux = x, y
+        troca = (quadrante == 1) | (quadrante == 4)
+        x = np.where(troca, y_aux, x_aux)
+        y = np.where(troca, x_aux, y_aux)
+        # quadrante 1: (-Y, X); 2 e 3: (-X, -Y); 4: (Y, -X)
+        x = np.where((quadrante >= 1) & (quadrante <= 3), -x, x)
+        y = np.where(quadrante >= 2, -y, y)
+        x = _ajustar_largura(x, largura)
+        y = _ajustar_largura(y, largura)
+    elif mode_op == ROTATION and mode_coord == LINEAR:
+        y = _ajustar_largura(y << cont_div, largura)
+
+    return _para_saida(x, formato), _para_saida(y, formato), _para_saida(z, formato)
+
+
+def top_level_calc_cordic(operacao, x_in, y_in, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Modelo do top_level_calc_cordic para uma operação ("SIN", ..., "MODH" ou o código de 4 bits).
+    Recebe vetores de palavras Q16.16 e retorna o vetor 'result' em Q16.16.
+    Processa em blocos de TAMANHO_BLOCO amostras para manter a memória constante.
+    """
+    if not isinstance(operacao, str):
+        operacao = CODIGOS_OPERACAO[int(operacao)]
+    _, mode_coord, mode_op, saida = OPERACOES[operacao]
+    x_in, y_in, z_in = np.broadcast_arrays(
+        np.asarray(x_in, dtype=np.int64), np.asarray(y_in, dtype=np.int64), np.asarray(z_in, dtype=np.int64)
+    )
+    # Entradas ignoradas pelo top level em cada operação
+    zeros = np.zeros_like(x_in)
+    if mode_op == ROTATION and mode_coord != LINEAR:
+        x_in, y_in = zeros, zeros
+    elif mode_op == ROTATION:
+        y_in = zeros
+    else:
+        z_in = zeros
+
+    resultado = np.empty(x_in.shape, dtype=np.int64)
+    planos = [v.reshape(-1) for v in (x_in, y_in, z_in, resultado)]
+    for inicio in range(0, planos[0].size, TAMANHO_BLOCO):
+        fatia = slice(inicio, inicio + TAMANHO_BLOCO)
+        x_out, y_out, z_out = cordic(planos[0][fatia], planos[1][fatia], planos[2][fatia],
+                                     mode_op, mode_coord, iteracoes, nucleo)
+        planos[3][fatia] = {"x": x_out, "y": y_out, "z": z_out}[saida]
+    return resultado
+
+
+def calcular_operacoes(operacoes, x_in, y_in, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Versão do top level para um vetor de códigos de operação misturados."""
+    operacoes = np.asarray(operacoes, dtype=np.int64)
+    x_in, y_in, z_in = (np.broadcast_to(np.asarray(v, dtype=np.int64), operacoes.shape) for v in (x_in, y_in, z_in))
+    resultado = np.zeros(operacoes.shape, dtype=np.int64)
+    for codigo in np.unique(operacoes):
+        selecao = operacoes == codigo
+        resultado[selecao] = top_level_calc_cordic(
+            int(codigo), x_in[selecao], y_in[selecao], z_in[selecao], iteracoes, nucleo
+        )
+    return resultado
+
+
+# --- Comparação do modelo com as tabelas de teste existentes ---
+if __name__ == "__main__":
+    import sys
+
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    nucleo = sys.argv[1] if len(sys.argv) > 1 else NUCLEO_PADRAO
+    iteracoes = int(sys.argv[2]) if len(sys.argv) > 2 else ITERACOES_PADRAO
+
+    print(f"Modelo bit a bit: núcleo '{nucleo}', ITERATIONS = {iteracoes}\n")
+    for op_name in OPERACOES:
+        dados = np.loadtxt(os.path.join(pasta, f"test_cases_{op_name.lower()}.txt"), delimiter=",", ndmin=2)
+        if op_name in ("SIN", "COS"):
+            dados = dados[:, 1:]
+        x_val, y_val, z_val, referencia = dados.T
+        if op_name == "DIV":
+            x_val, y_val = y_val, x_val  # arquivo de divisão guarda dividendo (y) antes do divisor (x)
+        resultado = q16_16_to_real(top_level_calc_cordic(
+            op_name, real_to_q16_16(x_val), real_to_q16_16(y_val), real_to_q16_16(z_val), iteracoes, nucleo
+        ))
+        erro = np.abs(resultado - referencia)
+        print(f"- {op_name}: {len(erro)} casos, erro máximo = {erro.max():.6f}, erro médio = {erro.mean():.6f}")
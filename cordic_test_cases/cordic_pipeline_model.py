@@ -0,0 +1,215 @@
+import argparse
+import itertools
+import json
+import os
+
+import numpy as np
+
+from cordic_cycle_model import bordas_preprocessamento
+from cordic_model import (
+    CODIGOS_OPERACAO, ITERACOES_PADRAO, NUCLEOS, OPERACOES, calcular_operacoes, estagios_combinacionais, real_to_q16_16
+)
+from cordic_vector_format import arquivos_tabela, carregar_vetores, ler_tabela
+
+# Modelo de pipeline do cordic_parallel / cordic_parallel_q16_32 com emissão back-to-back.
+#
+# O núcleo paralelo registra só as entradas (x_in_aux, y_in_aux, z_in_aux e enable_start) e as saídas;
+# os ITERATIONS estágios e a correção de ganho (mult = x[N] * K_INV, nas vetorizações circular e
+# hiperbólica) formam um único caminho combinacional entre esses registradores. Sem pré-processamento,
+# um operando amostrado na borda t sai na borda t + 1 e o núcleo aceita um operando por ciclo.
+# O que limita a vazão são as entradas não registradas:
+#   - mode_op / mode_coord alimentam os estágios e o registro das saídas, então precisam ficar estáveis
+#     da emissão até a borda em que o resultado é registrado. Trocar de modo (ex.: SIN -> ATAN) custa
+#     um ciclo de parada; operações do mesmo modo (SIN/COS, ATAN/MOD, SINH/COSH, ATANH/MODH) seguem
+#     sem parada.
+#   - correcao_quadrante_pi_4 (SIN, COS) e corr_z_multi (MULT) são FSMs não pipelinadas: o enable só é
+#     aceito no estado inicial, e x_in_aux / y_in_aux só registram x_in / y_in na borda seguinte ao done
+#     do pré-processamento. A porta de entrada fica ocupada da emissão até essa borda (bordas do done + 1,
+#     como em cordic_cycle_model.latencia), e só então outro operando pode ser emitido.
+#   - quadrante e cont_div, usados no registro das saídas, só mudam no estado CORQUAD / VERIF da operação
+#     seguinte, depois da borda que registra o resultado anterior, então não causam paradas.
+# O modelo é no nível do núcleo (x_out, y_out, z_out e valid); o resultado de cada operação é a saída
+# que o top_level_calc_cordic seleciona para ela.
+
+# Operações lidas do fluxo por vez (resultados e pré-processamento calculados em bloco)
+TAMANHO_BLOCO_FLUXO = 1 << 14
+
+
+def modo_operacao(op_name):
+    """(mode_coord, mode_op) da operação: operações do mesmo modo podem ser emitidas em sequência."""
+    return OPERACOES[op_name][1:3]
+
+
+def pipeline(fluxo, iteracoes=ITERACOES_PADRAO, nucleo="cordic_parallel_q16_32", tamanho_bloco=TAMANHO_BLOCO_FLUXO):
+    """
+    Emite as operações de 'fluxo' ((operação, x, y, z) em palavras Q16.16) no núcleo paralelo o mais cedo
+    possível e gera, em ordem, um dict por resultado: índice, operação, resultado (Q16.16), borda de
+    emissão (amostragem do enable), borda de conclusão (valid), bordas do pré-processamento e os ciclos
+    de parada antes da emissão, separados pela causa. O fluxo é consumido em blocos, então pode ser infinito.
+    """
+    arquitetura, formato = NUCLEOS[nucleo]
+    if arquitetura != "paralelo":
+        raise ValueError(f"o núcleo '{nucleo}' não é paralelo")
+    fluxo = iter(fluxo)
+    indice = 0
+    emissao_minima = 0  # uma emissão (pulso de enable) por borda
+    porta_livre = 0     # borda seguinte à captura do operando anterior
+    modo_anterior, conclusao_anterior = None, -1
+    while True:
+        bloco = list(itertools.islice(fluxo, tamanho_bloco))
+        if not bloco:
+            return
+        nomes = [op if isinstance(op, str) else CODIGOS_OPERACAO[int(op)] for op, _, _, _ in bloco]
+        codigos = np.array([OPERACOES[op_name][0] for op_name in nomes], dtype=np.int64)
+        x_in, y_in, z_in = (np.array([caso[k] for caso in bloco], dtype=np.int64) for k in (1, 2, 3))
+        resultados = calcular_operacoes(codigos, x_in, y_in, z_in, iteracoes, nucleo).tolist()
+        bordas = np.zeros(len(bloco), dtype=np.int64)
+        for op_name in set(nomes):
+            selecao = codigos == OPERACOES[op_name][0]
+            bordas[selecao] = bordas_preprocessamento(op_name, z_in[selecao], formato)
+
+        for op_name, resultado, preprocessamento in zip(nomes, resultados, bordas.tolist()):
+            modo = modo_operacao(op_name)
+            emissao = max(emissao_minima, porta_livre)
+            parada_pre = emissao - emissao_minima
+            if modo_anterior is not None and modo != modo_anterior:
+                # O modo anterior precisa ficar na entrada até a borda que registra o resultado
+                emissao = max(emissao, conclusao_anterior + 1)
+            parada_modo = emissao - emissao_minima - parada_pre
+            # Borda em que x_in_aux / y_in_aux / enable_start registram o operando
+            captura = emissao + (preprocessamento + 1 if preprocessamento else 0)
+            conclusao = captura + 1
+            yield {"indice": indice, "operacao": op_name, "resultado": resultado, "emissao": emissao,
+                   "conclusao": conclusao, "pre_processamento": preprocessamento,
+                   "parada_pre_processamento": parada_pre, "parada_troca_modo": parada_modo}
+            indice += 1
+            emissao_minima, porta_livre = emissao + 1, captura + 1
+            modo_anterior, conclusao_anterior = modo, conclusao
+
+
+def fluxo_arquivos(caminhos, embaralhar=False, agrupar=False, semente=None):
+    """
+    Fluxo (operação, x, y, z) em palavras Q16.16 lido de arquivos .hex (cordic_vector_format.py, na ordem do
+    arquivo) ou de tabelas test_cases_<op>[_NNNN].txt. Com 'embaralhar' as operações são intercaladas ao
+    acaso; com 'agrupar' são ordenadas por modo (menos trocas de modo). Sem reordenação, é lido sob demanda.
+    """
+    def ler():
+        for caminho in caminhos:
+            if caminho.endswith(".hex"):
+                vetores = carregar_vetores(caminho)
+                campos = (vetores["operacao"], vetores["x"], vetores["y"], vetores["z"])
+                yield from zip(*(campo.tolist() for campo in campos))
+                continue
+            op_name = os.path.basename(caminho)[len("test_cases_"):-len(".txt")].split("_")[0].upper()
+            for x_val, y_val, z_val, _ in ler_tabela(caminho, op_name):
+                palavras = (real_to_q16_16(valor).tolist() for valor in (x_val, y_val, z_val))
+                yield from ((op_name, x_in, y_in, z_in) for x_in, y_in, z_in in zip(*palavras))
+
+    if not embaralhar and not agrupar:
+        return ler()
+    casos = [(op if isinstance(op, str) else CODIGOS_OPERACAO[int(op)], x_in, y_in, z_in)
+             for op, x_in, y_in, z_in in ler()]
+    if embaralhar:
+        casos = [casos[k] for k in np.random.default_rng(semente).permutation(len(casos))]
+    if agrupar:
+        casos.sort(key=lambda caso: modo_operacao(caso[0]))
+    return iter(casos)
+
+
+def resumo_pipeline(resultados, iteracoes=ITERACOES_PADRAO):
+    """Consome os resultados de pipeline() e resume vazão, paradas e latência, no total e por operação."""
+    total = {"resultados": 0, "primeira_emissao": None, "ultima_conclusao": 0, "parada_pre_processamento": 0,
+             "parada_troca_modo": 0, "trocas_modo": 0}
+    por_operacao = {}
+    modo_anterior = None
+    for resultado in resultados:
+        op_name = resultado["operacao"]
+        op = por_operacao.setdefault(op_name, {"resultados": 0, "latencia": 0, "pre_processamento": 0,
+                                               "parada_pre_processamento": 0, "parada_troca_modo": 0})
+        op["resultados"] += 1
+        op["latencia"] += resultado["conclusao"] - resultado["emissao"]
+        op["pre_processamento"] += resultado["pre_processamento"]
+        for causa in ("parada_pre_processamento", "parada_troca_modo"):
+            op[causa] += resultado[causa]
+            total[causa] += resultado[causa]
+        total["resultados"] += 1
+        if total["primeira_emissao"] is None:
+            total["primeira_emissao"] = resultado["emissao"]
+        total["ultima_conclusao"] = resultado["conclusao"]
+        modo = modo_operacao(op_name)
+        total["trocas_modo"] += modo_anterior is not None and modo != modo_anterior
+        modo_anterior = modo
+    if not total["resultados"]:
+        return {"resultados": 0, "operacoes": {}}
+
+    ciclos = total["ultima_conclusao"] - total["primeira_emissao"]
+    relatorio = {
+        "resultados": total["resultados"],
+        "ciclos": ciclos,
+        "resultados_por_ciclo": total["resultados"] / ciclos,
+        "ciclos_parada": total["parada_pre_processamento"] + total["parada_troca_modo"],
+        "parada_pre_processamento": total["parada_pre_processamento"],
+        "parada_troca_modo": total["parada_troca_modo"],
+        "trocas_modo": total["trocas_modo"],
+        "operacoes": {},
+    }
+    for op_name in OPERACOES:
+        if op_name not in por_operacao:
+            continue
+        op = por_operacao[op_name]
+        n = op["resultados"]
+        relatorio["operacoes"][op_name] = {
+            "resultados": n,
+            "latencia_media": op["latencia"] / n,
+            "pre_processamento_medio": op["pre_processamento"] / n,
+            "parada_pre_processamento": op["parada_pre_processamento"],
+            "parada_troca_modo": op["parada_troca_modo"],
+            "estagios_combinacionais": estagios_combinacionais(op_name, iteracoes),
+        }
+    return relatorio
+
+
+# --- Vazão sustentada com emissão back-to-back ---
+if __name__ == "__main__":
+    nucleos_paralelos = sorted(nome for nome, (arquitetura, _) in NUCLEOS.items() if arquitetura == "paralelo")
+    parser = argparse.ArgumentParser(description="Modela a emissão back-to-back de operações no cordic_parallel.")
+    parser.add_argument("arquivos", nargs="*",
+                        help="test_cases_<op>.txt, fragmentos ou .hex (padrão: tabelas da pasta do script)")
+    parser.add_argument("--nucleo", choices=nucleos_paralelos, default="cordic_parallel_q16_32")
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--embaralhar", action="store_true", help="intercala as operações em ordem aleatória")
+    parser.add_argument("--agrupar", action="store_true", help="ordena as operações por modo antes de emitir")
+    parser.add_argument("--semente", type=int, default=None, help="semente do --embaralhar")
+    parser.add_argument("--frequencia", type=float, default=None, help="clock em MHz, para converter em resultados/s")
+    parser.add_argument("--json", help="grava o relatório neste arquivo JSON")
+    args = parser.parse_args()
+
+    arquivos = args.arquivos
+    if not arquivos:
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        arquivos = [caminho for op_name in OPERACOES for caminho in arquivos_tabela(pasta, op_name)]
+
+    fluxo = fluxo_arquivos(arquivos, args.embaralhar, args.agrupar, args.semente)
+    relatorio = resumo_pipeline(pipeline(fluxo, args.iteracoes, args.nucleo), args.iteracoes)
+    if not relatorio["resultados"]:
+        raise SystemExit("Nenhuma operação nos arquivos de entrada")
+
+    print(f"Pipeline: núcleo '{args.nucleo}', ITERATIONS = {args.iteracoes}\n")
+    print(f"{'operação':<10}{'resultados':>12}{'lat. média':>12}{'pré-proc.':>11}{'parada pré':>12}"
+          f"{'parada modo':>13}{'estágios':>10}")
+    for op_name, op in relatorio["operacoes"].items():
+        print(f"{op_name:<10}{op['resultados']:>12}{op['latencia_media']:>12.2f}{op['pre_processamento_medio']:>11.2f}"
+              f"{op['parada_pre_processamento']:>12}{op['parada_troca_modo']:>13}{op['estagios_combinacionais']:>10}")
+
+    print(f"\n{relatorio['resultados']} resultados em {relatorio['ciclos']} ciclos: "
+          f"{relatorio['resultados_por_ciclo']:.4f} resultados/ciclo sustentados")
+    print(f"Ciclos de parada: {relatorio['ciclos_parada']} ({relatorio['parada_pre_processamento']} esperando "
+          f"correcao_quadrante / corr_z_multi, {relatorio['parada_troca_modo']} em {relatorio['trocas_modo']} "
+          f"trocas de modo)")
+    if args.frequencia:
+        print(f"A {args.frequencia:g} MHz: {relatorio['resultados_por_ciclo'] * args.frequencia * 1e6:.0f} resultados/s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(relatorio, f, indent=2)
+            f.write("\n")
+        print(f"Relatório salvo em '{args.json}'")
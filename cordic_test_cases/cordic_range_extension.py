@@ -0,0 +1,278 @@
+import argparse
+import functools
+import json
+import math
+import os
+
+import numpy as np
+
+import generate_cordic_test_cases as gerador
+from cordic_cycle_model import latencia
+from cordic_error_sweep import entradas_indices, resultado_exato, tamanho_dominio
+from cordic_model import (
+    CIRCULAR, HYPERBOLIC, ITERACOES_PADRAO, NUCLEO_PADRAO, NUCLEOS, ROTATION, VECTORING, cordic, q16_16_to_real,
+    real_to_q16_16, top_level_calc_cordic
+)
+from cordic_vector_format import TOLERANCIA_PADRAO, codificar_vetores, quantizar_casos
+
+# Operações com faixa estendida por redução de argumento, ao redor do núcleo CORDIC sem alterações.
+#
+# Cada operação ganha um estágio de pré-processamento e um de pós-processamento, no estilo da
+# correcao_quadrante_pi_4 e da corr_z_multi (FSMs com um laço de correção), modelados bit a bit em Q16.16:
+#
+#   SINH / COSH   |z| = k·ln2 + r, com |r| <= ln2/2 (laço que subtrai LN2). O núcleo calcula cosh r e sinh r;
+#                 com e^±r = cosh r ± sinh r, o pós-processamento faz sinh|z| = (e^r·2^k - e^-r·2^-k) / 2 e
+#                 cosh|z| = (e^r·2^k + e^-r·2^-k) / 2 com deslocamentos e somas, e restaura o sinal do sinh.
+#   ATANH / MODH  u = x + |y| e v = x - |y| (u / v = (1 + t) / (1 - t), t = |y| / x); o laço multiplica v por 4
+#                 (v << 2) enquanto v·4 <= u, chegando a w = v·4^k com u / w em [1, 4). O núcleo recebe
+#                 x' = (u + w) / 2 e y' = (u - w) / 2, com razão y' / x' em [0, 0.6), dentro da convergência.
+#                 Pós: atanh t = atanh(y' / x') + k·ln2 (com o sinal de y) e sqrt(x² - y²) = sqrt(x'² - y'²) / 2^k.
+#   MOD           o laço divide x e y por 2 (>>> 1) enquanto max(|x|, |y|) passa de LIMITE_MOD_ENTRADA, para que
+#                 o x interno (ganho K ~ 1.647) não estoure; o pós-processamento desloca o resultado de volta.
+#
+# Ciclos extras, contados como na corr_z_multi (cordic_cycle_model.bordas_corr_z): o laço leva 1 borda para a
+# primeira verificação e 2 por passo (correção + verificação); ATANH / MODH gastam 1 borda a mais para
+# registrar u e v, e todo pós-processamento registra o resultado em 1 borda.
+#
+# Tolerância: na recomposição do SINH / COSH, o erro do núcleo em e^±r é multiplicado por até 2^k. O erro
+# máximo do núcleo em e^±r (delta) é medido sobre todas as palavras r de [-ln2/2, ln2/2], para o núcleo e o
+# ITERATIONS avaliados, e cada caso aceita a tolerância da faixa nativa mais o que a recomposição acrescenta,
+# delta·(2^k - 1); com k = 0 a tolerância é a nativa. As tabelas de texto só comportam a tolerância fixa do
+# testbench; por isso os
+# vetores estendidos são gravados no formato hex (tolerância por vetor) e, só para as operações de
+# tolerância fixa, também como tabela de texto.
+
+# ln2 em Q16.16 (round(ln 2 · 2^16)) e metade, limite de |r| na redução dos hiperbólicos
+LN2_Q16 = 45426
+METADE_LN2_Q16 = LN2_Q16 // 2
+
+# Maior |x| e |y| do MOD sem escala: LIMITE_MOD_ENTRADA·sqrt(2) = MAX_EXPECTED_MOD_RESULT
+LIMITE_MOD_ENTRADA = int(real_to_q16_16(gerador.MAX_EXPECTED_MOD_RESULT / math.sqrt(2)))
+
+LIMITE_Q16 = (1 << 31) - 1
+
+# Domínios estendidos (mesmo formato de cordic_error_sweep.DOMINIOS), limitados pela saída Q16.16
+DOMINIOS_ESTENDIDOS = {
+    "SINH": {"tipo": "1d", "z": (-11.0, 11.0)},
+    "COSH": {"tipo": "1d", "z": (-11.0, 11.0)},
+    "ATANH": {"tipo": "2d", "x": (0.1, 10.0), "razao": (-0.9999, 0.9999)},
+    "MOD": {"tipo": "2d", "x": (-23000.0, 23000.0), "y": (-23000.0, 23000.0)},
+    "MODH": {"tipo": "2d", "x": (0.1, 10.0), "razao": (-0.9999, 0.9999)},
+}
+
+# Operações avaliadas com a tolerância acrescida do erro do núcleo amplificado por 2^k
+OPERACOES_TOLERANCIA_ESCALADA = ("SINH", "COSH")
+
+# Casos sorteados por operação e pontos por eixo da grade das operações 2-D
+CASOS_ESTENDIDOS = 1 << 18
+PONTOS_ESTENDIDOS = 1 << 14
+
+
+def _saturar(valores):
+    return np.clip(valores, -LIMITE_Q16 - 1, LIMITE_Q16)
+
+
+def _bits(valores):
+    return np.frexp(np.asarray(valores, dtype=np.float64))[1].astype(np.int64)
+
+
+def reducao_hiperbolica(z_in):
+    """(r, k) com |z| = k·LN2 + r e |r| <= LN2 / 2, em palavras Q16.16 (k = passos do laço)."""
+    magnitude = np.abs(np.asarray(z_in, dtype=np.int64))
+    passos = np.where(magnitude > METADE_LN2_Q16, (magnitude - METADE_LN2_Q16 + LN2_Q16 - 1) // LN2_Q16, 0)
+    return magnitude - passos * LN2_Q16, passos
+
+
+def reducao_razao(x_in, y_in):
+    """(x', y', k) da normalização de u = x + |y| e v = x - |y| para u / (v·4^k) em [1, 4)."""
+    x_in, y_in = np.asarray(x_in, dtype=np.int64), np.abs(np.asarray(y_in, dtype=np.int64))
+    u = x_in + y_in
+    v = np.maximum(x_in - y_in, 1)  # v <= 0 (|y| >= x) está fora do domínio; o laço para em v = 1 LSB
+    passos = np.maximum((_bits(u) - _bits(v)) // 2, 0)
+    passos -= (v << (2 * passos)) > u
+    w = v << (2 * passos)
+    return (u + w) >> 1, (u - w) >> 1, passos
+
+
+def reducao_mod(x_in, y_in):
+    """Divisões por 2 de x e y até max(|x|, |y|) <= LIMITE_MOD_ENTRADA."""
+    magnitude = np.maximum(np.abs(np.asarray(x_in, dtype=np.int64)), np.abs(np.asarray(y_in, dtype=np.int64)))
+    passos = np.zeros(magnitude.shape, dtype=np.int64)
+    while (acima := (magnitude >> passos) > LIMITE_MOD_ENTRADA).any():
+        passos += acima
+    return passos
+
+
+def calcular_estendido(op_name, x_in, y_in, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Resultado Q16.16 da operação estendida (pré-processamento + núcleo + pós-processamento) e as bordas
+    extras de cada caso. Retorna (resultado, bordas_pre, bordas_pos, palavras de entrada do núcleo).
+    """
+    x_in, y_in, z_in = (np.asarray(v, dtype=np.int64) for v in np.broadcast_arrays(x_in, y_in, z_in))
+    zeros = np.zeros_like(x_in)
+    if op_name in ("SINH", "COSH"):
+        r, passos = reducao_hiperbolica(z_in)
+        cosh_r, sinh_r, _ = cordic(zeros, zeros, r, ROTATION, HYPERBOLIC, iteracoes, nucleo)
+        exp_mais, exp_menos = cosh_r + sinh_r, cosh_r - sinh_r
+        if op_name == "SINH":
+            resultado = ((exp_mais << passos) - (exp_menos >> passos)) >> 1
+            resultado = np.where(z_in < 0, -resultado, resultado)
+        else:
+            resultado = ((exp_mais << passos) + (exp_menos >> passos)) >> 1
+        return _saturar(resultado), 2 * passos + 1, np.ones_like(passos), (zeros, zeros, r)
+    if op_name in ("ATANH", "MODH"):
+        x_nucleo, y_nucleo, passos = reducao_razao(x_in, y_in)
+        modulo, _, angulo = cordic(x_nucleo, y_nucleo, zeros, VECTORING, HYPERBOLIC, iteracoes, nucleo)
+        if op_name == "ATANH":
+            resultado = angulo + passos * LN2_Q16
+            resultado = np.where(y_in < 0, -resultado, resultado)
+        else:
+            resultado = modulo >> passos
+        return _saturar(resultado), 2 * passos + 2, np.ones_like(passos), (x_nucleo, y_nucleo, zeros)
+    if op_name == "MOD":
+        passos = reducao_mod(x_in, y_in)
+        modulo, _, _ = cordic(x_in >> passos, y_in >> passos, zeros, VECTORING, CIRCULAR, iteracoes, nucleo)
+        return _saturar(modulo << passos), 2 * passos + 1, np.ones_like(passos), (x_in >> passos, y_in >> passos, zeros)
+    raise ValueError(f"Operação sem faixa estendida: {op_name}")
+
+
+@functools.lru_cache(maxsize=None)
+def erro_exponencial_nucleo(iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Maior erro absoluto do núcleo em e^r = cosh r + sinh r e e^-r = cosh r - sinh r, para todo |r| <= LN2 / 2."""
+    r = np.arange(-METADE_LN2_Q16, METADE_LN2_Q16 + 1, dtype=np.int64)
+    zeros = np.zeros_like(r)
+    cosh_r, sinh_r, _ = cordic(zeros, zeros, r, ROTATION, HYPERBOLIC, iteracoes, nucleo)
+    r_real = q16_16_to_real(r)
+    return float(max(np.abs(q16_16_to_real(cosh_r + sinh_r) - np.exp(r_real)).max(),
+                     np.abs(q16_16_to_real(cosh_r - sinh_r) - np.exp(-r_real)).max()))
+
+
+def tolerancias_caso(op_name, z_in, tolerancia=TOLERANCIA_PADRAO, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Erro absoluto aceito em cada caso: a tolerância, mais o erro do núcleo em e^±r amplificado pela
+    recomposição, erro_exponencial_nucleo·(2^k - 1), nas operações da recomposição exponencial.
+    """
+    z_in = np.asarray(z_in, dtype=np.int64)
+    if op_name not in OPERACOES_TOLERANCIA_ESCALADA:
+        return np.full(z_in.shape, tolerancia)
+    amplificacao = np.ldexp(1.0, reducao_hiperbolica(z_in)[1]) - 1.0
+    return tolerancia + erro_exponencial_nucleo(iteracoes, nucleo) * amplificacao
+
+
+def entradas_estendidas(op_name, casos, rng, pontos=PONTOS_ESTENDIDOS):
+    """Palavras Q16.16 (x_in, y_in, z_in) sorteadas uniformemente no domínio estendido da operação."""
+    dominio = DOMINIOS_ESTENDIDOS[op_name]
+    indices = rng.integers(0, tamanho_dominio(op_name, pontos, pontos, dominio=dominio), casos)
+    return entradas_indices(op_name, indices, pontos, pontos, dominio=dominio)
+
+
+def _erros(resultado, referencia, tolerancia):
+    erro = np.abs(q16_16_to_real(resultado) - referencia)
+    relativo = erro / np.maximum(np.abs(referencia), 1.0)
+    return {
+        "erro_max": float(erro.max()),
+        "erro_rms": float(np.sqrt(np.mean(erro * erro))),
+        "erro_relativo_max": float(relativo.max()),
+        "dentro_tolerancia": float(np.mean(erro <= tolerancia)),
+    }
+
+
+def avaliar_operacao(op_name, x_in, y_in, z_in, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO,
+                     tolerancia=TOLERANCIA_PADRAO):
+    """Precisão do núcleo sem e com redução de argumento sobre as mesmas entradas, e os ciclos extras."""
+    referencia = resultado_exato(op_name, q16_16_to_real(x_in), q16_16_to_real(y_in), q16_16_to_real(z_in))
+    valido = np.isfinite(referencia) & (np.abs(referencia) < 32768.0)
+    x_in, y_in, z_in, referencia = x_in[valido], y_in[valido], z_in[valido], referencia[valido]
+    if not len(referencia):
+        return {"casos": 0}
+    tolerancia = tolerancias_caso(op_name, z_in, tolerancia, iteracoes, nucleo)
+    nativo = top_level_calc_cordic(op_name, x_in, y_in, z_in, iteracoes, nucleo)
+    estendido, bordas_pre, bordas_pos, (_, _, z_nucleo) = calcular_estendido(op_name, x_in, y_in, z_in, iteracoes,
+                                                                             nucleo)
+    extras = bordas_pre + bordas_pos
+    latencia_nucleo = latencia(op_name, z_nucleo, iteracoes, nucleo)
+    return {
+        "casos": len(referencia),
+        "tolerancia_max": float(tolerancia.max()),
+        "nativo": _erros(nativo, referencia, tolerancia),
+        "estendido": _erros(estendido, referencia, tolerancia),
+        "ciclos_extra_medio": float(extras.mean()),
+        "ciclos_extra_max": int(extras.max()),
+        "latencia_nucleo_media": float(latencia_nucleo.mean()),
+        "latencia_total_media": float((latencia_nucleo + extras).mean()),
+    }
+
+
+def gravar_vetores(pasta, op_name, x_in, y_in, z_in, tolerancia=TOLERANCIA_PADRAO, iteracoes=ITERACOES_PADRAO,
+                   nucleo=NUCLEO_PADRAO):
+    """
+    Grava os casos com a referência exata das entradas quantizadas: test_vectors_<op>_estendido.hex, com a
+    tolerância de cada caso (tolerancias_caso), e, se a tolerância for fixa, test_cases_<op>_estendido.txt no
+    layout da operação. Retorna [(caminho, casos)].
+    """
+    x_val, y_val, z_val = q16_16_to_real(x_in), q16_16_to_real(y_in), q16_16_to_real(z_in)
+    referencia = resultado_exato(op_name, x_val, y_val, z_val)
+    valido = np.isfinite(referencia) & (np.abs(referencia) < 32768.0)
+    casos = {"x": x_val[valido], "y": y_val[valido], "z": z_val[valido], "ref": referencia[valido]}
+    os.makedirs(pasta, exist_ok=True)
+    campos = quantizar_casos(op_name, casos["x"], casos["y"], casos["z"], casos["ref"])
+    campos["tolerancia"] = np.rint(tolerancias_caso(op_name, campos["z"], tolerancia, iteracoes, nucleo)
+                                   * 65536.0).astype(np.int64)
+    caminhos = [os.path.join(pasta, f"test_vectors_{op_name.lower()}_estendido.hex")]
+    with open(caminhos[0], "wb") as f:
+        f.write(codificar_vetores(campos))
+    if op_name not in OPERACOES_TOLERANCIA_ESCALADA:
+        caminhos.append(os.path.join(pasta, f"test_cases_{op_name.lower()}_estendido.txt"))
+        with open(caminhos[1], "wb") as f:
+            f.write(gerador.formatar_casos_vetorizado(op_name, casos))
+    return [(caminho, len(casos["ref"])) for caminho in caminhos]
+
+
+# --- Precisão e custo das operações estendidas ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avalia SINH, COSH, ATANH, MOD e MODH com redução de argumento.")
+    parser.add_argument("operacoes", nargs="*", default=list(DOMINIOS_ESTENDIDOS), help="operações (padrão: todas)")
+    parser.add_argument("--casos", type=int, default=CASOS_ESTENDIDOS, help="casos sorteados por operação")
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO)
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="erro absoluto aceito (no SINH / COSH, acrescido do erro do núcleo em e^±r vezes 2^k - 1)")
+    parser.add_argument("--vetores", help="pasta onde gravar os casos sorteados (test_vectors_<op>_estendido.hex e, "
+                                          "com tolerância fixa, test_cases_<op>_estendido.txt)")
+    parser.add_argument("--json", help="grava o relatório neste arquivo JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    relatorios = {}
+    print(f"Faixa estendida: núcleo '{args.nucleo}', ITERATIONS = {args.iteracoes}, tolerância {args.tolerancia} "
+          f"(+ {erro_exponencial_nucleo(args.iteracoes, args.nucleo):.2e}·(2^k - 1) no SINH / COSH)\n")
+    print(f"{'operação':<8}{'casos':>9}{'':>4}{'erro máx':>12}{'erro RMS':>12}{'rel. máx':>11}{'na tol.':>9}"
+          f"{'ciclos extra':>14}{'lat. total':>12}")
+    for op_name in (op.upper() for op in args.operacoes):
+        x_in, y_in, z_in = entradas_estendidas(op_name, args.casos, rng)
+        relatorio = avaliar_operacao(op_name, x_in, y_in, z_in, args.iteracoes, args.nucleo, args.tolerancia)
+        relatorios[op_name] = relatorio
+        if not relatorio["casos"]:
+            print(f"{op_name:<8}{0:>9}")
+            continue
+        for versao in ("nativo", "estendido"):
+            erros = relatorio[versao]
+            custo = (f"{relatorio['ciclos_extra_medio']:>8.2f} ({relatorio['ciclos_extra_max']:>2})"
+                     f"{relatorio['latencia_total_media']:>12.2f}" if versao == "estendido"
+                     else f"{'':>14}{relatorio['latencia_nucleo_media']:>12.2f}")
+            print(f"{op_name if versao == 'nativo' else '':<8}{relatorio['casos'] if versao == 'nativo' else '':>9}"
+                  f" {versao[:3]}{erros['erro_max']:>12.4f}{erros['erro_rms']:>12.4f}{erros['erro_relativo_max']:>11.2e}"
+                  f"{erros['dentro_tolerancia']:>9.2%}{custo}")
+        if args.vetores:
+            arquivos = gravar_vetores(args.vetores, op_name, x_in, y_in, z_in, args.tolerancia, args.iteracoes,
+                                      args.nucleo)
+            relatorio["vetores"] = [caminho for caminho, _ in arquivos]
+            for caminho, quantidade in arquivos:
+                print(f"{'':<8}{quantidade} casos salvos em '{caminho}'")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(relatorios, f, indent=2)
+            f.write("\n")
+        print(f"\nRelatório salvo em '{args.json}'")
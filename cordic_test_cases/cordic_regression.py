@@ -0,0 +1,431 @@
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from generate_cordic_test_cases import ARQUIVO_MANIFESTO, carregar_manifesto
+from cordic_model import CODIGOS_OPERACAO, ITERACOES_PADRAO, NUCLEO_PADRAO, NUCLEOS, OPERACOES, top_level_calc_cordic
+from cordic_vector_format import (
+    ARQUIVO_VETORES, TOLERANCIA_PADRAO, abrir_vetores, converter_tabelas, decodificar_vetores
+)
+
+# Regressão em paralelo: os vetores de teste (arquivo hex do TB_top_level_calc_cordic_hex.v) são divididos
+# em fragmentos, e cada fragmento roda em uma pasta de trabalho própria, com seu próprio
+# log_erros_testes.txt. Os logs são lidos ao final e as contagens de acertos/erros e as estatísticas de
+# erro são somadas por operação.
+#
+# A simulação de cada fragmento passa por um backend:
+#   iverilog  - compila o testbench hex com iverilog uma vez e roda cada fragmento com vvp
+#   verilator - compila com verilator --binary uma vez e roda o executável em cada fragmento
+#   modelo    - substituto sem simulador: calcula o resultado com o modelo bit a bit (cordic_model.py)
+#               e grava o log no mesmo formato do testbench
+# O backend "auto" usa o primeiro simulador instalado e falha se não houver nenhum: o modelo só roda
+# quando pedido explicitamente, para que uma regressão sem simulador nunca passe por uma com o RTL.
+#
+# Quando a pasta das tabelas tem o manifest.json do gerador, o hash da configuração de cada operação
+# aprovada (sem erros, com todos os vetores aplicados) é guardado na pasta de trabalho, junto com o
+# backend, o núcleo, ITERATIONS, a referência e a tolerância da execução; com --apenas-alteradas, só
+# as operações sem aprovação para a configuração e os parâmetros atuais entram na regressão.
+# Execuções com o backend modelo nunca registram aprovações.
+
+PASTA_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TESTBENCH_HEX = os.path.join(PASTA_RAIZ, "TB_top_level_calc_cordic_hex.v")
+MODULO_TESTBENCH = "tb_top_level_calc_cordic_hex"
+
+# Log gravado pelos testbenches na pasta de execução
+ARQUIVO_LOG = "log_erros_testes.txt"
+
+# Saída do simulador (stdout + stderr) de cada fragmento
+ARQUIVO_SAIDA = "saida_simulacao.txt"
+
+PASTA_TRABALHO = "regressao"
+
+# Hash da configuração (manifest.json do gerador) e parâmetros da execução de cada operação aprovada
+ARQUIVO_APROVADAS = "configuracoes_aprovadas.json"
+
+# Nome das operações no log (tarefa nome_operacao dos testbenches) -> nome usado nas ferramentas
+NOMES_LOG = {"SENO": "SIN", "COSSENO": "COS", "ATAN": "ATAN", "MOD": "MOD", "MULT": "MULT", "DIV": "DIV",
+             "SINH": "SINH", "COSH": "COSH", "ATANH": "ATANH", "MODH": "MODH"}
+_NOMES_OPERACAO = {op_name: nome for nome, op_name in NOMES_LOG.items()}
+
+# Linha de resultado do log: situação, operação, entradas, esperado, obtido e erro
+LINHA_LOG = re.compile(r"(ACERTO|ERRO) em\s*(\w+)\((.*)\): Esperado=(\S+), Obtido=(\S+) \(Erro=(\S+)\)")
+
+
+def fontes_rtl():
+    """Arquivos Verilog do projeto (sem os testbenches)."""
+    return sorted(caminho for caminho in glob.glob(os.path.join(PASTA_RAIZ, "*.v"))
+                  if not os.path.basename(caminho).startswith("TB_"))
+
+
+# --- Leitura dos logs ---
+def _estatisticas_vazias():
+    return {"casos": 0, "acertos": 0, "erros": 0, "soma": 0.0, "soma_quadrados": 0.0, "max": -1.0, "pior": None}
+
+
+def ler_log(caminho):
+    """Lê um log_erros_testes.txt e acumula as estatísticas por operação."""
+    estatisticas = {}
+    with open(caminho, encoding="utf-8", errors="replace") as f:
+        for linha in f:
+            encontrado = LINHA_LOG.match(linha.strip())
+            if not encontrado:
+                continue
+            situacao, nome, _, _, _, erro = encontrado.groups()
+            erro = float(erro)
+            op_estatisticas = estatisticas.setdefault(NOMES_LOG.get(nome, nome), _estatisticas_vazias())
+            op_estatisticas["casos"] += 1
+            op_estatisticas["acertos" if situacao == "ACERTO" else "erros"] += 1
+            op_estatisticas["soma"] += erro
+            op_estatisticas["soma_quadrados"] += erro * erro
+            if erro > op_estatisticas["max"]:
+                op_estatisticas["max"], op_estatisticas["pior"] = erro, linha.strip()
+    return estatisticas
+
+
+def combinar_estatisticas(a, b):
+    """Junta as estatísticas por operação de dois logs."""
+    combinadas = dict(a)
+    for op_name, est_b in b.items():
+        est_a = combinadas.get(op_name, _estatisticas_vazias())
+        pior = est_a if est_a["max"] >= est_b["max"] else est_b
+        combinadas[op_name] = {
+            "casos": est_a["casos"] + est_b["casos"],
+            "acertos": est_a["acertos"] + est_b["acertos"],
+            "erros": est_a["erros"] + est_b["erros"],
+            "soma": est_a["soma"] + est_b["soma"],
+            "soma_quadrados": est_a["soma_quadrados"] + est_b["soma_quadrados"],
+            "max": pior["max"],
+            "pior": pior["pior"],
+        }
+    return combinadas
+
+
+def relatorio(estatisticas):
+    """Acertos, erros e erro máximo / médio / RMS por operação, na ordem de OPERACOES."""
+    linhas = []
+    for op_name in sorted(estatisticas, key=lambda nome: list(OPERACOES).index(nome) if nome in OPERACOES else 99):
+        est = estatisticas[op_name]
+        casos = est["casos"]
+        linhas.append({
+            "operacao": op_name,
+            "casos": casos,
+            "acertos": est["acertos"],
+            "erros": est["erros"],
+            "erro_max": est["max"] if casos else None,
+            "erro_medio": est["soma"] / casos if casos else None,
+            "erro_rms": math.sqrt(est["soma_quadrados"] / casos) if casos else None,
+            "pior": est["pior"],
+        })
+    return linhas
+
+
+# --- Operações alteradas desde a última regressão ---
+def _carregar_aprovadas(pasta_trabalho):
+    caminho = os.path.join(pasta_trabalho, ARQUIVO_APROVADAS)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho) as f:
+        return json.load(f)
+
+
+def execucao_regressao(backend, nucleo, iteracoes, referencia, tolerancia):
+    """Parâmetros da regressão que, junto com o hash de configuração, identificam uma aprovação."""
+    return {"backend": backend, "nucleo": nucleo, "iteracoes": iteracoes, "referencia": referencia,
+            "tolerancia": tolerancia}
+
+
+def operacoes_alteradas(pasta_tabelas, pasta_trabalho, execucao, operacoes=None):
+    """
+    Operações sem aprovação para o hash de configuração atual (manifest.json do gerador) e os mesmos
+    parâmetros de 'execucao' (backend, núcleo, ITERATIONS, referência e tolerância); todas, se a
+    pasta não tiver manifesto.
+    """
+    operacoes = list(operacoes or OPERACOES)
+    if not os.path.exists(os.path.join(pasta_tabelas, ARQUIVO_MANIFESTO)):
+        return operacoes
+    registradas = carregar_manifesto(pasta_tabelas)["operacoes"]
+    aprovadas = _carregar_aprovadas(pasta_trabalho)
+    return [op_name for op_name in operacoes
+            if op_name not in registradas or "hash_configuracao" not in registradas[op_name]
+            or aprovadas.get(op_name) != dict(execucao, hash_configuracao=registradas[op_name]["hash_configuracao"])]
+
+
+def registrar_aprovadas(pasta_tabelas, pasta_trabalho, operacoes, execucao):
+    """
+    Guarda o hash de configuração atual e os parâmetros da execução das operações aprovadas.
+    Aprovações do backend modelo não são guardadas: ele não simula o RTL.
+    """
+    if execucao["backend"] == "modelo" or not os.path.exists(os.path.join(pasta_tabelas, ARQUIVO_MANIFESTO)):
+        return
+    registradas = carregar_manifesto(pasta_tabelas)["operacoes"]
+    aprovadas = _carregar_aprovadas(pasta_trabalho)
+    for op_name in operacoes:
+        if op_name in registradas and "hash_configuracao" in registradas[op_name]:
+            aprovadas[op_name] = dict(execucao, hash_configuracao=registradas[op_name]["hash_configuracao"])
+    with open(os.path.join(pasta_trabalho, ARQUIVO_APROVADAS), "w") as f:
+        json.dump(aprovadas, f, indent=2)
+        f.write("\n")
+
+
+# --- Fragmentos ---
+def preparar_fragmentos(arquivo_vetores, pasta_trabalho, num_fragmentos):
+    """
+    Divide o arquivo de vetores em até num_fragmentos partes contíguas, cada uma gravada como
+    fragmento_NNNN/test_vectors.hex. Pastas de fragmentos de uma execução anterior com mais fragmentos
+    são apagadas, para que seus logs não sejam confundidos com os desta.
+    Retorna a lista de (pasta do fragmento, quantidade de vetores).
+    """
+    registros = abrir_vetores(arquivo_vetores)
+    num_fragmentos = max(1, min(num_fragmentos, len(registros)))
+    for pasta in glob.glob(os.path.join(pasta_trabalho, "fragmento_[0-9][0-9][0-9][0-9]")):
+        if int(pasta[-4:]) >= num_fragmentos:
+            shutil.rmtree(pasta)
+    limites = np.linspace(0, len(registros), num_fragmentos + 1).astype(np.int64)
+    fragmentos = []
+    for indice in range(num_fragmentos):
+        pasta = os.path.join(pasta_trabalho, f"fragmento_{indice:04d}")
+        if os.path.isdir(pasta):
+            shutil.rmtree(pasta)
+        os.makedirs(pasta)
+        inicio, fim = limites[indice], limites[indice + 1]
+        with open(os.path.join(pasta, ARQUIVO_VETORES), "wb") as f:
+            f.write(np.asarray(registros[inicio:fim]).tobytes())
+        fragmentos.append((pasta, int(fim - inicio)))
+    return fragmentos
+
+
+# --- Backends ---
+def _preparar_iverilog(pasta_trabalho, iteracoes, max_vetores, nucleo):
+    executavel = os.path.join(pasta_trabalho, "tb_hex.vvp")
+    subprocess.run(["iverilog", "-g2012", "-o", executavel, "-s", MODULO_TESTBENCH,
+                    f"-P{MODULO_TESTBENCH}.ITERATIONS={iteracoes}",
+                    f"-P{MODULO_TESTBENCH}.MAX_VETORES={max_vetores}",
+                    TESTBENCH_HEX, *fontes_rtl()], check=True)
+    # -n: $stop encerra a simulação em vez de abrir o modo interativo
+    return {"comando": ["vvp", "-n", os.path.abspath(executavel), f"+VETORES={ARQUIVO_VETORES}"]}
+
+
+def _preparar_verilator(pasta_trabalho, iteracoes, max_vetores, nucleo):
+    pasta_objetos = os.path.join(pasta_trabalho, "obj_dir")
+    subprocess.run(["verilator", "--binary", "-Wno-fatal", "--top-module", MODULO_TESTBENCH,
+                    f"-GITERATIONS={iteracoes}", f"-GMAX_VETORES={max_vetores}", "--Mdir", pasta_objetos,
+                    TESTBENCH_HEX, *fontes_rtl()], check=True)
+    executavel = os.path.abspath(os.path.join(pasta_objetos, f"V{MODULO_TESTBENCH}"))
+    return {"comando": [executavel, f"+VETORES={ARQUIVO_VETORES}"]}
+
+
+def _preparar_modelo(pasta_trabalho, iteracoes, max_vetores, nucleo):
+    return {"modelo": (iteracoes, nucleo)}
+
+
+BACKENDS = {
+    "iverilog": (("iverilog", "vvp"), _preparar_iverilog),
+    "verilator": (("verilator",), _preparar_verilator),
+    "modelo": ((), _preparar_modelo),
+}
+
+
+def escolher_backend(nome="auto"):
+    """
+    Backend pedido, ou, com "auto", o primeiro simulador instalado. O modelo nunca é escolhido
+    automaticamente: uma regressão sem simulador precisa ser pedida com nome="modelo".
+    """
+    if nome != "auto":
+        return nome
+    for candidato, (programas, _) in BACKENDS.items():
+        if programas and all(shutil.which(programa) for programa in programas):
+            return candidato
+    simuladores = ", ".join(candidato for candidato, (programas, _) in BACKENDS.items() if programas)
+    raise RuntimeError(f"nenhum simulador instalado ({simuladores}); use --backend modelo para rodar só o modelo bit a bit")
+
+
+def _nome_operacao(op_name, x_val, y_val, z_val):
+    """Mesmo texto da tarefa nome_operacao do TB_top_level_calc_cordic_hex.v."""
+    nome = _NOMES_OPERACAO[op_name]
+    if op_name in ("SIN", "COS"):
+        return f"{nome}({z_val * 180.0 / 3.14159265358979:f})"
+    if op_name == "MULT":
+        return f"{nome}({x_val:f} x {z_val:f})"
+    if op_name == "DIV":
+        return f"{nome}({y_val:f} / {x_val:f})"
+    if op_name in ("SINH", "COSH"):
+        return f"{nome}({z_val:f})"
+    if op_name in ("ATANH", "MODH"):
+        return f"{nome}({x_val:f} - {y_val:f})"
+    return f"{nome}({x_val:f} / {y_val:f})"
+
+
+def simular_modelo(pasta, iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """Substituto do simulador: aplica os vetores da pasta ao modelo bit a bit e grava o log do testbench."""
+    caminho = os.path.join(pasta, ARQUIVO_VETORES)
+    campos = decodificar_vetores(abrir_vetores(caminho)) if os.path.getsize(caminho) else None
+    with open(os.path.join(pasta, ARQUIVO_LOG), "w", encoding="utf-8") as log:
+        log.write("--- Log de Testes de Operações ---\n")
+        if campos is None:
+            return
+        resultado = np.zeros(len(campos["operacao"]), dtype=np.int64)
+        for codigo in np.unique(campos["operacao"]):
+            selecao = campos["operacao"] == codigo
+            resultado[selecao] = top_level_calc_cordic(CODIGOS_OPERACAO[int(codigo)], campos["x"][selecao],
+                                                       campos["y"][selecao], campos["z"][selecao], iteracoes, nucleo)
+        erro = np.abs(resultado - campos["esperado"])
+        for i in range(len(resultado)):
+            op_name = CODIGOS_OPERACAO[int(campos["operacao"][i])]
+            nome = _nome_operacao(op_name, campos["x"][i] / 65536.0, campos["y"][i] / 65536.0,
+                                  campos["z"][i] / 65536.0)
+            situacao = "ERRO" if erro[i] > campos["tolerancia"][i] else "ACERTO"
+            log.write(f"{situacao} em {nome}: Esperado={campos['esperado'][i] / 65536.0:f}, "
+                      f"Obtido={resultado[i] / 65536.0:f} (Erro={erro[i] / 65536.0:f})\n")
+
+
+def _executar_fragmento(tarefa):
+    """Tarefa de um processo do pool: roda um fragmento na sua pasta e lê o log gerado."""
+    contexto, pasta, num_vetores = tarefa
+    inicio = time.perf_counter()
+    codigo_saida = 0
+    if "modelo" in contexto:
+        simular_modelo(pasta, *contexto["modelo"])
+    else:
+        with open(os.path.join(pasta, ARQUIVO_SAIDA), "w") as saida:
+            codigo_saida = subprocess.run(contexto["comando"], cwd=pasta, stdout=saida,
+                                          stderr=subprocess.STDOUT).returncode
+    log = os.path.join(pasta, ARQUIVO_LOG)
+    estatisticas = ler_log(log) if os.path.exists(log) else {}
+    aplicados = sum(est["casos"] for est in estatisticas.values())
+    return {
+        "pasta": pasta,
+        "vetores": num_vetores,
+        "aplicados": aplicados,
+        # Simulação interrompida antes do fim (ou sem log): o fragmento conta como falha
+        "completo": aplicados == num_vetores,
+        "codigo_saida": codigo_saida,
+        "tempo": time.perf_counter() - inicio,
+        "estatisticas": estatisticas,
+    }
+
+
+def executar_regressao(arquivo_vetores, pasta_trabalho=PASTA_TRABALHO, backend="auto", jobs=1, num_fragmentos=None,
+                       iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Divide os vetores em fragmentos, roda cada um com o backend escolhido (em paralelo com 'jobs'
+    processos) e junta os resultados. Retorna (backend usado, resultados por fragmento, estatísticas por operação).
+    """
+    backend = escolher_backend(backend)
+    os.makedirs(pasta_trabalho, exist_ok=True)
+    fragmentos = preparar_fragmentos(arquivo_vetores, pasta_trabalho, num_fragmentos or jobs)
+    max_vetores = max(num_vetores for _, num_vetores in fragmentos) + 1  # +1: posição com o sentinela DEFAULT
+    contexto = BACKENDS[backend][1](pasta_trabalho, iteracoes, max_vetores, nucleo)
+
+    tarefas = [(contexto, pasta, num_vetores) for pasta, num_vetores in fragmentos]
+    if jobs > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            resultados = list(executor.map(_executar_fragmento, tarefas))
+    else:
+        resultados = [_executar_fragmento(tarefa) for tarefa in tarefas]
+
+    estatisticas = {}
+    for resultado in resultados:
+        estatisticas = combinar_estatisticas(estatisticas, resultado["estatisticas"])
+    return backend, resultados, estatisticas
+
+
+# --- Regressão em paralelo ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Roda os vetores de teste do CORDIC em fragmentos paralelos.")
+    parser.add_argument("--vetores", help=f"arquivo hex já convertido (padrão: converte as tabelas de --pasta)")
+    parser.add_argument("--pasta", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="pasta com as tabelas test_cases_<op>.txt")
+    parser.add_argument("--operacoes", nargs="+", default=None, help="operações convertidas das tabelas (padrão: todas)")
+    parser.add_argument("--apenas-alteradas", action="store_true",
+                        help="roda só as operações regeradas desde a última regressão aprovada (manifest.json do gerador)")
+    parser.add_argument("--trabalho", default=PASTA_TRABALHO, help="pasta com as pastas de trabalho dos fragmentos")
+    parser.add_argument("--backend", choices=("auto", *BACKENDS), default="auto")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="fragmentos simulados ao mesmo tempo")
+    parser.add_argument("--fragmentos", type=int, default=None, help="quantidade de fragmentos (padrão: --jobs)")
+    parser.add_argument("--referencia", choices=("matematica", "modelo"), default="matematica",
+                        help="resultado esperado na conversão das tabelas (ver cordic_vector_format.py)")
+    parser.add_argument("--tolerancia", type=float, default=None,
+                        help=f"erro máximo aceito (padrão: {TOLERANCIA_PADRAO} com a referência matemática, 0 com o modelo)")
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO,
+                        help="núcleo do backend modelo (os simuladores usam o instanciado no top_level_calc_cordic.v)")
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO, help="parâmetro ITERATIONS")
+    parser.add_argument("--json", help="grava o resultado agregado neste arquivo JSON")
+    args = parser.parse_args()
+    try:
+        backend = escolher_backend(args.backend)
+    except RuntimeError as erro:
+        parser.error(str(erro))
+
+    if args.apenas_alteradas and args.vetores:
+        parser.error("--apenas-alteradas usa as tabelas de --pasta, não um arquivo --vetores")
+
+    os.makedirs(args.trabalho, exist_ok=True)
+    arquivo_vetores = args.vetores
+    contagem = None
+    if arquivo_vetores is None:
+        referencia_modelo = args.referencia == "modelo"
+        tolerancia = args.tolerancia if args.tolerancia is not None else (0.0 if referencia_modelo else TOLERANCIA_PADRAO)
+        arquivo_vetores = os.path.join(args.trabalho, ARQUIVO_VETORES)
+        operacoes = [op.upper() for op in args.operacoes] if args.operacoes else list(OPERACOES)
+        execucao = execucao_regressao(backend, args.nucleo, args.iteracoes, args.referencia, tolerancia)
+        if args.apenas_alteradas:
+            alteradas = operacoes_alteradas(args.pasta, args.trabalho, execucao, operacoes)
+            print(f"Operações alteradas desde a última regressão aprovada: {', '.join(alteradas) or 'nenhuma'}")
+            if not alteradas:
+                raise SystemExit(0)
+            operacoes = alteradas
+        contagem = converter_tabelas(args.pasta, arquivo_vetores, operacoes, referencia_modelo=referencia_modelo,
+                                     tolerancia=tolerancia, iteracoes=args.iteracoes, nucleo=args.nucleo)
+        print(f"{sum(contagem.values())} vetores convertidos de '{args.pasta}'")
+
+    inicio = time.perf_counter()
+    backend, resultados, estatisticas = executar_regressao(arquivo_vetores, args.trabalho, backend, args.jobs,
+                                                           args.fragmentos, args.iteracoes, args.nucleo)
+    tempo_total = time.perf_counter() - inicio
+
+    print(f"Backend: {backend}, {len(resultados)} fragmento(s), {args.jobs} processo(s), {tempo_total:.2f} s\n")
+    for resultado in resultados:
+        situacao = "ok" if resultado["completo"] else f"INCOMPLETO (código de saída {resultado['codigo_saida']})"
+        print(f"- {resultado['pasta']}: {resultado['aplicados']}/{resultado['vetores']} vetores, "
+              f"{resultado['tempo']:.2f} s, {situacao}")
+
+    linhas = relatorio(estatisticas)
+    print(f"\n{'operação':<10}{'casos':>9}{'acertos':>9}{'erros':>8}{'erro máx':>12}{'erro médio':>12}{'erro RMS':>12}")
+    for linha in linhas:
+        print(f"{linha['operacao']:<10}{linha['casos']:>9}{linha['acertos']:>9}{linha['erros']:>8}"
+              f"{linha['erro_max']:>12.6f}{linha['erro_medio']:>12.6f}{linha['erro_rms']:>12.6f}")
+    for linha in linhas:
+        if linha["erros"]:
+            print(f"\nPior caso de {linha['operacao']}: {linha['pior']}")
+
+    total_erros = sum(linha["erros"] for linha in linhas)
+    incompletos = sum(not resultado["completo"] for resultado in resultados)
+    print(f"\nTotal: {sum(linha['casos'] for linha in linhas)} casos, {total_erros} erros, "
+          f"{incompletos} fragmento(s) incompleto(s)")
+
+    if contagem is not None:
+        aprovadas = [linha["operacao"] for linha in linhas
+                     if not linha["erros"] and linha["casos"] == contagem.get(linha["operacao"])]
+        if backend == "modelo":
+            print("\nBackend modelo: as operações aprovadas não são registradas para --apenas-alteradas")
+        registrar_aprovadas(args.pasta, args.trabalho, aprovadas if not incompletos else [], execucao)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": backend, "tempo": tempo_total, "fragmentos": [
+                {chave: valor for chave, valor in resultado.items() if chave != "estatisticas"}
+                for resultado in resultados], "operacoes": linhas}, f, indent=2)
+            f.write("\n")
+        print(f"Resultado salvo em '{args.json}'")
+
+    raise SystemExit(1 if total_erros or incompletos else 0)
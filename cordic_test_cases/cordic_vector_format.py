@@ -0,0 +1,206 @@
+import argparse
+import glob
+import itertools
+import os
+
+import numpy as np
+
+from cordic_model import (
+    ITERACOES_PADRAO, NUCLEO_PADRAO, NUCLEOS, OPERACOES, real_to_q16_16, top_level_calc_cordic
+)
+
+# Formato pré-quantizado dos vetores de teste, lido com $readmemh pelo TB_top_level_calc_cordic_hex.v.
+#
+# Cada vetor é uma linha de largura fixa com 41 dígitos hexadecimais (164 bits) + '\n':
+#
+#   [163:160] operation   [159:128] x_in   [127:96] y_in   [95:64] z_in
+#   [ 63: 32] esperado    [ 31:  0] tolerância
+#
+# x_in/y_in/z_in são as palavras Q16.16 que o testbench texto obteria com real_to_q16_16 ($rtoi),
+# 'esperado' é o resultado em Q16.16 e 'tolerância' o erro máximo aceito, em LSBs Q16.16.
+# Como todas as linhas têm o mesmo tamanho, o arquivo também pode ser aberto do Python com
+# np.memmap e decodificado só na faixa de vetores desejada.
+
+# Campos do vetor, do mais significativo para o menos significativo: (nome, dígitos hexadecimais)
+CAMPOS = (("operacao", 1), ("x", 8), ("y", 8), ("z", 8), ("esperado", 8), ("tolerancia", 8))
+DIGITOS_VETOR = sum(digitos for _, digitos in CAMPOS)
+BYTES_VETOR = DIGITOS_VETOR + 1  # inclui o '\n'
+
+# Mesmo limite de erro do TB_top_level_calc_cordicV3.v (ERROR_THRESHOLD)
+TOLERANCIA_PADRAO = 0.1
+
+# Linhas de texto convertidas por vez
+LINHAS_POR_BLOCO = 1 << 18
+
+# Arquivo único lido pelo testbench hex (todas as operações, na ordem de OPERACOES)
+ARQUIVO_VETORES = "test_vectors.hex"
+
+_DIGITOS_HEX = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+# Valor de cada caractere hexadecimal (maiúsculo ou minúsculo); 255 para os demais
+_VALOR_HEX = np.full(256, 255, dtype=np.uint8)
+_VALOR_HEX[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10)
+_VALOR_HEX[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+_VALOR_HEX[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+
+
+# --- Leitura das tabelas de texto (test_cases_<op>.txt) ---
+def arquivos_tabela(pasta, op_name):
+    """
+    Arquivos de texto de uma operação: test_cases_<op>.txt, ou, se ele não existir, os
+    fragmentos test_cases_<op>_NNNN.txt em ordem.
+    """
+    arquivo = os.path.join(pasta, f"test_cases_{op_name.lower()}.txt")
+    if os.path.exists(arquivo):
+        return [arquivo]
+    return sorted(glob.glob(os.path.join(pasta, f"test_cases_{op_name.lower()}_[0-9][0-9][0-9][0-9].txt")))
+
+
+def _colunas_tabela(op_name, dados):
+    """Separa (x, y, z, referência) das colunas de uma tabela, conforme o layout de cada operação."""
+    if op_name in ("SIN", "COS"):
+        dados = dados[:, 1:]  # a primeira coluna é o ângulo em graus
+    x_val, y_val, z_val, referencia = dados.T
+    if op_name == "DIV":
+        x_val, y_val = y_val, x_val  # arquivo de divisão guarda dividendo (y) antes do divisor (x)
+    return x_val, y_val, z_val, referencia
+
+
+def ler_tabela(caminho, op_name, linhas_por_bloco=LINHAS_POR_BLOCO, graus=False):
+    """
+    Lê uma tabela de teste em blocos, produzindo (x, y, z, referência) como vetores de reais.
+    Com graus=True, cada bloco traz também a coluna de ângulos em graus (SIN / COS; None nas demais).
+    """
+    with open(caminho) as f:
+        while True:
+            linhas = list(itertools.islice(f, linhas_por_bloco))
+            if not linhas:
+                return
+            dados = np.loadtxt(linhas, delimiter=",", ndmin=2)
+            if graus:
+                yield _colunas_tabela(op_name, dados) + (dados[:, 0] if op_name in ("SIN", "COS") else None,)
+            else:
+                yield _colunas_tabela(op_name, dados)
+
+
+# --- Codificação / decodificação ---
+def quantizar_casos(op_name, x_val, y_val, z_val, referencia, referencia_modelo=False, tolerancia=TOLERANCIA_PADRAO,
+                    iteracoes=ITERACOES_PADRAO, nucleo=NUCLEO_PADRAO):
+    """
+    Converte casos em reais para os campos do vetor pré-quantizado.
+    Com referencia_modelo=True, 'esperado' é a palavra exata do modelo bit a bit (cordic_model.py)
+    em vez da referência matemática arredondada para Q16.16.
+    """
+    x_in, y_in, z_in = real_to_q16_16(x_val), real_to_q16_16(y_val), real_to_q16_16(z_val)
+    if referencia_modelo:
+        esperado = top_level_calc_cordic(op_name, x_in, y_in, z_in, iteracoes, nucleo)
+    else:
+        esperado = np.rint(np.asarray(referencia, dtype=np.float64) * 65536.0).astype(np.int64)
+    return {
+        "operacao": np.full(len(x_in), OPERACOES[op_name][0], dtype=np.int64),
+        "x": x_in, "y": y_in, "z": z_in, "esperado": esperado,
+        "tolerancia": np.full(len(x_in), int(round(tolerancia * 65536.0)), dtype=np.int64),
+    }
+
+
+def codificar_vetores(campos):
+    """Formata os campos (vetores de inteiros) como linhas hexadecimais de largura fixa e retorna os bytes."""
+    num_vetores = len(campos["operacao"])
+    matriz = np.empty((num_vetores, BYTES_VETOR), dtype=np.uint8)
+    posicao = 0
+    for nome, digitos in CAMPOS:
+        palavra = np.asarray(campos[nome], dtype=np.int64) & ((1 << (4 * digitos)) - 1)
+        for k in range(digitos):
+            matriz[:, posicao + digitos - 1 - k] = _DIGITOS_HEX[(palavra >> (4 * k)) & 0xF]
+        posicao += digitos
+    matriz[:, posicao] = ord("\n")
+    return matriz.tobytes()
+
+
+def _com_sinal(palavra):
+    """Interpreta palavras de 32 bits como inteiros com sinal."""
+    return palavra - ((palavra >> 31) << 32)
+
+
+def decodificar_vetores(registros):
+    """Decodifica uma matriz (n, BYTES_VETOR) de bytes do arquivo hex em um dicionário de vetores int64."""
+    valores = _VALOR_HEX[np.asarray(registros)[:, :DIGITOS_VETOR]].astype(np.int64)
+    if (valores == 255).any():
+        raise ValueError("Arquivo de vetores com caractere não hexadecimal")
+    campos = {}
+    posicao = 0
+    for nome, digitos in CAMPOS:
+        palavra = np.zeros(len(valores), dtype=np.int64)
+        for k in range(digitos):
+            palavra = (palavra << 4) | valores[:, posicao + k]
+        campos[nome] = palavra if nome in ("operacao", "tolerancia") else _com_sinal(palavra)
+        posicao += digitos
+    return campos
+
+
+def abrir_vetores(caminho):
+    """Abre um arquivo de vetores como np.memmap (n, BYTES_VETOR), sem ler o conteúdo."""
+    tamanho = os.path.getsize(caminho)
+    if tamanho % BYTES_VETOR:
+        raise ValueError(f"'{caminho}' não tem linhas de {BYTES_VETOR} bytes (arquivo com CRLF ou corrompido?)")
+    if tamanho == 0:
+        return np.empty((0, BYTES_VETOR), dtype=np.uint8)
+    return np.memmap(caminho, dtype=np.uint8, mode="r", shape=(tamanho // BYTES_VETOR, BYTES_VETOR))
+
+
+def carregar_vetores(caminho, inicio=0, quantidade=None):
+    """Decodifica os vetores [inicio, inicio+quantidade) de um arquivo hex via memmap."""
+    registros = abrir_vetores(caminho)
+    fim = len(registros) if quantidade is None else inicio + quantidade
+    return decodificar_vetores(registros[inicio:fim])
+
+
+def converter_tabelas(pasta, arquivo_saida, operacoes=None, **opcoes):
+    """
+    Converte as tabelas de texto da pasta (test_cases_<op>.txt ou seus fragmentos) para um arquivo
+    de vetores hex. Retorna a quantidade de vetores por operação.
+    """
+    contagem = {}
+    with open(arquivo_saida, "wb") as f:
+        for op_name in operacoes or OPERACOES:
+            contagem[op_name] = 0
+            for caminho in arquivos_tabela(pasta, op_name):
+                for x_val, y_val, z_val, referencia in ler_tabela(caminho, op_name):
+                    f.write(codificar_vetores(quantizar_casos(op_name, x_val, y_val, z_val, referencia, **opcoes)))
+                    contagem[op_name] += len(x_val)
+    return contagem
+
+
+# --- Conversão das tabelas de teste ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Converte test_cases_<op>.txt em vetores Q16.16 hexadecimais para $readmemh.")
+    parser.add_argument("--pasta", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="pasta com as tabelas de texto")
+    parser.add_argument("--saida", default=None, help=f"arquivo de saída, ou pasta com --por-operacao (padrão: <pasta>/{ARQUIVO_VETORES})")
+    parser.add_argument("--por-operacao", action="store_true",
+                        help="grava um test_vectors_<op>.hex por operação em vez de um arquivo único")
+    parser.add_argument("--referencia", choices=("matematica", "modelo"), default="matematica",
+                        help="resultado esperado: referência das tabelas ou palavra exata do modelo bit a bit")
+    parser.add_argument("--tolerancia", type=float, default=None,
+                        help=f"erro máximo aceito (padrão: {TOLERANCIA_PADRAO} com a referência matemática, 0 com o modelo)")
+    parser.add_argument("--nucleo", choices=sorted(NUCLEOS), default=NUCLEO_PADRAO)
+    parser.add_argument("--iteracoes", type=int, default=ITERACOES_PADRAO)
+    args = parser.parse_args()
+
+    referencia_modelo = args.referencia == "modelo"
+    tolerancia = args.tolerancia if args.tolerancia is not None else (0.0 if referencia_modelo else TOLERANCIA_PADRAO)
+    opcoes = dict(referencia_modelo=referencia_modelo, tolerancia=tolerancia,
+                  iteracoes=args.iteracoes, nucleo=args.nucleo)
+
+    if args.por_operacao:
+        for op_name in OPERACOES:
+            arquivo = os.path.join(args.saida or args.pasta, f"test_vectors_{op_name.lower()}.hex")
+            contagem = converter_tabelas(args.pasta, arquivo, [op_name], **opcoes)
+            print(f"- {op_name}: {contagem[op_name]} vetores salvos em '{arquivo}'")
+    else:
+        arquivo = args.saida or os.path.join(args.pasta, ARQUIVO_VETORES)
+        contagem = converter_tabelas(args.pasta, arquivo, **opcoes)
+        for op_name, quantidade in contagem.items():
+            print(f"- {op_name}: {quantidade} vetores")
+        print(f"\nTotal de {sum(contagem.values())} vetores salvos em '{arquivo}'")
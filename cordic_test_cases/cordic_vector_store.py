@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+import generate_cordic_test_cases as gerador
+from cordic_model import OPERACOES, real_to_q16_16
+from cordic_vector_format import arquivos_tabela, ler_tabela
+
+# Armazenamento colunar dos vetores de teste, aberto com memmap.
+#
+# Um store é uma pasta com um arquivo .npy por coluna e um indice.json. Os casos ficam ordenados por
+# operação (na ordem de OPERACOES), e o índice guarda a faixa [início, fim) de cada uma, então as colunas
+# de uma operação, ou de uma fatia dela, são views dos memmaps, sem cópia nem conversão de texto:
+#
+#   operacao            uint8    código de 4 bits da operação (cordic_model.OPERACOES)
+#   x, y, z             float64  entradas em reais, já no layout comum (o dividendo da DIV é y)
+#   x_q16, y_q16, z_q16 int32    palavras Q16.16 das entradas (real_to_q16_16, como o $rtoi do testbench)
+#   esperado            float64  resultado de referência
+#   grau                float64  ângulo em graus das tabelas de SIN / COS (NaN nas demais operações)
+#   medido              float64  resultado medido (opcional; NaN nos casos ainda não medidos)
+#
+# As tabelas test_cases_<op>.txt são importadas em blocos, direto para os memmaps, e podem ser exportadas
+# de volta no mesmo layout de texto do gerador.
+
+ARQUIVO_INDICE = "indice.json"
+VERSAO_STORE = 1
+
+# Colunas sempre presentes e o tipo de cada uma
+COLUNAS = {
+    "operacao": np.uint8,
+    "x": np.float64, "y": np.float64, "z": np.float64,
+    "x_q16": np.int32, "y_q16": np.int32, "z_q16": np.int32,
+    "esperado": np.float64,
+    "grau": np.float64,
+}
+COLUNA_MEDIDO = "medido"
+
+
+def _caminho_coluna(pasta, coluna):
+    return os.path.join(pasta, f"{coluna}.npy")
+
+
+def _contar_linhas(caminho):
+    """Linhas não vazias de uma tabela de texto, sem interpretar os números."""
+    with open(caminho, "rb") as f:
+        return sum(1 for linha in f if linha.strip())
+
+
+def _gravar_indice(pasta, indice):
+    with open(os.path.join(pasta, ARQUIVO_INDICE), "w") as f:
+        json.dump(indice, f, indent=2)
+        f.write("\n")
+
+
+def criar_store(pasta, blocos_por_operacao, casos_por_operacao):
+    """
+    Cria o store a partir de {op: iterável de blocos (x, y, z, esperado[, grau[, medido]])} em reais, com a
+    quantidade de casos de cada operação já conhecida (os memmaps são alocados antes da escrita).
+    Sem a coluna de graus, SIN e COS usam o ângulo de z.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    total = sum(casos_por_operacao.values())
+    colunas = {}
+    for coluna, tipo in COLUNAS.items():
+        if total:
+            colunas[coluna] = np.lib.format.open_memmap(_caminho_coluna(pasta, coluna), mode="w+", dtype=tipo,
+                                                        shape=(total,))
+        else:
+            colunas[coluna] = np.empty(0, dtype=tipo)
+            np.save(_caminho_coluna(pasta, coluna), colunas[coluna])
+    medido = None
+    indice = {"versao": VERSAO_STORE, "casos": total, "colunas": sorted(COLUNAS), "operacoes": {}}
+    posicao = 0
+    for op_name in OPERACOES:
+        if op_name not in blocos_por_operacao:
+            continue
+        inicio = posicao
+        for bloco in blocos_por_operacao[op_name]:
+            x_val, y_val, z_val, esperado = (np.asarray(valores, dtype=np.float64) for valores in bloco[:4])
+            fim = posicao + len(x_val)
+            if fim > inicio + casos_por_operacao[op_name]:
+                raise ValueError(f"{op_name}: mais casos que os {casos_por_operacao[op_name]} anunciados")
+            fatia = slice(posicao, fim)
+            colunas["operacao"][fatia] = OPERACOES[op_name][0]
+            for nome, valores in (("x", x_val), ("y", y_val), ("z", z_val)):
+                colunas[nome][fatia] = valores
+                colunas[f"{nome}_q16"][fatia] = real_to_q16_16(valores)
+            colunas["esperado"][fatia] = esperado
+            if len(bloco) > 4 and bloco[4] is not None:
+                colunas["grau"][fatia] = bloco[4]
+            else:
+                colunas["grau"][fatia] = np.degrees(z_val) if op_name in ("SIN", "COS") else np.nan
+            if len(bloco) > 5 and bloco[5] is not None:
+                if medido is None:
+                    medido = _criar_medido(pasta, total)
+                medido[fatia] = bloco[5]
+            posicao = fim
+        if posicao != inicio + casos_por_operacao[op_name]:
+            raise ValueError(f"{op_name}: {posicao - inicio} casos lidos, {casos_por_operacao[op_name]} anunciados")
+        indice["operacoes"][op_name] = [inicio, posicao]
+    for valores in colunas.values():
+        if isinstance(valores, np.memmap):
+            valores.flush()
+    if medido is not None:
+        medido.flush()
+        indice["colunas"] = sorted(COLUNAS) + [COLUNA_MEDIDO]
+    elif os.path.exists(_caminho_coluna(pasta, COLUNA_MEDIDO)):
+        os.remove(_caminho_coluna(pasta, COLUNA_MEDIDO))
+    _gravar_indice(pasta, indice)
+    return indice
+
+
+def _criar_medido(pasta, total):
+    medido = np.lib.format.open_memmap(_caminho_coluna(pasta, COLUNA_MEDIDO), mode="w+", dtype=np.float64,
+                                       shape=(total,))
+    medido[:] = np.nan
+    return medido
+
+
+def importar_tabelas(pasta_tabelas, pasta, operacoes=None):
+    """Importa as tabelas de texto (test_cases_<op>.txt ou seus fragmentos) para um store novo."""
+    arquivos = {op_name: arquivos_tabela(pasta_tabelas, op_name) for op_name in operacoes or OPERACOES}
+    arquivos = {op_name: caminhos for op_name, caminhos in arquivos.items() if caminhos}
+    casos = {op_name: sum(_contar_linhas(caminho) for caminho in caminhos) for op_name, caminhos in arquivos.items()}
+    blocos = {op_name: _blocos_tabelas(op_name, caminhos) for op_name, caminhos in arquivos.items()}
+    return criar_store(pasta, blocos, casos)
+
+
+def _blocos_tabelas(op_name, caminhos):
+    for caminho in caminhos:
+        yield from ler_tabela(caminho, op_name, graus=True)
+
+
+def abrir_store(pasta, modo="r"):
+    """Abre o store: {"indice": ..., "colunas": {nome: memmap}}. Nada é lido até as colunas serem acessadas."""
+    with open(os.path.join(pasta, ARQUIVO_INDICE)) as f:
+        indice = json.load(f)
+    if indice.get("versao") != VERSAO_STORE:
+        raise ValueError(f"'{pasta}' tem versão {indice.get('versao')} do store (esperada {VERSAO_STORE})")
+    colunas = {}
+    for coluna in indice["colunas"]:
+        if indice["casos"]:
+            colunas[coluna] = np.load(_caminho_coluna(pasta, coluna), mmap_mode=modo)
+        else:
+            colunas[coluna] = np.empty(0, dtype=COLUNAS.get(coluna, np.float64))
+    return {"pasta": pasta, "indice": indice, "colunas": colunas}
+
+
+def colunas_operacao(store, op_name, inicio=0, fim=None, colunas=None):
+    """Views (sem cópia) das colunas dos casos [inicio, fim) de uma operação."""
+    if op_name not in store["indice"]["operacoes"]:
+        raise KeyError(f"'{op_name}' não está no store")
+    primeiro, ultimo = store["indice"]["operacoes"][op_name]
+    fim = ultimo - primeiro if fim is None else min(fim, ultimo - primeiro)
+    if inicio < 0 or inicio > fim:
+        raise ValueError(f"{op_name}: faixa [{inicio}, {fim}) fora dos {ultimo - primeiro} casos")
+    fatia = slice(primeiro + inicio, primeiro + fim)
+    return {nome: valores[fatia] for nome, valores in store["colunas"].items()
+            if colunas is None or nome in colunas}
+
+
+def gravar_medidos(pasta, op_name, valores, inicio=0):
+    """Grava resultados medidos de uma operação a partir do caso 'inicio', criando a coluna 'medido' se preciso."""
+    store = abrir_store(pasta)
+    indice = store["indice"]
+    primeiro, ultimo = indice["operacoes"][op_name]
+    valores = np.asarray(valores, dtype=np.float64)
+    if inicio < 0 or primeiro + inicio + len(valores) > ultimo:
+        raise ValueError(f"{op_name}: {len(valores)} medidos a partir de {inicio} passam dos {ultimo - primeiro} casos")
+    if COLUNA_MEDIDO in indice["colunas"]:
+        medido = np.load(_caminho_coluna(pasta, COLUNA_MEDIDO), mmap_mode="r+")
+    else:
+        medido = _criar_medido(pasta, indice["casos"])
+        indice["colunas"].append(COLUNA_MEDIDO)
+        _gravar_indice(pasta, indice)
+    medido[primeiro + inicio:primeiro + inicio + len(valores)] = valores
+    medido.flush()
+
+
+def exportar_tabelas(pasta, pasta_saida, operacoes=None, sobrescrever=False):
+    """
+    Exporta o store para test_cases_<op>.txt no layout de texto do gerador. Retorna os casos por operação.
+    Sem 'sobrescrever', nenhuma tabela é escrita se alguma já existir em pasta_saida.
+    """
+    store = abrir_store(pasta)
+    operacoes = list(operacoes or store["indice"]["operacoes"])
+    saidas = {op_name: os.path.join(pasta_saida, f"test_cases_{op_name.lower()}.txt") for op_name in operacoes}
+    existentes = [caminho for caminho in saidas.values() if os.path.exists(caminho)]
+    if existentes and not sobrescrever:
+        raise FileExistsError(f"tabelas já existentes em '{pasta_saida}': "
+                              f"{', '.join(os.path.basename(caminho) for caminho in existentes)}")
+    os.makedirs(pasta_saida, exist_ok=True)
+    contagem = {}
+    for op_name in operacoes:
+        contagem[op_name] = 0
+        total = store["indice"]["operacoes"][op_name][1] - store["indice"]["operacoes"][op_name][0]
+        with open(saidas[op_name], "wb") as f:
+            for inicio in range(0, total, gerador.LINHAS_POR_BLOCO):
+                colunas = colunas_operacao(store, op_name, inicio, inicio + gerador.LINHAS_POR_BLOCO,
+                                           ("x", "y", "z", "esperado", "grau"))
+                casos = {"x": colunas["x"], "y": colunas["y"], "z": colunas["z"], "ref": colunas["esperado"],
+                         "grau": colunas["grau"]}
+                f.write(gerador.formatar_casos_vetorizado(op_name, casos))
+                contagem[op_name] += len(casos["ref"])
+    return contagem
+
+
+def resumo_store(store):
+    """Casos, faixa e colunas de cada operação do store."""
+    medido = store["colunas"].get(COLUNA_MEDIDO)
+    resumo = {}
+    for op_name, (inicio, fim) in store["indice"]["operacoes"].items():
+        resumo[op_name] = {"casos": fim - inicio, "inicio": inicio, "fim": fim}
+        if medido is not None:
+            resumo[op_name]["medidos"] = int(np.count_nonzero(~np.isnan(medido[inicio:fim])))
+    return resumo
+
+
+# --- Importação / exportação do store ---
+if __name__ == "__main__":
+    pasta_script = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Armazenamento colunar (memmap) dos vetores de teste CORDIC.")
+    parser.add_argument("acao", choices=("importar", "exportar", "resumo"),
+                        help="importar tabelas de texto, exportar para texto ou resumir o store")
+    parser.add_argument("store", help="pasta do store")
+    parser.add_argument("--tabelas", default=None,
+                        help="pasta das tabelas test_cases_<op>.txt: origem do importar (padrão: a pasta deste "
+                             "script) e destino do exportar (obrigatória)")
+    parser.add_argument("--sobrescrever", action="store_true",
+                        help="no exportar, substitui as tabelas que já existirem no destino")
+    parser.add_argument("--operacoes", nargs="+", default=None, help="operações (padrão: todas)")
+    args = parser.parse_args()
+
+    operacoes = [op.upper() for op in args.operacoes] if args.operacoes else None
+    if args.acao == "importar":
+        pasta_tabelas = args.tabelas or pasta_script
+        indice = importar_tabelas(pasta_tabelas, args.store, operacoes)
+        print(f"{indice['casos']} casos importados de '{pasta_tabelas}' para '{args.store}'")
+    elif args.acao == "exportar":
+        # Sem destino padrão: exportar para a pasta do script substituiria as tabelas versionadas
+        if args.tabelas is None:
+            parser.error("exportar precisa de --tabelas com a pasta de destino")
+        try:
+            contagem = exportar_tabelas(args.store, args.tabelas, operacoes, args.sobrescrever)
+        except FileExistsError as erro:
+            parser.error(f"{erro}; use --sobrescrever para substituí-las")
+        print(f"{sum(contagem.values())} casos exportados de '{args.store}' para '{args.tabelas}'")
+    else:
+        store = abrir_store(args.store)
+        print(f"Store '{args.store}': {store['indice']['casos']} casos, colunas {', '.join(store['indice']['colunas'])}\n")
+        print(f"{'operação':<10}{'casos':>10}{'início':>12}{'fim':>12}{'medidos':>10}")
+        for op_name, linha in resumo_store(store).items():
+            print(f"{op_name:<10}{linha['casos']:>10}{linha['inicio']:>12}{linha['fim']:>12}"
+                  f"{linha.get('medidos', '-'):>10}")
@@ -1,6 +1,15 @@
 import math
 import random
 import os
+import argparse
+import hashlib
+import inspect
+import json
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 # --- Variáveis de Configuração: Quantidade de Casos de Teste por Operação ---
 # Defina o número de casos de teste ALEATÓRIOS para cada operação.
@@ -27,6 +36,20 @@ NUM_SEQUENTIAL_TESTS_SINH = 50
 NUM_SEQUENTIAL_TESTS_COSH = 50
 NUM_SEQUENTIAL_TESTS_ATANH = 50
 NUM_SEQUENTIAL_TESTS_MODH = 50
+
+# Quantidades indexadas pelo nome da operação (usadas pela geração vetorizada)
+NUM_RANDOM_TESTS = {
+    "SIN": NUM_RANDOM_TESTS_SIN, "COS": NUM_RANDOM_TESTS_COS, "ATAN": NUM_RANDOM_TESTS_ATAN,
+    "MOD": NUM_RANDOM_TESTS_MOD, "MULT": NUM_RANDOM_TESTS_MULT, "DIV": NUM_RANDOM_TESTS_DIV,
+    "SINH": NUM_RANDOM_TESTS_SINH, "COSH": NUM_RANDOM_TESTS_COSH, "ATANH": NUM_RANDOM_TESTS_ATANH,
+    "MODH": NUM_RANDOM_TESTS_MODH
+}
+NUM_SEQUENTIAL_TESTS = {
+    "SIN": NUM_SEQUENTIAL_TESTS_SIN, "COS": NUM_SEQUENTIAL_TESTS_COS, "ATAN": NUM_SEQUENTIAL_TESTS_ATAN,
+    "MOD": NUM_SEQUENTIAL_TESTS_MOD, "MULT": NUM_SEQUENTIAL_TESTS_MULT, "DIV": NUM_SEQUENTIAL_TESTS_DIV,
+    "SINH": NUM_SEQUENTIAL_TESTS_SINH, "COSH": NUM_SEQUENTIAL_TESTS_COSH, "ATANH": NUM_SEQUENTIAL_TESTS_ATANH,
+    "MODH": NUM_SEQUENTIAL_TESTS_MODH
+}
 # ------------------------------------------------------------------------
 
 # Mapeamento do nome da operação para o código binário (para uso no script)
@@ -60,6 +83,78 @@ MAX_EXPECTED_ATANH_RESULT = 1.1183 # Ajustado para o valor observado de saturaç
 # Reduz a geração de casos onde Y está muito próximo de X em magnitude.
 MAX_MODH_INPUT_RATIO = 0.8 # Ajustado para evitar casos de alta imprecisão
 
+# Faixa do divisor sorteado e limite do quociente da operação DIV (resultado em [-2, 2]).
+MIN_DIV_DIVISOR = 1.0
+MAX_DIV_DIVISOR = 10.0
+MAX_DIV_QUOTIENT = 2.0
+
+
+# --- Casos de Teste Fixos por Operação ---
+# Ângulos comuns, incluindo aqueles que a correção de quadrante deve lidar (SIN e COS)
+_ANGULOS_FIXOS = [
+    0.0, math.pi / 6, math.pi / 4, math.pi / 3, math.pi / 2, math.pi,
+    -math.pi / 6, -math.pi / 2, -math.pi,
+    1.5 * math.pi, -2.5 * math.pi, 2 * math.pi, -2 * math.pi, # Inclui múltiplos de pi para testar correção de quadrante
+    math.radians(30), math.radians(45), math.radians(60), math.radians(90), math.radians(180), math.radians(270), math.radians(360),
+    math.radians(-30), math.radians(-45), math.radians(-60), math.radians(-90), math.radians(-180), math.radians(-270), math.radians(-360)
+]
+
+CASOS_FIXOS = {
+    "SIN": _ANGULOS_FIXOS,
+    "COS": _ANGULOS_FIXOS,
+    # (x, y): apenas dentro da faixa de convergência |y/x| <= 1 e x_val > 0
+    "ATAN": [
+        (1.0, 0.0), (1.0, 1.0), (1.0, -1.0), # Casos de borda
+        (0.0, 1.0), (0.0, -1.0),             # Eixos (x=0, y!=0)
+        (5.0, 2.0), (5.0, -2.0),
+        (10.0, 0.5), (0.5, 0.1)
+    ],
+    # (x, y): garantindo que o resultado caiba no range de operação do seu CORDIC
+    "MOD": [
+        (0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0),
+        (100.0, 100.0), (500.0, 500.0),
+        (MAX_EXPECTED_MOD_RESULT / math.sqrt(2), MAX_EXPECTED_MOD_RESULT / math.sqrt(2)) # Exemplo de valor alto no limite
+    ],
+    # (x, z): garantindo que o resultado caiba no Q16.16
+    "MULT": [
+        (1.0, 1.0), (0.5, 0.5), (10.0, 0.5), (-2.0, 0.3),
+        (100.0, 1.0), (300.0, 0.1),
+        (10000.0, 3.0), # 30000.0
+        (30000.0, 1.0), # 30000.0
+        (-20000.0, 1.5), # -30000.0
+        (-100.0, -100.0), # 10000.0
+        (100.0, 5.0), # Z reduzido de 100.0 para 5.0
+        (-500.0, 5.0) # Z reduzido de 500.0 para 5.0
+    ],
+    # (dividendo, divisor): garantindo que o resultado caiba em [-2, 2] e sem divisão por zero
+    "DIV": [
+        (1.0, 1.0), (5.0, 2.5), (10.0, 5.0), (1.0, 0.5), # Resultados dentro de -2 a 2
+        (0.5, 1.0), (-0.5, 1.0), (0.5, -1.0),
+        (2.0, 1.0), (-2.0, 1.0), (2.0, -1.0), (-2.0, -1.0) # Limites
+    ],
+    # z: apenas dentro da faixa de convergência CORDIC ~+/-1.13
+    "SINH": [
+        0.0, 0.1, 0.5, 1.0, 1.1,
+        -0.1, -0.5, -1.0, -1.1,
+        1.13, -1.13 # Limites aproximados
+    ],
+    "COSH": [
+        0.0, 0.1, 0.5, 1.0, 1.1,
+        -0.1, -0.5, -1.0, -1.1,
+        1.13, -1.13
+    ],
+    # (x, y): apenas dentro da faixa de convergência |Y/X| < 1 e resultado <= MAX_EXPECTED_ATANH_RESULT
+    "ATANH": [
+        (1.0, 0.0), (1.0, 0.5), (1.0, -0.5), (2.0, 1.0), (10.0, 9.0),
+        (1.0, 0.99), (1.0, -0.99) # Próximo aos limites
+    ],
+    # (x, y): apenas onde X^2 > Y^2 e abs(Y/X) <= MAX_MODH_INPUT_RATIO
+    "MODH": [
+        (1.0, 0.0), (1.0, 0.5), (1.0, -0.5), (2.0, 1.0), (10.0, 8.0), # Ajustado 10.0, 9.0 para 10.0, 8.0
+        (5.0, 4.0) # Exemplo de valor com razão Y/X = 0.8
+    ],
+}
+
 
 def generate_random_float(min_val, max_val, num_samples):
     """Gera uma lista de floats aleatórios dentro de um range."""
@@ -87,13 +182,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "SIN"
     op_code = OP_CODES[op_name]
     # Casos fixos (ângulos comuns, incluindo aqueles que a correção de quadrante deve lidar)
-    angles_rad_sin_fixed = [
-        0.0, math.pi / 6, math.pi / 4, math.pi / 3, math.pi / 2, math.pi,
-        -math.pi / 6, -math.pi / 2, -math.pi,
-        1.5 * math.pi, -2.5 * math.pi, 2 * math.pi, -2 * math.pi, # Inclui múltiplos de pi para testar correção de quadrante
-        math.radians(30), math.radians(45), math.radians(60), math.radians(90), math.radians(180), math.radians(270), math.radians(360),
-        math.radians(-30), math.radians(-45), math.radians(-60), math.radians(-90), math.radians(-180), math.radians(-270), math.radians(-360)
-    ]
+    angles_rad_sin_fixed = CASOS_FIXOS[op_name]
     for angle in angles_rad_sin_fixed:
         angle_deg = math.degrees(angle)
         expected_res = math.sin(angle)
@@ -124,13 +213,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "COS"
     op_code = OP_CODES[op_name]
     # Casos fixos
-    angles_rad_cos_fixed = [
-        0.0, math.pi / 6, math.pi / 4, math.pi / 3, math.pi / 2, math.pi,
-        -math.pi / 6, -math.pi / 2, -math.pi,
-        1.5 * math.pi, -2.5 * math.pi, 2 * math.pi, -2 * math.pi,
-        math.radians(30), math.radians(45), math.radians(60), math.radians(90), math.radians(180), math.radians(270), math.radians(360),
-        math.radians(-30), math.radians(-45), math.radians(-60), math.radians(-90), math.radians(-180), math.radians(-270), math.radians(-360)
-    ]
+    angles_rad_cos_fixed = CASOS_FIXOS[op_name]
     for angle in angles_rad_cos_fixed:
         angle_deg = math.degrees(angle)
         expected_res = math.cos(angle)
@@ -158,12 +241,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "ATAN"
     op_code = OP_CODES[op_name]
     # Casos fixos (apenas dentro da faixa de convergência |y/x| <= 1 e x_val > 0)
-    atan_fixed_inputs = [
-        (1.0, 0.0), (1.0, 1.0), (1.0, -1.0), # Casos de borda
-        (0.0, 1.0), (0.0, -1.0),             # Eixos (x=0, y!=0)
-        (5.0, 2.0), (5.0, -2.0),
-        (10.0, 0.5), (0.5, 0.1)
-    ]
+    atan_fixed_inputs = CASOS_FIXOS[op_name]
     for x_val, y_val in atan_fixed_inputs:
         # Garante que a razão esteja dentro do limite de convergência do CORDIC para ATAN
         if x_val == 0 and y_val == 0: continue # Evita 0/0
@@ -204,11 +282,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "MOD"
     op_code = OP_CODES[op_name]
     # Casos fixos (garantindo que o resultado caiba no range de operação do seu CORDIC)
-    mod_fixed_inputs = [
-        (0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0),
-        (100.0, 100.0), (500.0, 500.0),
-        (MAX_EXPECTED_MOD_RESULT / math.sqrt(2), MAX_EXPECTED_MOD_RESULT / math.sqrt(2)) # Exemplo de valor alto no limite
-    ]
+    mod_fixed_inputs = CASOS_FIXOS[op_name]
     for x_val, y_val in mod_fixed_inputs:
         expected_res = math.sqrt(x_val**2 + y_val**2)
         # Filtra casos que estouram o limite de resultado esperado para MOD
@@ -241,16 +315,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "MULT"
     op_code = OP_CODES[op_name]
     # Casos fixos (garantindo que o resultado caiba no Q16.16)
-    mult_inputs_fixed = [
-        (1.0, 1.0), (0.5, 0.5), (10.0, 0.5), (-2.0, 0.3),
-        (100.0, 1.0), (300.0, 0.1),
-        (10000.0, 3.0), # 30000.0
-        (30000.0, 1.0), # 30000.0
-        (-20000.0, 1.5), # -30000.0
-        (-100.0, -100.0), # 10000.0
-        (100.0, 5.0), # Z reduzido de 100.0 para 5.0
-        (-500.0, 5.0) # Z reduzido de 500.0 para 5.0
-    ]
+    mult_inputs_fixed = CASOS_FIXOS[op_name]
     for x_val, z_val in mult_inputs_fixed:
         expected_res = x_val * z_val
         # Filtra casos que estouram o Q16.16
@@ -286,11 +351,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "DIV"
     op_code = OP_CODES[op_name]
     # Casos fixos (garantindo que o resultado caiba em [-2, 2] e sem divisão por zero)
-    div_inputs_fixed = [
-        (1.0, 1.0), (5.0, 2.5), (10.0, 5.0), (1.0, 0.5), # Resultados dentro de -2 a 2
-        (0.5, 1.0), (-0.5, 1.0), (0.5, -1.0),
-        (2.0, 1.0), (-2.0, 1.0), (2.0, -1.0), (-2.0, -1.0) # Limites
-    ]
+    div_inputs_fixed = CASOS_FIXOS[op_name]
     for a, b in div_inputs_fixed:
         if b == 0: continue # Evita divisão por zero
         expected_res = a / b
@@ -316,7 +377,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     for _ in range(NUM_RANDOM_TESTS_DIV):
         # Gerar a e b de forma que a/b esteja dentro de [-2, 2]
         a = random.uniform(-20.0, 20.0)
-        b = random.uniform(1.0, 10.0) # Divisor sempre positivo e maior que 0.1 para evitar grandes quocientes
+        b = random.uniform(MIN_DIV_DIVISOR, MAX_DIV_DIVISOR) # Divisor sempre positivo e maior que 0.1 para evitar grandes quocientes
         
         expected_res = a / b
         if expected_res > 2.0 or expected_res < -2.0: continue
@@ -327,11 +388,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "SINH"
     op_code = OP_CODES[op_name]
     # Casos fixos (apenas dentro da faixa de convergência CORDIC ~+/-1.13)
-    hyperbolic_args_sinh_fixed = [
-        0.0, 0.1, 0.5, 1.0, 1.1,
-        -0.1, -0.5, -1.0, -1.1,
-        1.13, -1.13 # Limites aproximados
-    ]
+    hyperbolic_args_sinh_fixed = CASOS_FIXOS[op_name]
     for arg_float in hyperbolic_args_sinh_fixed:
         # Filtra casos fora da faixa de convergência CORDIC para hiperbólicas
         if abs(arg_float) > 1.1300000001: continue
@@ -358,11 +415,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "COSH"
     op_code = OP_CODES[op_name]
     # Casos fixos (apenas dentro da faixa de convergência CORDIC ~+/-1.13)
-    hyperbolic_args_cosh_fixed = [
-        0.0, 0.1, 0.5, 1.0, 1.1,
-        -0.1, -0.5, -1.0, -1.1,
-        1.13, -1.13
-    ]
+    hyperbolic_args_cosh_fixed = CASOS_FIXOS[op_name]
     for arg_float in hyperbolic_args_cosh_fixed:
         if abs(arg_float) > 1.1300000001: continue
         expected_res = math.cosh(arg_float)
@@ -388,10 +441,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "ATANH"
     op_code = OP_CODES[op_name]
     # Casos fixos (apenas dentro da faixa de convergência |Y/X| < 1 e resultado <= MAX_EXPECTED_ATANH_RESULT)
-    atanh_inputs_fixed = [
-        (1.0, 0.0), (1.0, 0.5), (1.0, -0.5), (2.0, 1.0), (10.0, 9.0),
-        (1.0, 0.99), (1.0, -0.99) # Próximo aos limites
-    ]
+    atanh_inputs_fixed = CASOS_FIXOS[op_name]
     for x_val, y_val in atanh_inputs_fixed:
         if x_val == 0: continue # Evita divisão por zero
         ratio = y_val / x_val
@@ -434,10 +484,7 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     op_name = "MODH"
     op_code = OP_CODES[op_name]
     # Casos fixos (apenas onde X^2 > Y^2 e abs(Y/X) <= MAX_MODH_INPUT_RATIO)
-    modh_inputs_fixed = [
-        (1.0, 0.0), (1.0, 0.5), (1.0, -0.5), (2.0, 1.0), (10.0, 8.0), # Ajustado 10.0, 9.0 para 10.0, 8.0
-        (5.0, 4.0) # Exemplo de valor com razão Y/X = 0.8
-    ]
+    modh_inputs_fixed = CASOS_FIXOS[op_name]
     for x_val, y_val in modh_inputs_fixed:
         if x_val == 0: continue # Evita divisão por zero
         ratio = y_val / x_val
@@ -469,21 +516,795 @@ def generate_cordic_test_cases_formatted_grouped_configurable():
     return grouped_test_lines, test_case_counts
 
 
+# --- Geração Vetorizada (NumPy) ---
+# Mesmas populações de casos da função acima, mas sorteadas de uma vez como vetores NumPy,
+# com as referências calculadas em bloco e as linhas formatadas/escritas em bloco.
+
+# Casas decimais usadas nos arquivos de teste
+CASAS_DECIMAIS = 10
+
+# Distância (em unidades da última casa) a partir da qual o arredondamento vetorizado é confiável
+TOLERANCIA_EMPATE = 1e-5
+
+# Quantidade de linhas formatadas por vez ao escrever os arquivos
+LINHAS_POR_BLOCO = 1 << 18
+
+# Colunas de cada arquivo, na ordem lida pelo TB_top_level_calc_cordicV3.v ("0.0" = coluna constante).
+# A divisão guarda o dividendo (y) antes do divisor (x).
+LAYOUT_COLUNAS = {
+    "SIN": ("grau", "0.0", "0.0", "z", "ref"),
+    "COS": ("grau", "0.0", "0.0", "z", "ref"),
+    "ATAN": ("x", "y", "0.0", "ref"),
+    "MOD": ("x", "y", "0.0", "ref"),
+    "MULT": ("x", "0.0", "z", "ref"),
+    "DIV": ("y", "x", "0.0", "ref"),
+    "SINH": ("0.0", "0.0", "z", "ref"),
+    "COSH": ("0.0", "0.0", "z", "ref"),
+    "ATANH": ("x", "y", "0.0", "ref"),
+    "MODH": ("x", "y", "0.0", "ref"),
+}
+
+
+def _referencia_vetorizada(op_name, x, y, z):
+    """Calcula o resultado esperado (ponto flutuante) de uma operação para vetores de entrada."""
+    with np.errstate(all="ignore"):
+        if op_name == "SIN": return np.sin(z)
+        if op_name == "COS": return np.cos(z)
+        if op_name == "ATAN": return np.arctan2(y, x)
+        if op_name == "MOD": return np.sqrt(x**2 + y**2)
+        if op_name == "MULT": return x * z
+        if op_name == "DIV": return y / x
+        if op_name == "SINH": return np.sinh(z)
+        if op_name == "COSH": return np.cosh(z)
+        if op_name == "ATANH": return np.arctanh(y / x)
+        if op_name == "MODH": return np.sqrt(x**2 - y**2)
+    raise ValueError(f"Operação desconhecida: {op_name}")
+
+
+def _validos_vetorizado(op_name, x, y, z, expected_res, fixos):
+    """
+    Máscara dos casos válidos, com os mesmos filtros ('continue') da geração escalar.
+    Alguns filtros só são aplicados aos casos fixos, como na função original.
+    """
+    with np.errstate(all="ignore"):
+        valido = ~np.isnan(expected_res)
+        if op_name == "ATAN" and fixos:
+            valido &= ~((x == 0) & (y == 0)) & (x >= 0) & ((x == 0) | (np.abs(y / x) <= 1.0000000001))
+        elif op_name == "MOD":
+            valido &= expected_res <= MAX_EXPECTED_MOD_RESULT
+        elif op_name == "MULT":
+            valido &= (expected_res <= Q16_16_MAX_VAL) & (expected_res >= Q16_16_MIN_VAL)
+        elif op_name == "DIV":
+            valido &= (x != 0) & (expected_res <= 2.0) & (expected_res >= -2.0)
+        elif op_name in ("SINH", "COSH") and fixos:
+            valido &= np.abs(z) <= 1.1300000001
+        elif op_name == "ATANH":
+            valido &= np.abs(expected_res) <= MAX_EXPECTED_ATANH_RESULT
+            if fixos:
+                valido &= (x != 0) & (np.abs(y / x) < 1.0)
+        elif op_name == "MODH" and fixos:
+            valido &= (x != 0) & (np.abs(y / x) < MAX_MODH_INPUT_RATIO) & (x**2 > y**2)
+    return valido
+
+
+def referencias_validas(op_name, x, y, z):
+    """Resultado esperado e máscara de validade (filtros dos casos sorteados) para vetores de entrada."""
+    expected_res = _referencia_vetorizada(op_name, x, y, z)
+    return expected_res, _validos_vetorizado(op_name, x, y, z, expected_res, False)
+
+
+# Contadores da amostragem dos casos sequenciais e aleatórios, por operação, acumulados no processo:
+# entradas sorteadas e entradas descartadas pelos filtros de validade (determinísticos para a mesma semente)
+CONTADORES_AMOSTRAGEM = {}
+
+
+def contadores_amostragem(op_name):
+    return CONTADORES_AMOSTRAGEM.setdefault(op_name, {"sorteios": 0, "rejeitados": 0})
+
+
+def _montar_casos(op_name, x, y, z, fixos=False):
+    """Calcula as referências, aplica os filtros de validade e devolve o dicionário de colunas."""
+    x, y, z = (np.asarray(v, dtype=np.float64) for v in np.broadcast_arrays(x, y, z))
+    expected_res = _referencia_vetorizada(op_name, x, y, z)
+    valido = _validos_vetorizado(op_name, x, y, z, expected_res, fixos)
+    if not fixos:
+        contador = contadores_amostragem(op_name)
+        contador["sorteios"] += len(valido)
+        contador["rejeitados"] += len(valido) - int(np.count_nonzero(valido))
+    casos = {"x": x[valido], "y": y[valido], "z": z[valido], "ref": expected_res[valido]}
+    if op_name in ("SIN", "COS"):
+        casos["grau"] = np.degrees(casos["z"])
+    return casos
+
+
+def _concatenar_casos(lista_casos):
+    """Junta vários dicionários de colunas (na ordem) em um só."""
+    return {chave: np.concatenate([casos[chave] for casos in lista_casos]) for chave in lista_casos[0]}
+
+
+def casos_fixos_vetorizados(op_name, inicio=0, quantidade=None):
+    """Casos fixos (limites, zero, ângulos notáveis) de uma operação, opcionalmente só a fatia [inicio, inicio+quantidade)."""
+    fixos = np.array(CASOS_FIXOS[op_name], dtype=np.float64)
+    fim = len(fixos) if quantidade is None else inicio + quantidade
+    fixos = fixos[inicio:fim]
+    if op_name in ("SIN", "COS", "SINH", "COSH"):
+        return _montar_casos(op_name, 0.0, 0.0, fixos, fixos=True)
+    if op_name == "MULT":
+        return _montar_casos(op_name, fixos[:, 0], 0.0, fixos[:, 1], fixos=True)
+    if op_name == "DIV":
+        return _montar_casos(op_name, fixos[:, 1], fixos[:, 0], 0.0, fixos=True)
+    return _montar_casos(op_name, fixos[:, 0], fixos[:, 1], 0.0, fixos=True)
+
+
+def casos_sequenciais_vetorizados(op_name, num_samples, rng, inicio=0, quantidade=None):
+    """
+    Casos sequenciais de uma operação (mesmas faixas e passos da geração escalar).
+    'inicio' e 'quantidade' selecionam uma fatia dos num_samples passos, sem alterar o passo.
+    """
+    quantidade = num_samples - inicio if quantidade is None else quantidade
+    i = np.arange(inicio, inicio + quantidade, dtype=np.float64)
+    if op_name in ("SIN", "COS"):
+        # Cobre de -360 a 360 graus para testar a correção de quadrante
+        step = (math.radians(360) - math.radians(-360)) / num_samples
+        return _montar_casos(op_name, 0.0, 0.0, math.radians(-360) + i * step)
+    if op_name == "ATAN":
+        # Razão y/x de -1 a 1 com x positivo
+        x_val = rng.uniform(0.1, 10.0, quantidade)
+        return _montar_casos(op_name, x_val, x_val * (-1.0 + i * (2.0 / num_samples)), 0.0)
+    if op_name == "MOD":
+        max_input_val = MAX_EXPECTED_MOD_RESULT / math.sqrt(2)
+        val = -max_input_val + i * ((2 * max_input_val) / num_samples)
+        return _montar_casos(op_name, val, val, 0.0)
+    if op_name == "MULT":
+        max_prod_val = Q16_16_MAX_VAL / 2.0
+        x_val = -max_prod_val + i * ((2 * max_prod_val) / num_samples)
+        return _montar_casos(op_name, x_val, 0.0, rng.uniform(-2.0, 2.0, quantidade))
+    if op_name == "DIV":
+        # Quociente alvo de -2 a 2, divisor em [0.5, 10]
+        b_val = rng.uniform(0.5, 10.0, quantidade)
+        a_val = (-2.0 + i * (4.0 / num_samples)) * b_val
+        return _montar_casos(op_name, b_val, a_val, 0.0)
+    if op_name in ("SINH", "COSH"):
+        return _montar_casos(op_name, 0.0, 0.0, -1.13 + i * ((2 * 1.13) / num_samples))
+    if op_name == "ATANH":
+        max_ratio = math.tanh(MAX_EXPECTED_ATANH_RESULT)
+        return _montar_casos(op_name, 1.0, -max_ratio + i * ((2 * max_ratio) / num_samples), 0.0)
+    if op_name == "MODH":
+        ratio = -MAX_MODH_INPUT_RATIO + i * ((2 * MAX_MODH_INPUT_RATIO) / num_samples)
+        return _montar_casos(op_name, 1.0, ratio, 0.0)
+    raise ValueError(f"Operação desconhecida: {op_name}")
+
+
+def _sortear_quociente_limitado(x_min, x_max, limite_y, limite_quociente, num_samples, rng):
+    """
+    Sorteia (x, y) uniformes na região x_min <= x <= x_max, |y| <= limite_y, |y / x| <= limite_quociente,
+    sem rejeição: x pela inversa da distribuição acumulada da largura da faixa de y, depois y uniforme na faixa.
+    """
+    x_plano = min(max(limite_y / limite_quociente, x_min), x_max)  # a partir de x_plano a faixa de y é constante
+    area_triangular = limite_quociente * (x_plano**2 - x_min**2)
+    area_total = area_triangular + 2 * limite_y * (x_max - x_plano)
+    u = rng.uniform(0.0, area_total, num_samples)
+    x_val = np.where(u <= area_triangular, np.sqrt(x_min**2 + u / limite_quociente),
+                     x_plano + (u - area_triangular) / (2 * limite_y))
+    limite = np.minimum(limite_y, limite_quociente * x_val)
+    return x_val, rng.uniform(-limite, limite)
+
+
+def casos_aleatorios_vetorizados(op_name, num_samples, rng):
+    """
+    Exatamente num_samples casos aleatórios de uma operação. Cada operação é sorteada direto no seu
+    domínio válido (mesmas distribuições da geração escalar, condicionadas aos filtros), então os
+    filtros só descartam casos de borda por arredondamento, que são sorteados de novo. Um sorteio sem
+    nenhum caso válido indica um domínio vazio (ex.: limites alterados) e interrompe a geração.
+    """
+    partes = []
+    faltam = num_samples
+    while True:
+        casos = _sortear_aleatorios(op_name, faltam, rng)
+        if faltam > 0 and not len(casos["ref"]):
+            raise ValueError(f"{op_name}: nenhum dos {faltam} casos aleatórios sorteados é válido; verifique os limites")
+        partes.append(casos)
+        faltam -= len(casos["ref"])
+        if faltam <= 0:
+            return partes[0] if len(partes) == 1 else _concatenar_casos(partes)
+
+
+def _sortear_aleatorios(op_name, num_samples, rng):
+    """Sorteia num_samples entradas de uma operação no seu domínio válido e monta os casos."""
+    if op_name in ("SIN", "COS"):
+        return _montar_casos(op_name, 0.0, 0.0, rng.uniform(math.radians(-360), math.radians(360), num_samples))
+    if op_name == "ATAN":
+        x_val = rng.uniform(0.1, 100.0, num_samples)
+        return _montar_casos(op_name, x_val, rng.uniform(-x_val, x_val), 0.0)
+    if op_name == "MOD":
+        limite = MAX_EXPECTED_MOD_RESULT / math.sqrt(2)
+        return _montar_casos(op_name, rng.uniform(-limite, limite, num_samples),
+                             rng.uniform(-limite, limite, num_samples), 0.0)
+    if op_name == "MULT":
+        # x em ±Q16_16_MAX_VAL/10 e z em ±5: |x * z| <= Q16_16_MAX_VAL / 2, sem descartes
+        x_val = rng.uniform(-Q16_16_MAX_VAL / 10.0, Q16_16_MAX_VAL / 10.0, num_samples)
+        return _montar_casos(op_name, x_val, 0.0, rng.uniform(-5.0, 5.0, num_samples))
+    if op_name == "DIV":
+        # Divisor em [MIN_DIV_DIVISOR, MAX_DIV_DIVISOR], dividendo em ±20, quociente em ±MAX_DIV_QUOTIENT
+        b_val, a_val = _sortear_quociente_limitado(MIN_DIV_DIVISOR, MAX_DIV_DIVISOR, 20.0, MAX_DIV_QUOTIENT,
+                                                   num_samples, rng)
+        return _montar_casos(op_name, b_val, a_val, 0.0)
+    if op_name in ("SINH", "COSH"):
+        return _montar_casos(op_name, 0.0, 0.0, rng.uniform(-1.13, 1.13, num_samples))
+    if op_name == "ATANH":
+        x_val = rng.uniform(0.1, 10.0, num_samples)
+        limite = math.tanh(MAX_EXPECTED_ATANH_RESULT) * x_val
+        return _montar_casos(op_name, x_val, rng.uniform(-limite, limite), 0.0)
+    if op_name == "MODH":
+        x_val = rng.uniform(0.1, 10.0, num_samples)
+        limite = MAX_MODH_INPUT_RATIO * x_val
+        return _montar_casos(op_name, x_val, rng.uniform(-limite, limite), 0.0)
+    raise ValueError(f"Operação desconhecida: {op_name}")
+
+
+def gerar_casos_vetorizados(op_name, num_sequenciais=None, num_aleatorios=None, rng=None):
+    """Gera todos os casos (fixos, sequenciais e aleatórios) de uma operação como colunas NumPy."""
+    rng = np.random.default_rng() if rng is None else rng
+    num_sequenciais = NUM_SEQUENTIAL_TESTS[op_name] if num_sequenciais is None else num_sequenciais
+    num_aleatorios = NUM_RANDOM_TESTS[op_name] if num_aleatorios is None else num_aleatorios
+    return _concatenar_casos([
+        casos_fixos_vetorizados(op_name),
+        casos_sequenciais_vetorizados(op_name, num_sequenciais, rng),
+        casos_aleatorios_vetorizados(op_name, num_aleatorios, rng),
+    ])
+
+
+def casos_com_fixos(op_name, x, y, z):
+    """Casos fixos de uma operação seguidos dos casos montados (referência e filtros) a partir das entradas dadas."""
+    return _concatenar_casos([casos_fixos_vetorizados(op_name), _montar_casos(op_name, x, y, z)])
+
+
+# Tabela com os pares de dígitos "00" a "99", para formatar dois dígitos por vez
+_PARES_DIGITOS = np.array([[ord("0") + i // 10, ord("0") + i % 10] for i in range(100)], dtype=np.uint8)
+
+
+def _separar_decimais(valores, casas=CASAS_DECIMAIS):
+    """
+    Separa um vetor de floats em (negativo, parte inteira, parte fracionária * 10^casas) já
+    arredondados como f"{v:.10f}". A parte inteira é separada antes do arredondamento (a subtração
+    é exata em ponto flutuante), assim só a parte fracionária é multiplicada por 10^casas. O produto
+    erra no máximo ~1e-6 unidades, então os valores a menos de TOLERANCIA_EMPATE de um empate são
+    arredondados pelo próprio format do Python (decimal exato), que decide o empate pelo valor binário.
+    """
+    escala = 10 ** casas
+    absoluto = np.abs(valores)
+    inteiro = np.trunc(absoluto)
+    produto = (absoluto - inteiro) * escala
+    fracao = np.rint(produto).astype(np.int64)
+    inteiro = inteiro.astype(np.int64)
+    estouro = fracao == escala
+    inteiro += estouro
+    fracao[estouro] = 0
+    for i in np.flatnonzero(np.abs(produto - np.floor(produto) - 0.5) < TOLERANCIA_EMPATE):
+        parte_inteira, parte_fracionaria = f"{absoluto[i]:.{casas}f}".split(".")
+        inteiro[i], fracao[i] = int(parte_inteira), int(parte_fracionaria)
+    return np.signbit(valores), inteiro, fracao
+
+
+def _escrever_decimais(matriz, linha, negativo, inteiro, fracao, digitos_inteiros, casas=CASAS_DECIMAIS):
+    """
+    Escreve os caracteres de uma coluna decimal na matriz de bytes (um caso por linha), a partir da
+    posição 'linha' e ocupando digitos_inteiros + casas + 2 caracteres.
+    Sinal e zeros à esquerda viram bytes nulos, descartados na escrita.
+    """
+    matriz[:, linha] = negativo * ord("-")
+    inteiro = inteiro.astype(np.int32) if digitos_inteiros < 10 else inteiro
+    for k in range(digitos_inteiros):
+        potencia = 10 ** k
+        digito = (ord("0") + (inteiro // potencia) % 10).astype(np.uint8)
+        if k > 0:
+            digito *= inteiro >= potencia
+        matriz[:, linha + digitos_inteiros - k] = digito
+    linha += digitos_inteiros + 1
+    matriz[:, linha] = ord(".")
+    # Parte fracionária em grupos de até 4 dígitos (int32), formatados dois a dois pela tabela de pares
+    restantes = casas
+    while restantes > 0:
+        tamanho = min(4, restantes)
+        restantes -= tamanho
+        grupo = ((fracao // 10 ** restantes) % 10 ** tamanho).astype(np.int32)
+        for k in range(tamanho - 2, -1, -2):
+            par = (grupo // 10 ** k) % 100
+            matriz[:, linha + 1:linha + 3] = _PARES_DIGITOS[par]
+            linha += 2
+        if tamanho % 2:
+            matriz[:, linha + 1] = ord("0") + grupo % 10
+            linha += 1
+
+
+def formatar_casos_vetorizado(op_name, casos):
+    """Formata as colunas de uma operação no layout do arquivo de teste e retorna os bytes."""
+    num_linhas = len(casos["ref"])
+    layout = LAYOUT_COLUNAS[op_name]
+    decimais = {}
+    largura = 0
+    for coluna in layout:
+        if coluna == "0.0":
+            largura += 3
+        else:
+            negativo, inteiro, fracao = _separar_decimais(casos[coluna], CASAS_DECIMAIS)
+            digitos_inteiros = len(str(int(inteiro.max()))) if num_linhas else 1
+            decimais[coluna] = (negativo, inteiro, fracao, digitos_inteiros)
+            largura += digitos_inteiros + CASAS_DECIMAIS + 2
+    largura += 2 * (len(layout) - 1) + 1
+
+    matriz = np.zeros((num_linhas, largura), dtype=np.uint8)
+    posicao = 0
+    for indice, coluna in enumerate(layout):
+        if indice > 0:
+            matriz[:, posicao:posicao + 2] = np.frombuffer(b", ", dtype=np.uint8)
+            posicao += 2
+        if coluna == "0.0":
+            matriz[:, posicao:posicao + 3] = np.frombuffer(b"0.0", dtype=np.uint8)
+            posicao += 3
+        else:
+            negativo, inteiro, fracao, digitos_inteiros = decimais[coluna]
+            _escrever_decimais(matriz, posicao, negativo, inteiro, fracao, digitos_inteiros, CASAS_DECIMAIS)
+            posicao += digitos_inteiros + CASAS_DECIMAIS + 2
+    matriz[:, posicao] = ord("\n")
+    texto = matriz.ravel()
+    return texto[texto != 0].tobytes()
+
+
+def blocos_formatados(op_name, casos):
+    """Gera os bytes formatados das colunas de uma operação, em blocos de LINHAS_POR_BLOCO linhas."""
+    for inicio in range(0, len(casos["ref"]), LINHAS_POR_BLOCO):
+        yield formatar_casos_vetorizado(op_name, {chave: valores[inicio:inicio + LINHAS_POR_BLOCO]
+                                                  for chave, valores in casos.items()})
+
+
+def escrever_casos_vetorizado(f, op_name, casos):
+    """Escreve as colunas de uma operação em um arquivo binário aberto."""
+    for texto in blocos_formatados(op_name, casos):
+        f.write(texto)
+
+
+# --- Geração em Fragmentos (streaming, com semente) ---
+# A população de cada operação é vista como uma sequência [fixos | sequenciais | aleatórios] dividida em
+# fragmentos de tamanho_fragmento casos. Cada fragmento usa um gerador próprio derivado de
+# (semente, código da operação, segmento, índice do fragmento), então pode ser regerado sozinho, byte a
+# byte, sem gerar os anteriores. Só um fragmento fica em memória por vez.
+
+# Casos (antes dos filtros de validade) por fragmento / arquivo test_cases_<op>_NNNN.txt
+TAMANHO_FRAGMENTO = 1 << 20
+
+# Nome do manifesto gravado junto dos fragmentos
+ARQUIVO_MANIFESTO = "manifest.json"
+
+# Limites (variáveis de configuração do início do arquivo) usados pela geração de cada operação.
+# Entram no hash da configuração da operação: alterar um deles só regera as operações afetadas.
+LIMITES_OPERACAO = {
+    "SIN": (), "COS": (), "ATAN": (),
+    "MOD": ("MAX_EXPECTED_MOD_RESULT",),
+    "MULT": ("Q16_16_MAX_VAL", "Q16_16_MIN_VAL"),
+    "DIV": (), "SINH": (), "COSH": (),
+    "ATANH": ("MAX_EXPECTED_ATANH_RESULT",),
+    "MODH": ("MAX_MODH_INPUT_RATIO",),
+}
+
+
+def _segmentos(op_name, num_sequenciais, num_aleatorios):
+    """Segmentos (nome, quantidade) da população de uma operação, na ordem em que são escritos."""
+    return [("fixos", len(CASOS_FIXOS[op_name])), ("sequenciais", num_sequenciais), ("aleatorios", num_aleatorios)]
+
+
+def _total_casos(op_name, num_sequenciais, num_aleatorios):
+    return sum(quantidade for _, quantidade in _segmentos(op_name, num_sequenciais, num_aleatorios))
+
+
+def num_fragmentos(op_name, num_sequenciais, num_aleatorios, tamanho_fragmento=TAMANHO_FRAGMENTO):
+    """Quantidade de fragmentos de uma operação."""
+    return -(-_total_casos(op_name, num_sequenciais, num_aleatorios) // tamanho_fragmento)
+
+
+def gerar_fragmento(op_name, indice, semente, num_sequenciais, num_aleatorios, tamanho_fragmento=TAMANHO_FRAGMENTO):
+    """
+    Gera o fragmento 'indice' de uma operação: os casos válidos das posições
+    [indice * tamanho_fragmento, (indice + 1) * tamanho_fragmento) da população.
+    O resultado depende apenas dos argumentos (e da versão do NumPy), não dos fragmentos anteriores.
+    """
+    inicio = indice * tamanho_fragmento
+    fim = inicio + tamanho_fragmento
+    partes = []
+    base = 0
+    for num_segmento, (segmento, quantidade) in enumerate(_segmentos(op_name, num_sequenciais, num_aleatorios)):
+        a, b = max(inicio, base) - base, min(fim, base + quantidade) - base
+        base += quantidade
+        if a >= b:
+            continue
+        rng = np.random.default_rng([semente, int(OP_CODES[op_name], 2), num_segmento, indice])
+        if segmento == "fixos":
+            partes.append(casos_fixos_vetorizados(op_name, a, b - a))
+        elif segmento == "sequenciais":
+            partes.append(casos_sequenciais_vetorizados(op_name, quantidade, rng, a, b - a))
+        else:
+            partes.append(casos_aleatorios_vetorizados(op_name, b - a, rng))
+    if not partes:
+        return _montar_casos(op_name, np.empty(0), 0.0, 0.0)
+    return _concatenar_casos(partes)
+
+
+def gerar_fragmento_contado(op_name, indice, semente, num_sequenciais, num_aleatorios,
+                            tamanho_fragmento=TAMANHO_FRAGMENTO):
+    """
+    gerar_fragmento, retornando também os contadores de amostragem (sorteios, rejeitados) do fragmento e o
+    tempo de geração (s), que fica fora do manifesto para que ele seja o mesmo em toda execução.
+    """
+    contador = contadores_amostragem(op_name)
+    antes = dict(contador)
+    inicio = time.perf_counter()
+    casos = gerar_fragmento(op_name, indice, semente, num_sequenciais, num_aleatorios, tamanho_fragmento)
+    tempo = time.perf_counter() - inicio
+    return casos, {chave: contador[chave] - antes[chave] for chave in contador}, tempo
+
+
+def gerar_fragmentos(op_name, semente, num_sequenciais=None, num_aleatorios=None, tamanho_fragmento=TAMANHO_FRAGMENTO):
+    """Gerador (streaming) que produz (indice, casos) para cada fragmento de uma operação, em ordem."""
+    num_sequenciais = NUM_SEQUENTIAL_TESTS[op_name] if num_sequenciais is None else num_sequenciais
+    num_aleatorios = NUM_RANDOM_TESTS[op_name] if num_aleatorios is None else num_aleatorios
+    for indice in range(num_fragmentos(op_name, num_sequenciais, num_aleatorios, tamanho_fragmento)):
+        yield indice, gerar_fragmento(op_name, indice, semente, num_sequenciais, num_aleatorios, tamanho_fragmento)
+
+
+def nome_fragmento(op_name, indice):
+    return f"test_cases_{op_name.lower()}_{indice:04d}.txt"
+
+
+def _faixas(casos):
+    """Mínimo e máximo de cada coluna de um fragmento (None se vazio)."""
+    return {chave: [float(valores.min()), float(valores.max())] if len(valores) else None
+            for chave, valores in casos.items()}
+
+
+def escrever_fragmento_aberto(f, op_name, indice, casos, nome, amostragem=None):
+    """Escreve um fragmento em um arquivo binário aberto e retorna sua entrada do manifesto."""
+    hash_arquivo = hashlib.sha256()
+    for texto in blocos_formatados(op_name, casos):
+        hash_arquivo.update(texto)
+        f.write(texto)
+    entrada = {"arquivo": nome, "indice": indice, "casos": len(casos["ref"]),
+               "faixas": _faixas(casos), "sha256": hash_arquivo.hexdigest()}
+    if amostragem is not None:
+        entrada["amostragem"] = amostragem
+    return entrada
+
+
+def escrever_fragmento(output_dir, op_name, indice, casos, sufixo="", amostragem=None):
+    """Escreve um fragmento (nome_fragmento + sufixo) e retorna sua entrada do manifesto."""
+    nome = nome_fragmento(op_name, indice) + sufixo
+    with open(os.path.join(output_dir, nome), "wb") as f:
+        return escrever_fragmento_aberto(f, op_name, indice, casos, nome, amostragem)
+
+
+def versao_gerador():
+    """Hash do código da geração vetorizada (faixas, filtros, sorteios e formatação)."""
+    funcoes = (_referencia_vetorizada, _validos_vetorizado, _montar_casos, casos_fixos_vetorizados,
+               casos_sequenciais_vetorizados, casos_aleatorios_vetorizados, _sortear_aleatorios,
+               _sortear_quociente_limitado, _segmentos, gerar_fragmento,
+               _separar_decimais, _escrever_decimais, formatar_casos_vetorizado)
+    hash_codigo = hashlib.sha256()
+    for funcao in funcoes:
+        hash_codigo.update(inspect.getsource(funcao).encode())
+    return hash_codigo.hexdigest()[:16]
+
+
+def configuracao_operacao(op_name, semente, num_sequenciais, num_aleatorios, tamanho_fragmento=TAMANHO_FRAGMENTO,
+                          modo="fragmentos"):
+    """Tudo o que determina o conteúdo dos arquivos de uma operação (entra no hash da configuração)."""
+    return {
+        "operacao": op_name,
+        "semente": semente,
+        "sequenciais": num_sequenciais,
+        "aleatorios": num_aleatorios,
+        "casos_fixos": CASOS_FIXOS[op_name],
+        "limites": {nome: globals()[nome] for nome in LIMITES_OPERACAO[op_name]},
+        "tamanho_fragmento": tamanho_fragmento,
+        "casas_decimais": CASAS_DECIMAIS,
+        "modo": modo,
+        "versao_gerador": versao_gerador(),
+        "numpy": np.__version__,
+    }
+
+
+def hash_configuracao(configuracao):
+    return hashlib.sha256(json.dumps(configuracao, sort_keys=True).encode()).hexdigest()
+
+
+def novo_manifesto(semente, tamanho_fragmento=TAMANHO_FRAGMENTO, modo="fragmentos"):
+    """
+    Cabeçalho do manifesto: tudo o que é necessário para regerar qualquer fragmento.
+    modo: "fragmentos" (test_cases_<op>_NNNN.txt) ou "arquivo_unico" (test_cases_<op>.txt).
+    """
+    return {"semente": semente, "tamanho_fragmento": tamanho_fragmento, "casas_decimais": CASAS_DECIMAIS,
+            "numpy": np.__version__, "modo": modo, "operacoes": {}}
+
+
+def resumo_amostragem(fragmentos):
+    """Soma os contadores de amostragem dos fragmentos de uma operação (None se não foram registrados)."""
+    if not fragmentos or any("amostragem" not in fragmento for fragmento in fragmentos):
+        return None
+    resumo = {chave: sum(fragmento["amostragem"][chave] for fragmento in fragmentos)
+              for chave in ("sorteios", "rejeitados")}
+    resumo["eficiencia"] = 1.0 - resumo["rejeitados"] / resumo["sorteios"] if resumo["sorteios"] else 1.0
+    return resumo
+
+
+def registrar_operacao(manifesto, op_name, num_sequenciais, num_aleatorios, fragmentos):
+    """Acrescenta ao manifesto as quantidades, a configuração e os fragmentos escritos de uma operação."""
+    configuracao = configuracao_operacao(op_name, manifesto["semente"], num_sequenciais, num_aleatorios,
+                                         manifesto["tamanho_fragmento"], manifesto.get("modo", "fragmentos"))
+    manifesto["operacoes"][op_name] = {
+        "codigo": OP_CODES[op_name],
+        "fixos": len(CASOS_FIXOS[op_name]),
+        "sequenciais": num_sequenciais,
+        "aleatorios": num_aleatorios,
+        "casos": sum(fragmento["casos"] for fragmento in fragmentos),
+        "configuracao": configuracao,
+        "hash_configuracao": hash_configuracao(configuracao),
+        "arquivos": sorted({fragmento["arquivo"] for fragmento in fragmentos}),
+        "amostragem": resumo_amostragem(fragmentos),
+        "fragmentos": fragmentos,
+    }
+
+
+def _gerar_e_escrever_fragmento(tarefa):
+    """Tarefa de um processo do pool: gera e grava um fragmento (função de módulo para ser serializável)."""
+    output_dir, op_name, indice, semente, num_sequenciais, num_aleatorios, tamanho_fragmento, sufixo = tarefa
+    casos, amostragem, tempo = gerar_fragmento_contado(op_name, indice, semente, num_sequenciais, num_aleatorios,
+                                                       tamanho_fragmento)
+    return op_name, escrever_fragmento(output_dir, op_name, indice, casos, sufixo, amostragem), tempo
+
+
+def gerar_fragmentos_em_paralelo(output_dir, semente, quantidades, tamanho_fragmento=TAMANHO_FRAGMENTO, jobs=1,
+                                 sufixo="", tempos=None):
+    """
+    Gera e grava os fragmentos de várias operações, distribuindo cada par (operação, fragmento) entre
+    'jobs' processos. quantidades = {op: (num_sequenciais, num_aleatorios)}.
+    Cada fragmento deriva seu gerador da semente mestre, do código da operação e do próprio índice
+    (ver gerar_fragmento), então os arquivos são os mesmos para qualquer número de processos.
+    Retorna {op: [entradas do manifesto, em ordem]}; 'tempos', se dado, acumula {op: tempo de geração (s)}.
+    """
+    tarefas = [(output_dir, op_name, indice, semente, num_sequenciais, num_aleatorios, tamanho_fragmento, sufixo)
+               for op_name, (num_sequenciais, num_aleatorios) in quantidades.items()
+               for indice in range(num_fragmentos(op_name, num_sequenciais, num_aleatorios, tamanho_fragmento))]
+    fragmentos = {op_name: [] for op_name in quantidades}
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            resultados = list(executor.map(_gerar_e_escrever_fragmento, tarefas))
+    else:
+        resultados = map(_gerar_e_escrever_fragmento, tarefas)
+    for op_name, entrada, tempo in resultados:
+        fragmentos[op_name].append(entrada)
+        if tempos is not None:
+            tempos[op_name] = tempos.get(op_name, 0.0) + tempo
+    return fragmentos
+
+
+def carregar_manifesto(output_dir):
+    with open(os.path.join(output_dir, ARQUIVO_MANIFESTO)) as f:
+        return json.load(f)
+
+
+def salvar_manifesto(output_dir, manifesto):
+    with open(os.path.join(output_dir, ARQUIVO_MANIFESTO), "w") as f:
+        json.dump(manifesto, f, indent=2)
+        f.write("\n")
+
+
+def operacoes_desatualizadas(output_dir, manifesto_anterior, semente, quantidades,
+                             tamanho_fragmento=TAMANHO_FRAGMENTO, modo="fragmentos"):
+    """
+    Compara a configuração atual de cada operação com a registrada no manifesto anterior.
+    Retorna {op: motivos} só para as operações que precisam ser regeradas; as demais podem ser mantidas.
+    """
+    registradas = manifesto_anterior["operacoes"] if manifesto_anterior else {}
+    desatualizadas = {}
+    for op_name, (num_sequenciais, num_aleatorios) in quantidades.items():
+        configuracao = configuracao_operacao(op_name, semente, num_sequenciais, num_aleatorios, tamanho_fragmento,
+                                             modo)
+        registro = registradas.get(op_name)
+        if registro is None or "hash_configuracao" not in registro:
+            desatualizadas[op_name] = ["sem registro no manifesto"]
+            continue
+        motivos = []
+        if registro["hash_configuracao"] != hash_configuracao(configuracao):
+            anterior = registro["configuracao"]
+            alterados = [chave for chave in configuracao
+                         if json.dumps(anterior.get(chave), sort_keys=True) != json.dumps(configuracao[chave], sort_keys=True)]
+            motivos.append(f"alterado: {', '.join(alterados)}")
+        ausentes = [nome for nome in registro["arquivos"] if not os.path.exists(os.path.join(output_dir, nome))]
+        if ausentes:
+            motivos.append(f"arquivo ausente: {', '.join(ausentes)}")
+        if motivos:
+            desatualizadas[op_name] = motivos
+    return desatualizadas
+
+
+def remover_arquivos_antigos(output_dir, registro_anterior, registro_novo):
+    """Apaga os arquivos de uma operação regerada que não fazem mais parte dela (ex.: fragmentos a mais)."""
+    for nome in set(registro_anterior.get("arquivos", [])) - set(registro_novo["arquivos"]):
+        caminho = os.path.join(output_dir, nome)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+
+def regerar_fragmento(manifesto, op_name, indice):
+    """Regera um fragmento a partir do manifesto e retorna (bytes, confere com o sha256 registrado)."""
+    operacao = manifesto["operacoes"][op_name]
+    casos = gerar_fragmento(op_name, indice, manifesto["semente"], operacao["sequenciais"],
+                            operacao["aleatorios"], manifesto["tamanho_fragmento"])
+    texto = b"".join(blocos_formatados(op_name, casos))
+    return texto, hashlib.sha256(texto).hexdigest() == operacao["fragmentos"][indice]["sha256"]
+
+
 # --- Geração e Impressão dos Casos de Teste ---
 if __name__ == "__main__":
-    grouped_test_lines, counts = generate_cordic_test_cases_formatted_grouped_configurable()
+    parser = argparse.ArgumentParser(description="Gera as tabelas de teste do CORDIC (test_cases_<op>.txt).")
+    parser.add_argument("--vetorizado", action="store_true",
+                        help="gera cada operação em bloco com NumPy (recomendado para muitos casos)")
+    parser.add_argument("--aleatorios", type=int, default=None,
+                        help="sobrescreve NUM_RANDOM_TESTS_* de todas as operações")
+    parser.add_argument("--saida", default="cordic_test_cases", help="pasta de saída")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="semente dos sorteios (sem ela, uma semente nova é sorteada e exibida)")
+    parser.add_argument("--fragmentos", action="store_true",
+                        help="grava test_cases_<op>_NNNN.txt em fragmentos e um manifest.json (implica --vetorizado)")
+    parser.add_argument("--tamanho-fragmento", type=int, default=TAMANHO_FRAGMENTO,
+                        help="casos por fragmento, antes dos filtros de validade")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="processos usados para gerar operações e fragmentos em paralelo (implica --vetorizado)")
+    parser.add_argument("--regerar", metavar="OP:NNNN",
+                        help="regera um fragmento a partir do manifest.json da pasta de saída e confere o sha256")
+    parser.add_argument("--incremental", action="store_true",
+                        help="regera só as operações cuja configuração mudou desde o manifest.json (implica --vetorizado)")
+    parser.add_argument("--verificar", action="store_true",
+                        help="só lista as operações desatualizadas em relação ao manifest.json (código 1 se houver)")
+    args = parser.parse_args()
 
-    output_dir = "cordic_test_cases"
+    output_dir = args.saida
     os.makedirs(output_dir, exist_ok=True) # Cria o diretório se não existir
 
+    if args.regerar:
+        op_name, _, indice = args.regerar.upper().partition(":")
+        if op_name not in OP_CODES or not indice.isdigit():
+            parser.error(f"--regerar espera OP:NNNN com OP em {', '.join(OP_CODES)} (recebido '{args.regerar}')")
+        indice = int(indice)
+        if not os.path.exists(os.path.join(output_dir, ARQUIVO_MANIFESTO)):
+            parser.error(f"'{output_dir}' não contém {ARQUIVO_MANIFESTO}")
+        manifesto = carregar_manifesto(output_dir)
+        if manifesto.get("modo", "fragmentos") != "fragmentos":
+            # No arquivo único não há test_cases_<op>_NNNN.txt para substituir (e arquivos_tabela o ignoraria)
+            parser.error(f"--regerar precisa de uma pasta gerada com --fragmentos; '{output_dir}' está no modo "
+                         f"'{manifesto['modo']}'")
+        fragmentos = manifesto["operacoes"].get(op_name, {}).get("fragmentos", [])
+        if indice >= len(fragmentos):
+            parser.error(f"o manifesto registra {len(fragmentos)} fragmento(s) de {op_name}")
+        texto, confere = regerar_fragmento(manifesto, op_name, indice)
+        # Um fragmento que não confere não substitui o original: vai para um arquivo ao lado, para comparação
+        output_filename = os.path.join(output_dir, nome_fragmento(op_name, indice) + ("" if confere else ".regerado"))
+        with open(output_filename, "wb") as f:
+            f.write(texto)
+        print(f"Fragmento '{output_filename}' regerado: {'idêntico ao manifesto' if confere else 'DIFERENTE do manifesto'}")
+        raise SystemExit(0 if confere else 1)
+
+    manifesto_anterior = None
+    if args.incremental or args.verificar:
+        if os.path.exists(os.path.join(output_dir, ARQUIVO_MANIFESTO)):
+            manifesto_anterior = carregar_manifesto(output_dir)
+
+    # No modo incremental, sem --semente, reaproveita a semente do manifesto para manter as operações inalteradas
+    if args.semente is not None:
+        semente = args.semente
+    elif manifesto_anterior is not None:
+        semente = manifesto_anterior["semente"]
+    else:
+        semente = np.random.SeedSequence().entropy
+    print(f"Semente: {semente}")
+
+    quantidades = {op_name: (NUM_SEQUENTIAL_TESTS[op_name],
+                             NUM_RANDOM_TESTS[op_name] if args.aleatorios is None else args.aleatorios)
+                   for op_name in OP_CODES}
+    modo = "fragmentos" if args.fragmentos else "arquivo_unico"
+    vetorizado = args.vetorizado or args.fragmentos or args.jobs > 1 or args.incremental
+
+    if args.verificar:
+        desatualizadas = operacoes_desatualizadas(output_dir, manifesto_anterior, semente, quantidades,
+                                                  args.tamanho_fragmento, modo)
+        for op_name in OP_CODES:
+            motivos = desatualizadas.get(op_name)
+            print(f"- {op_name}: {'DESATUALIZADA (' + '; '.join(motivos) + ')' if motivos else 'atualizada'}")
+        raise SystemExit(1 if desatualizadas else 0)
+
     print(f"Gerando casos de teste formatados (X, Y, Z, Resultado Esperado) em arquivos separados na pasta '{output_dir}':\n")
 
-    for op_name, lines in grouped_test_lines.items():
-        output_filename = os.path.join(output_dir, f"test_cases_{op_name.lower()}.txt")
-        with open(output_filename, "w") as f:
-            for line in lines:
-                f.write(line + "\n")
-        print(f"- {op_name}: {counts[op_name]} casos salvos em '{output_filename}'")
+    tempos = {}
+    if vetorizado:
+        manifesto = novo_manifesto(semente, args.tamanho_fragmento, modo)
+        pendentes = dict(quantidades)
+        if args.incremental and manifesto_anterior is not None:
+            desatualizadas = operacoes_desatualizadas(output_dir, manifesto_anterior, semente, quantidades,
+                                                      args.tamanho_fragmento, modo)
+            for op_name in quantidades:
+                if op_name not in desatualizadas:
+                    manifesto["operacoes"][op_name] = manifesto_anterior["operacoes"][op_name]
+                    del pendentes[op_name]
+                    print(f"- {op_name}: sem alteração, mantida")
+
+    if args.fragmentos:
+        todos_fragmentos = gerar_fragmentos_em_paralelo(output_dir, semente, pendentes, args.tamanho_fragmento,
+                                                        args.jobs, tempos=tempos)
+        for op_name, fragmentos in todos_fragmentos.items():
+            registrar_operacao(manifesto, op_name, *quantidades[op_name], fragmentos)
+            print(f"- {op_name}: {manifesto['operacoes'][op_name]['casos']} casos salvos em {len(fragmentos)} fragmento(s)")
+    elif args.jobs > 1:
+        # Cada processo grava seus fragmentos em arquivos temporários, concatenados em ordem ao final
+        todos_fragmentos = gerar_fragmentos_em_paralelo(output_dir, semente, pendentes, args.tamanho_fragmento,
+                                                        args.jobs, sufixo=".parte", tempos=tempos)
+        for op_name, fragmentos in todos_fragmentos.items():
+            nome_arquivo = f"test_cases_{op_name.lower()}.txt"
+            output_filename = os.path.join(output_dir, nome_arquivo)
+            with open(output_filename, "wb") as f:
+                for fragmento in fragmentos:
+                    parte = os.path.join(output_dir, fragmento["arquivo"])
+                    with open(parte, "rb") as f_parte:
+                        shutil.copyfileobj(f_parte, f)
+                    os.remove(parte)
+                    fragmento["arquivo"] = nome_arquivo
+            registrar_operacao(manifesto, op_name, *quantidades[op_name], fragmentos)
+            print(f"- {op_name}: {manifesto['operacoes'][op_name]['casos']} casos salvos em '{output_filename}'")
+    elif vetorizado:
+        for op_name, (num_sequenciais, num_aleatorios) in pendentes.items():
+            nome_arquivo = f"test_cases_{op_name.lower()}.txt"
+            output_filename = os.path.join(output_dir, nome_arquivo)
+            with open(output_filename, "wb") as f:
+                fragmentos = []
+                for indice in range(num_fragmentos(op_name, num_sequenciais, num_aleatorios, args.tamanho_fragmento)):
+                    casos, amostragem, tempo = gerar_fragmento_contado(op_name, indice, semente, num_sequenciais,
+                                                                       num_aleatorios, args.tamanho_fragmento)
+                    tempos[op_name] = tempos.get(op_name, 0.0) + tempo
+                    fragmentos.append(escrever_fragmento_aberto(f, op_name, indice, casos, nome_arquivo, amostragem))
+            registrar_operacao(manifesto, op_name, num_sequenciais, num_aleatorios, fragmentos)
+            print(f"- {op_name}: {manifesto['operacoes'][op_name]['casos']} casos salvos em '{output_filename}'")
+
+    if vetorizado:
+        if manifesto_anterior is not None:
+            for op_name in pendentes:
+                if op_name in manifesto_anterior["operacoes"]:
+                    remover_arquivos_antigos(output_dir, manifesto_anterior["operacoes"][op_name],
+                                             manifesto["operacoes"][op_name])
+        manifesto["operacoes"] = {op_name: manifesto["operacoes"][op_name] for op_name in OP_CODES}
+        salvar_manifesto(output_dir, manifesto)
+        counts = {op_name: registro["casos"] for op_name, registro in manifesto["operacoes"].items()}
+        if args.incremental:
+            print(f"\nOperações regeradas: {', '.join(pendentes) or 'nenhuma'}")
+        if pendentes:
+            print(f"\nAmostragem (casos sequenciais e aleatórios):")
+            print(f"{'operação':<10}{'pedidos':>12}{'sorteios':>12}{'rejeitados':>12}{'eficiência':>12}{'tempo (s)':>11}")
+            for op_name, (num_sequenciais, num_aleatorios) in pendentes.items():
+                resumo = manifesto["operacoes"][op_name]["amostragem"]
+                print(f"{op_name:<10}{num_sequenciais + num_aleatorios:>12}{resumo['sorteios']:>12}"
+                      f"{resumo['rejeitados']:>12}{resumo['eficiencia']:>12.2%}{tempos[op_name]:>11.3f}")
+    else:
+        # As tabelas da geração escalar não correspondem a um manifesto anterior
+        if os.path.exists(os.path.join(output_dir, ARQUIVO_MANIFESTO)):
+            os.remove(os.path.join(output_dir, ARQUIVO_MANIFESTO))
+        random.seed(semente)
+        if args.aleatorios is not None:
+            for op_name in OP_CODES:
+                globals()[f"NUM_RANDOM_TESTS_{op_name}"] = args.aleatorios
+        grouped_test_lines, counts = generate_cordic_test_cases_formatted_grouped_configurable()
+
+        for op_name, lines in grouped_test_lines.items():
+            output_filename = os.path.join(output_dir, f"test_cases_{op_name.lower()}.txt")
+            with open(output_filename, "w") as f:
+                for line in lines:
+                    f.write(line + "\n")
+            print(f"- {op_name}: {counts[op_name]} casos salvos em '{output_filename}'")
 
     print("\n" + "---" * 15)
     print("Resumo Total de Casos de Teste Gerados:")
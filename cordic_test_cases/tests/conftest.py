@@ -0,0 +1,5 @@
+import os
+import sys
+
+# As ferramentas de cordic_test_cases/ importam umas às outras pelo nome do módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
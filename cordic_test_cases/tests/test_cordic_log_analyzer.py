@@ -0,0 +1,35 @@
+import math
+
+import numpy as np
+import pytest
+
+from cordic_log_analyzer import adicionar_esboco, combinar_esbocos, esboco_vazio, quantil
+
+
+@pytest.mark.parametrize("alfa", [0.01, 0.05])
+def test_quantis_dentro_do_erro_relativo(alfa):
+    rng = np.random.default_rng(5)
+    valores = np.concatenate([rng.lognormal(-9.0, 3.0, 50000), np.zeros(500)])
+    esboco = esboco_vazio(alfa)
+    adicionar_esboco(esboco, valores)
+    ordenados = np.sort(valores)
+    for q in (0.0, 0.001, 0.25, 0.5, 0.9, 0.99, 0.999, 1.0):
+        exato = ordenados[int(math.floor(q * (len(valores) - 1)))]
+        assert quantil(esboco, q) == pytest.approx(exato, rel=alfa, abs=0.0)
+
+
+def test_combinar_esbocos_igual_a_um_so():
+    rng = np.random.default_rng(9)
+    partes = [rng.exponential(1e-4, 10000), np.zeros(10), rng.exponential(0.05, 3000)]
+    unico = esboco_vazio()
+    adicionar_esboco(unico, np.concatenate(partes))
+    combinado = esboco_vazio()
+    for parte in partes:
+        esboco = esboco_vazio()
+        adicionar_esboco(esboco, parte)
+        combinado = combinar_esbocos(combinado, esboco)
+    assert combinado == unico
+
+
+def test_esboco_vazio_nao_tem_quantil():
+    assert quantil(esboco_vazio(), 0.5) is None
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+import cordic_model
+from cordic_model import (
+    ITERACOES_PADRAO, NUCLEOS, OPERACOES, calcular_operacoes, q16_16_to_real, real_to_q16_16, top_level_calc_cordic
+)
+
+PASTA_TABELAS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mesmo limite de erro do TB_top_level_calc_cordicV3.v (ERROR_THRESHOLD)
+TOLERANCIA = 0.1
+
+
+def _tabela(op_name):
+    dados = np.loadtxt(os.path.join(PASTA_TABELAS, f"test_cases_{op_name.lower()}.txt"), delimiter=",", ndmin=2)
+    if op_name in ("SIN", "COS"):
+        dados = dados[:, 1:]
+    x_val, y_val, z_val, referencia = dados.T
+    if op_name == "DIV":
+        x_val, y_val = y_val, x_val
+    return x_val, y_val, z_val, referencia
+
+
+def test_real_to_q16_16_trunca_como_rtoi():
+    valores = np.array([0.0, 1.0, -1.0, 1.5, -1.5, 2.0 ** -16, -(2.0 ** -17), 32767.99999, -32768.0])
+    esperado = np.array([0, 65536, -65536, 98304, -98304, 1, 0, 2147483647, -2147483648])
+    assert np.array_equal(real_to_q16_16(valores), esperado)
+    assert np.array_equal(q16_16_to_real(esperado[:6]), valores[:6])
+
+
+@pytest.mark.parametrize("nucleo", sorted(NUCLEOS))
+@pytest.mark.parametrize("op_name", list(OPERACOES))
+def test_modelo_confere_com_as_tabelas(op_name, nucleo):
+    x_val, y_val, z_val, referencia = _tabela(op_name)
+    resultado = q16_16_to_real(top_level_calc_cordic(op_name, real_to_q16_16(x_val), real_to_q16_16(y_val),
+                                                     real_to_q16_16(z_val), ITERACOES_PADRAO, nucleo))
+    tolerancia = np.full(len(referencia), TOLERANCIA)
+    if op_name == "MULT":
+        # O modo linear acumula o truncamento de z a cada iteração: o erro é relativo ao produto
+        tolerancia += np.abs(referencia) * 2.0 ** -(ITERACOES_PADRAO - 4)
+    assert np.all(np.abs(resultado - referencia) <= tolerancia)
+
+
+def test_operacoes_misturadas_iguais_as_separadas():
+    codigos, entradas, esperado = [], [], []
+    for op_name, (codigo, _, _, _) in OPERACOES.items():
+        x_in, y_in, z_in = (real_to_q16_16(v[:50]) for v in _tabela(op_name)[:3])
+        codigos.append(np.full(len(x_in), codigo))
+        entradas.append((x_in, y_in, z_in))
+        esperado.append(top_level_calc_cordic(op_name, x_in, y_in, z_in))
+    x_in, y_in, z_in = (np.concatenate(coluna) for coluna in zip(*entradas))
+    assert np.array_equal(calcular_operacoes(np.concatenate(codigos), x_in, y_in, z_in), np.concatenate(esperado))
+
+
+def test_blocos_nao_alteram_o_resultado(monkeypatch):
+    x_val, y_val, z_val, _ = _tabela("ATANH")
+    x_in, y_in, z_in = real_to_q16_16(x_val), real_to_q16_16(y_val), real_to_q16_16(z_val)
+    inteiro = top_level_calc_cordic("ATANH", x_in, y_in, z_in)
+    monkeypatch.setattr(cordic_model, "TAMANHO_BLOCO", 7)
+    assert np.array_equal(top_level_calc_cordic("ATANH", x_in, y_in, z_in), inteiro)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from cordic_cycle_model import latencia
+from cordic_model import OPERACOES, calcular_operacoes, real_to_q16_16
+from cordic_pipeline_model import pipeline
+
+NUCLEO = "cordic_parallel_q16_32"
+
+
+def _fluxo(operacoes, rng):
+    """Operações com entradas válidas para todas (|y| < x, |z| pequeno)."""
+    x_in = real_to_q16_16(rng.uniform(1.0, 4.0, len(operacoes)))
+    y_in = real_to_q16_16(rng.uniform(-0.5, 0.5, len(operacoes)))
+    z_in = real_to_q16_16(rng.uniform(-3.0, 3.0, len(operacoes)))
+    return list(zip(operacoes, x_in.tolist(), y_in.tolist(), z_in.tolist()))
+
+
+@pytest.mark.parametrize("op_name", list(OPERACOES))
+def test_operacao_isolada_tem_a_latencia_do_modelo_de_ciclos(op_name):
+    fluxo = _fluxo([op_name] * 20, np.random.default_rng(2))
+    esperado = latencia(op_name, np.array([caso[3] for caso in fluxo]), nucleo=NUCLEO)
+    for caso, ciclos in zip(fluxo, esperado):
+        (resultado,) = pipeline([caso], nucleo=NUCLEO)
+        assert resultado["emissao"] == 0
+        assert resultado["conclusao"] - resultado["emissao"] == ciclos
+
+
+def test_resultados_iguais_ao_modelo_e_independentes_do_bloco():
+    rng = np.random.default_rng(4)
+    fluxo = _fluxo(rng.choice(list(OPERACOES), 300).tolist(), rng)
+    codigos = np.array([OPERACOES[caso[0]][0] for caso in fluxo])
+    x_in, y_in, z_in = (np.array([caso[k] for caso in fluxo]) for k in (1, 2, 3))
+    esperado = calcular_operacoes(codigos, x_in, y_in, z_in, nucleo=NUCLEO).tolist()
+    resultados = list(pipeline(fluxo, nucleo=NUCLEO))
+    assert [resultado["resultado"] for resultado in resultados] == esperado
+    assert list(pipeline(fluxo, nucleo=NUCLEO, tamanho_bloco=7)) == resultados
+
+
+def test_mesmo_modo_emite_um_por_ciclo():
+    resultados = list(pipeline(_fluxo(["ATAN", "MOD", "ATAN", "MOD"], np.random.default_rng(1)), nucleo=NUCLEO))
+    assert [resultado["emissao"] for resultado in resultados] == [0, 1, 2, 3]
+    assert all(resultado["parada_troca_modo"] == resultado["parada_pre_processamento"] == 0
+               for resultado in resultados)
+
+
+def test_troca_de_modo_espera_o_resultado_anterior():
+    primeiro, segundo = pipeline(_fluxo(["ATAN", "ATANH"], np.random.default_rng(1)), nucleo=NUCLEO)
+    assert segundo["emissao"] == primeiro["conclusao"] + 1
+    assert segundo["parada_troca_modo"] == segundo["emissao"] - (primeiro["emissao"] + 1)
+    assert segundo["parada_pre_processamento"] == 0
+
+
+def test_pre_processamento_ocupa_a_porta_de_entrada():
+    fluxo = [("SIN", 0, 0, int(real_to_q16_16(20.0))), ("COS", 0, 0, int(real_to_q16_16(0.5)))]
+    primeiro, segundo = pipeline(fluxo, nucleo=NUCLEO)
+    assert primeiro["pre_processamento"] > 0
+    captura = primeiro["emissao"] + primeiro["pre_processamento"] + 1
+    assert primeiro["conclusao"] == captura + 1
+    assert segundo["emissao"] == captura + 1
+    assert segundo["parada_pre_processamento"] == captura
+    assert segundo["parada_troca_modo"] == 0
+
+
+def test_nucleo_serial_e_rejeitado():
+    with pytest.raises(ValueError):
+        list(pipeline(_fluxo(["SIN"], np.random.default_rng(0)), nucleo="cordic"))
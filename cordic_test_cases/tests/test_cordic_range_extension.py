@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from cordic_error_sweep import resultado_exato
+from cordic_model import q16_16_to_real, real_to_q16_16
+from cordic_range_extension import (
+    DOMINIOS_ESTENDIDOS, LIMITE_MOD_ENTRADA, LN2_Q16, METADE_LN2_Q16, calcular_estendido, entradas_estendidas,
+    erro_exponencial_nucleo, reducao_hiperbolica, reducao_mod, reducao_razao, tolerancias_caso
+)
+from cordic_vector_format import TOLERANCIA_PADRAO
+
+
+def test_reducao_hiperbolica():
+    z_in = np.concatenate([np.arange(-3 * LN2_Q16, 3 * LN2_Q16), real_to_q16_16(np.linspace(-11.0, 11.0, 5001))])
+    r, passos = reducao_hiperbolica(z_in)
+    assert np.array_equal(r + passos * LN2_Q16, np.abs(z_in))
+    assert np.all(np.abs(r) <= METADE_LN2_Q16)
+    assert np.all(passos >= 0)
+    assert np.all(passos[np.abs(z_in) <= METADE_LN2_Q16] == 0)
+
+
+def test_reducao_razao():
+    rng = np.random.default_rng(6)
+    x_val = rng.uniform(0.1, 10.0, 20000)
+    x_in, y_in = real_to_q16_16(x_val), real_to_q16_16(x_val * rng.uniform(-0.9999, 0.9999, len(x_val)))
+    x_nucleo, y_nucleo, passos = reducao_razao(x_in, y_in)
+    u, v = x_in + np.abs(y_in), x_in - np.abs(y_in)
+    w = v << (2 * passos)
+    assert np.all((u >= w) & (u < 4 * w))
+    assert np.all(np.abs((x_nucleo + y_nucleo) - u) <= 1) and np.all(np.abs((x_nucleo - y_nucleo) - w) <= 1)
+    assert np.all((y_nucleo >= 0) & (y_nucleo < 0.6 * x_nucleo))
+
+
+def test_reducao_mod():
+    rng = np.random.default_rng(8)
+    x_in, y_in = (real_to_q16_16(rng.uniform(-23000.0, 23000.0, 20000)) for _ in range(2))
+    passos = reducao_mod(x_in, y_in)
+    magnitude = np.maximum(np.abs(x_in), np.abs(y_in))
+    assert np.all(magnitude >> passos <= LIMITE_MOD_ENTRADA)
+    assert np.all((passos == 0) | (magnitude >> np.maximum(passos - 1, 0) > LIMITE_MOD_ENTRADA))
+
+
+def test_tolerancias_caso():
+    z_in = real_to_q16_16(np.array([0.0, 0.3, -0.3, 1.0, -5.0, 11.0]))
+    _, passos = reducao_hiperbolica(z_in)
+    erro = erro_exponencial_nucleo()
+    assert 0.0 < erro < TOLERANCIA_PADRAO
+    assert np.allclose(tolerancias_caso("SINH", z_in), TOLERANCIA_PADRAO + erro * (2.0 ** passos - 1.0))
+    assert np.all(tolerancias_caso("SINH", z_in)[:3] == TOLERANCIA_PADRAO)
+    assert np.all(tolerancias_caso("ATANH", z_in) == TOLERANCIA_PADRAO)
+
+
+@pytest.mark.parametrize("op_name", list(DOMINIOS_ESTENDIDOS))
+def test_estendido_dentro_da_tolerancia(op_name):
+    x_in, y_in, z_in = entradas_estendidas(op_name, 20000, np.random.default_rng(12))
+    referencia = resultado_exato(op_name, q16_16_to_real(x_in), q16_16_to_real(y_in), q16_16_to_real(z_in))
+    valido = np.isfinite(referencia) & (np.abs(referencia) < 32768.0)
+    x_in, y_in, z_in, referencia = x_in[valido], y_in[valido], z_in[valido], referencia[valido]
+    resultado = calcular_estendido(op_name, x_in, y_in, z_in)[0]
+    assert np.all(np.abs(q16_16_to_real(resultado) - referencia) <= tolerancias_caso(op_name, z_in))
@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pytest
+
+from cordic_model import OPERACOES, top_level_calc_cordic
+from cordic_vector_format import (
+    BYTES_VETOR, carregar_vetores, codificar_vetores, converter_tabelas, decodificar_vetores, quantizar_casos
+)
+
+PASTA_TABELAS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _campos_aleatorios(num_vetores, rng):
+    campos = {nome: rng.integers(-2 ** 31, 2 ** 31, num_vetores) for nome in ("x", "y", "z", "esperado")}
+    return dict(campos, operacao=rng.integers(0, 16, num_vetores), tolerancia=rng.integers(0, 2 ** 32, num_vetores))
+
+
+def test_codificar_decodificar_ida_e_volta():
+    campos = _campos_aleatorios(5000, np.random.default_rng(11))
+    texto = codificar_vetores(campos)
+    assert len(texto) == 5000 * BYTES_VETOR
+    registros = np.frombuffer(texto, dtype=np.uint8).reshape(-1, BYTES_VETOR)
+    decodificados = decodificar_vetores(registros)
+    for nome, valores in campos.items():
+        assert np.array_equal(decodificados[nome], valores), nome
+
+
+def test_caractere_invalido_e_rejeitado():
+    registros = np.frombuffer(codificar_vetores(_campos_aleatorios(3, np.random.default_rng(1))),
+                              dtype=np.uint8).reshape(-1, BYTES_VETOR).copy()
+    registros[1, 5] = ord("g")
+    with pytest.raises(ValueError):
+        decodificar_vetores(registros)
+
+
+def test_quantizacao_com_referencia_do_modelo():
+    x_val, y_val = np.array([3.0, -1.5, 0.25]), np.array([4.0, 2.0, -0.75])
+    campos = quantizar_casos("MOD", x_val, y_val, np.zeros(3), np.hypot(x_val, y_val), referencia_modelo=True,
+                             tolerancia=0.0)
+    assert np.array_equal(campos["esperado"], top_level_calc_cordic("MOD", campos["x"], campos["y"], campos["z"]))
+    assert np.all(campos["tolerancia"] == 0)
+    assert np.all(campos["operacao"] == OPERACOES["MOD"][0])
+
+
+def test_converter_tabelas_preserva_os_casos(tmp_path):
+    arquivo = tmp_path / "vetores.hex"
+    contagem = converter_tabelas(PASTA_TABELAS, arquivo, ["SIN", "DIV"])
+    campos = carregar_vetores(arquivo)
+    assert len(campos["x"]) == sum(contagem.values())
+    parcial = carregar_vetores(arquivo, contagem["SIN"], 10)
+    assert np.all(parcial["operacao"] == OPERACOES["DIV"][0])
+    assert np.array_equal(parcial["x"], campos["x"][contagem["SIN"]:contagem["SIN"] + 10])
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pytest
+
+from cordic_model import OPERACOES, real_to_q16_16
+from cordic_vector_store import (
+    abrir_store, colunas_operacao, exportar_tabelas, gravar_medidos, importar_tabelas, resumo_store
+)
+
+PASTA_TABELAS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERACOES_TESTE = ["SIN", "DIV", "MULT"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    pasta = tmp_path / "store"
+    importar_tabelas(PASTA_TABELAS, pasta, OPERACOES_TESTE)
+    return pasta
+
+
+def _valores(pasta, op_name):
+    return np.loadtxt(os.path.join(pasta, f"test_cases_{op_name.lower()}.txt"), delimiter=",", ndmin=2)
+
+
+def test_importar_e_exportar_ida_e_volta(store, tmp_path):
+    contagem = exportar_tabelas(store, tmp_path / "tabelas")
+    assert sorted(contagem) == sorted(OPERACOES_TESTE)
+    for op_name in OPERACOES_TESTE:
+        original, exportada = _valores(PASTA_TABELAS, op_name), _valores(tmp_path / "tabelas", op_name)
+        assert contagem[op_name] == len(original)
+        assert np.allclose(exportada, original, rtol=0.0, atol=5e-11)
+
+
+def test_colunas_da_operacao(store):
+    aberto = abrir_store(store)
+    x_val, y_val, _, referencia = _valores(PASTA_TABELAS, "DIV").T
+    colunas = colunas_operacao(aberto, "DIV")
+    # O arquivo da divisão guarda o dividendo (y) antes do divisor (x)
+    assert np.array_equal(colunas["x"], y_val) and np.array_equal(colunas["y"], x_val)
+    assert np.array_equal(colunas["esperado"], referencia)
+    assert np.array_equal(colunas["x_q16"], real_to_q16_16(y_val))
+    assert np.all(colunas["operacao"] == OPERACOES["DIV"][0])
+    fatia = colunas_operacao(aberto, "DIV", 10, 20, ("x",))
+    assert list(fatia) == ["x"] and np.array_equal(fatia["x"], colunas["x"][10:20])
+    assert len(colunas_operacao(aberto, "DIV", 5, 10 ** 9)["x"]) == len(x_val) - 5
+
+
+def test_faixas_invalidas(store):
+    aberto = abrir_store(store)
+    with pytest.raises(KeyError):
+        colunas_operacao(aberto, "ATANH")
+    with pytest.raises(ValueError):
+        colunas_operacao(aberto, "SIN", -1)
+    with pytest.raises(ValueError):
+        colunas_operacao(aberto, "SIN", 30, 20)
+    with pytest.raises(ValueError):
+        gravar_medidos(store, "SIN", np.zeros(10), resumo_store(aberto)["SIN"]["casos"] - 5)
+
+
+def test_gravar_medidos(store):
+    gravar_medidos(store, "MULT", [1.0, 2.0, 3.0], 4)
+    aberto = abrir_store(store)
+    medido = colunas_operacao(aberto, "MULT", colunas=("medido",))["medido"]
+    assert np.array_equal(medido[4:7], [1.0, 2.0, 3.0])
+    assert np.isnan(medido[:4]).all() and np.isnan(medido[7:]).all()
+    assert resumo_store(aberto)["MULT"]["medidos"] == 3
+    assert resumo_store(aberto)["SIN"]["medidos"] == 0
+
+
+def test_exportar_nao_sobrescreve_sem_pedir(store, tmp_path):
+    destino = tmp_path / "tabelas"
+    exportar_tabelas(store, destino, ["SIN"])
+    with open(destino / "test_cases_sin.txt", "a") as f:
+        f.write("marca\n")
+    with pytest.raises(FileExistsError):
+        exportar_tabelas(store, destino, ["SIN", "DIV"])
+    assert not (destino / "test_cases_div.txt").exists()
+    assert (destino / "test_cases_sin.txt").read_text().endswith("marca\n")
+    exportar_tabelas(store, destino, ["SIN", "DIV"], sobrescrever=True)
+    assert np.allclose(_valores(destino, "SIN"), _valores(PASTA_TABELAS, "SIN"), rtol=0.0, atol=5e-11)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from generate_cordic_test_cases import (
+    LAYOUT_COLUNAS, _separar_decimais, formatar_casos_vetorizado, gerar_casos_vetorizados
+)
+
+
+def _formatar_escalar(op_name, casos):
+    linhas = []
+    for i in range(len(casos["ref"])):
+        colunas = ["0.0" if c == "0.0" else f"{casos[c][i]:.10f}" for c in LAYOUT_COLUNAS[op_name]]
+        linhas.append(", ".join(colunas) + "\n")
+    return "".join(linhas).encode()
+
+
+def test_separar_decimais_igual_ao_format():
+    rng = np.random.default_rng(7)
+    valores = np.concatenate([
+        rng.uniform(-40000.0, 40000.0, 20000),
+        rng.uniform(-2.0, 2.0, 20000),
+        rng.integers(-2 ** 31, 2 ** 31, 20000) / 65536.0,
+        (np.arange(-5000, 5000) + 0.5) * 1e-10,
+        np.array([0.0, -0.0, 0.99999999995, -0.99999999995, 9.99999999995, 1e-12, -1e-12]),
+    ])
+    negativo, inteiro, fracao = _separar_decimais(valores)
+    obtido = [("-" if n else "") + f"{i}.{f:010d}" for n, i, f in zip(negativo, inteiro, fracao)]
+    assert obtido == [f"{v:.10f}" for v in valores]
+
+
+@pytest.mark.parametrize("op_name", list(LAYOUT_COLUNAS))
+def test_formatacao_vetorizada_igual_a_escalar(op_name):
+    casos = gerar_casos_vetorizados(op_name, 200, 2000, np.random.default_rng(3))
+    assert formatar_casos_vetorizado(op_name, casos) == _formatar_escalar(op_name, casos)